@@ -0,0 +1 @@
+# Async API package
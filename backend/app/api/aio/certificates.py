@@ -0,0 +1,300 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from ...database import get_async_db, get_async_read_db
+from ...core.config import settings
+from ...core.pagination import decode_cursor, next_cursor
+from ...crud.aio import certificate as crud_certificate
+from ...schemas.certificate import (
+    Certificate, CertificateCreate, CertificateUpdate, CertificateQuery,
+    CertificateType, CertificateTypeCreate, CertificateTypeUpdate,
+    TalentCertificateSummary, CertificateSearchResult, CertificateStatusEnum
+)
+
+router = APIRouter()
+
+# 证书类型管理
+@router.get("/types", response_model=List[CertificateType])
+async def get_certificate_types(
+    skip: int = 0,
+    limit: int = 100,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """获取证书类型列表"""
+    return await crud_certificate.get_certificate_types(db, skip=skip, limit=limit)
+
+@router.post("/types", response_model=CertificateType)
+async def create_certificate_type(
+    certificate_type: CertificateTypeCreate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """创建证书类型"""
+    # 检查类型代码是否已存在
+    existing = await crud_certificate.get_certificate_type_by_code(db, certificate_type.type_code)
+    if existing:
+        raise HTTPException(status_code=400, detail="证书类型代码已存在")
+
+    # 检查类型名称是否已存在
+    existing_name = await crud_certificate.get_certificate_type_by_name(db, certificate_type.type_name)
+    if existing_name:
+        raise HTTPException(status_code=400, detail="证书类型名称已存在")
+
+    return await crud_certificate.create_certificate_type(db, certificate_type)
+
+@router.put("/types/{type_code}", response_model=CertificateType)
+async def update_certificate_type(
+    type_code: str,
+    certificate_type: CertificateTypeUpdate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """更新证书类型"""
+    db_certificate_type = await crud_certificate.update_certificate_type(db, type_code, certificate_type)
+    if not db_certificate_type:
+        raise HTTPException(status_code=404, detail="证书类型不存在")
+    return db_certificate_type
+
+@router.get("/types/{type_code}", response_model=CertificateType)
+async def get_certificate_type(
+    type_code: str,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """获取单个证书类型"""
+    certificate_type = await crud_certificate.get_certificate_type_by_code(db, type_code)
+    if not certificate_type:
+        raise HTTPException(status_code=404, detail="证书类型不存在")
+    return certificate_type
+
+# 具体证书管理
+@router.get("/")
+async def get_certificates(
+    talent_id: Optional[int] = Query(None, description="人才ID"),
+    certificate_type: Optional[str] = Query(None, description="证书类型"),
+    category: Optional[str] = Query(None, description="证书大类"),
+    status: Optional[CertificateStatusEnum] = Query(None, description="证书状态"),
+    specialty: Optional[str] = Query(None, description="专业方向"),
+    level: Optional[str] = Query(None, description="等级"),
+    search: Optional[str] = Query(None, description="搜索关键词"),
+    talent_name: Optional[str] = Query(None, description="人才姓名"),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = Query(None, description="分页游标（响应头 X-Next-Cursor），传入后忽略 skip"),
+    response: Response = None,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """获取证书列表"""
+    query = CertificateQuery(
+        talent_id=talent_id,
+        certificate_type=certificate_type,
+        category=category,
+        status=status,
+        specialty=specialty,
+        level=level
+    )
+
+    # 获取证书列表，人才姓名和电话在同一条查询中关联取出
+    after_id = decode_cursor(cursor, str) if cursor else None
+    rows = await crud_certificate.get_certificates_with_talent(db, query, talent_name=talent_name, skip=skip, limit=limit, after_id=after_id)
+
+    # 列表响应保持数组结构，下一页游标放在响应头中
+    cursor_token = next_cursor([cert for cert, _, _ in rows], limit, "certificate_id")
+    if cursor_token:
+        response.headers["X-Next-Cursor"] = cursor_token
+
+    # 为每个证书添加人才信息
+    result = []
+    for cert, cert_talent_name, cert_talent_phone in rows:
+        cert_dict = {
+            'certificate_id': cert.certificate_id,
+            'talent_id': cert.talent_id,
+            'certificate_type': cert.certificate_type,
+            'certificate_name': cert.certificate_name,
+            'certificate_number': cert.certificate_number,
+            'issue_date': cert.issue_date,
+            'expiry_date': cert.expiry_date,
+            'issuing_authority': cert.issuing_authority,
+            'specialty': cert.specialty,
+            'level': cert.level,
+            'status': cert.status,
+            'notes': cert.notes,
+            'created_at': cert.created_at,
+            'updated_at': cert.updated_at
+        }
+
+        if cert.talent_id:
+            if cert_talent_name is not None:
+                cert_dict['talent_name'] = cert_talent_name
+                cert_dict['talent_phone'] = cert_talent_phone
+            else:
+                cert_dict['talent_name'] = '未知'
+                cert_dict['talent_phone'] = ''
+        else:
+            cert_dict['talent_name'] = '未关联'
+            cert_dict['talent_phone'] = ''
+
+        result.append(cert_dict)
+
+    return result
+
+@router.get("/stats")
+async def get_certificate_stats(
+    talent_id: Optional[int] = Query(None, description="人才ID"),
+    certificate_type: Optional[str] = Query(None, description="证书类型"),
+    category: Optional[str] = Query(None, description="证书大类"),
+    status: Optional[CertificateStatusEnum] = Query(None, description="证书状态"),
+    specialty: Optional[str] = Query(None, description="专业方向"),
+    level: Optional[str] = Query(None, description="等级"),
+    search: Optional[str] = Query(None, description="搜索关键词"),
+    talent_name: Optional[str] = Query(None, description="人才姓名"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """获取证书统计信息"""
+    query = CertificateQuery(
+        talent_id=talent_id,
+        certificate_type=certificate_type,
+        category=category,
+        status=status,
+        specialty=specialty,
+        level=level
+    )
+
+    # 在数据库端一次聚合得到各项计数，不再把证书逐条加载到内存
+    return await crud_certificate.get_certificate_stats(
+        db, query, talent_name=talent_name, use_rollup=settings.certificate_stats_rollup
+    )
+
+@router.post("/", response_model=Certificate)
+async def create_certificate(
+    certificate: CertificateCreate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """创建证书"""
+    import uuid
+    from datetime import datetime
+
+    # 自动生成证书ID
+    # 格式：CERT_YYYYMMDD_随机字符串
+    timestamp = datetime.now().strftime("%Y%m%d")
+    random_suffix = str(uuid.uuid4())[:8].upper()
+    certificate_id = f"CERT_{timestamp}_{random_suffix}"
+
+    # 确保证书ID唯一
+    while await crud_certificate.get_certificate(db, certificate_id):
+        random_suffix = str(uuid.uuid4())[:8].upper()
+        certificate_id = f"CERT_{timestamp}_{random_suffix}"
+
+    # 检查证书类型是否存在
+    certificate_type = await crud_certificate.get_certificate_type_by_name(db, certificate.certificate_type)
+    if not certificate_type:
+        raise HTTPException(status_code=400, detail="证书类型不存在")
+
+    # 创建带有自动生成ID的证书数据
+    certificate_data = certificate.model_dump()
+    certificate_data['certificate_id'] = certificate_id
+
+    # 自动生成证书名称（如果没有提供）
+    if not certificate_data.get('certificate_name'):
+        certificate_name = certificate_data.get('certificate_type', '')
+        if certificate_data.get('specialty'):
+            certificate_name += f"（{certificate_data['specialty']}）"
+        certificate_data['certificate_name'] = certificate_name
+
+    certificate_with_id = CertificateCreate(**certificate_data)
+
+    return await crud_certificate.create_certificate(db, certificate_with_id)
+
+@router.get("/{certificate_id}", response_model=Certificate)
+async def get_certificate(
+    certificate_id: str,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """获取单个证书"""
+    certificate = await crud_certificate.get_certificate(db, certificate_id)
+    if not certificate:
+        raise HTTPException(status_code=404, detail="证书不存在")
+    return certificate
+
+@router.put("/{certificate_id}", response_model=Certificate)
+async def update_certificate(
+    certificate_id: str,
+    certificate: CertificateUpdate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """更新证书"""
+    update_data = certificate.model_dump(exclude_unset=True)
+
+    # 如果更新了证书类型或专业，自动更新证书名称
+    if 'certificate_type' in update_data or 'specialty' in update_data:
+        current_cert = await crud_certificate.get_certificate(db, certificate_id)
+        if current_cert:
+            cert_type = update_data.get('certificate_type', current_cert.certificate_type)
+            specialty = update_data.get('specialty', current_cert.specialty)
+
+            certificate_name = cert_type
+            if specialty:
+                certificate_name += f"（{specialty}）"
+            update_data['certificate_name'] = certificate_name
+
+    certificate_with_name = CertificateUpdate(**update_data)
+
+    db_certificate = await crud_certificate.update_certificate(db, certificate_id, certificate_with_name)
+    if not db_certificate:
+        raise HTTPException(status_code=404, detail="证书不存在")
+    return db_certificate
+
+@router.delete("/{certificate_id}")
+async def delete_certificate(
+    certificate_id: str,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """删除证书"""
+    success = await crud_certificate.delete_certificate(db, certificate_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="证书不存在")
+    return {"message": "证书删除成功"}
+
+# 人才证书查询
+@router.get("/talent/{talent_id}", response_model=List[Certificate])
+async def get_talent_certificates(
+    talent_id: int,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """获取某个人才的所有证书"""
+    return await crud_certificate.get_certificates_by_talent(db, talent_id)
+
+@router.get("/talent/{talent_id}/summary", response_model=TalentCertificateSummary)
+async def get_talent_certificate_summary(
+    talent_id: int,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """获取人才证书汇总信息"""
+    summary = await crud_certificate.get_talent_certificate_summary(db, talent_id)
+    if not summary:
+        raise HTTPException(status_code=404, detail="人才不存在")
+    return summary
+
+# 证书搜索功能
+@router.get("/search/by-type", response_model=List[CertificateSearchResult])
+async def search_talents_by_certificate_type(
+    certificate_type: str = Query(..., description="证书类型"),
+    status: str = Query("VALID", description="证书状态"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """根据证书类型搜索人才"""
+    return await crud_certificate.search_talents_by_certificate_type(db, certificate_type, status)
+
+@router.get("/search/by-category", response_model=List[CertificateSearchResult])
+async def search_talents_by_category(
+    category: str = Query(..., description="证书大类"),
+    status: str = Query("VALID", description="证书状态"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """根据证书大类搜索人才"""
+    return await crud_certificate.search_talents_by_category(db, category, status)
+
+@router.get("/expiring", response_model=List[Certificate])
+async def get_expiring_certificates(
+    days: int = Query(30, description="多少天内到期"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """获取即将到期的证书"""
+    return await crud_certificate.get_expiring_certificates(db, days)
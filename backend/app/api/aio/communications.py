@@ -0,0 +1,71 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from ...database import get_async_db, get_async_read_db
+from ...core.pagination import decode_cursor, next_cursor
+from ...core.counting import CountMode, count_rows
+from ...models.communication import Communication
+from ...schemas.communication import CommunicationCreate, CommunicationUpdate, Communication as CommunicationSchema, CommunicationList
+
+router = APIRouter()
+
+@router.get("/", response_model=CommunicationList)
+async def get_communications(skip: int = 0, limit: int = 100, cursor: Optional[str] = None, company_id: int = None, talent_id: int = None, count_mode: CountMode = CountMode.EXACT, db: AsyncSession = Depends(get_async_read_db)):
+    stmt = select(Communication)
+
+    if company_id:
+        stmt = stmt.where(Communication.company_id == company_id)
+    if talent_id:
+        stmt = stmt.where(Communication.talent_id == talent_id)
+
+    page_stmt = stmt.order_by(Communication.id)
+    if cursor:
+        page_stmt = page_stmt.where(Communication.id > decode_cursor(cursor)).limit(limit)
+    else:
+        page_stmt = page_stmt.offset(skip).limit(limit)
+    communications = (await db.execute(page_stmt)).scalars().all()
+    total, total_is_estimate = await db.run_sync(count_rows, stmt, count_mode)
+    return CommunicationList(
+        communications=communications, total=total, total_is_estimate=total_is_estimate,
+        next_cursor=next_cursor(communications, limit, "id")
+    )
+
+@router.get("/{communication_id}", response_model=CommunicationSchema)
+async def get_communication(communication_id: int, db: AsyncSession = Depends(get_async_db)):
+    communication = await db.get(Communication, communication_id)
+    if not communication:
+        raise HTTPException(status_code=404, detail="Communication not found")
+    return communication
+
+@router.post("/", response_model=CommunicationSchema)
+async def create_communication(communication: CommunicationCreate, db: AsyncSession = Depends(get_async_db)):
+    db_communication = Communication(**communication.dict())
+    db.add(db_communication)
+    await db.commit()
+    await db.refresh(db_communication)
+    return db_communication
+
+@router.put("/{communication_id}", response_model=CommunicationSchema)
+async def update_communication(communication_id: int, communication: CommunicationUpdate, db: AsyncSession = Depends(get_async_db)):
+    db_communication = await db.get(Communication, communication_id)
+    if not db_communication:
+        raise HTTPException(status_code=404, detail="Communication not found")
+
+    update_data = communication.dict(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(db_communication, field, value)
+
+    await db.commit()
+    await db.refresh(db_communication)
+    return db_communication
+
+@router.delete("/{communication_id}")
+async def delete_communication(communication_id: int, db: AsyncSession = Depends(get_async_db)):
+    db_communication = await db.get(Communication, communication_id)
+    if not db_communication:
+        raise HTTPException(status_code=404, detail="Communication not found")
+
+    await db.delete(db_communication)
+    await db.commit()
+    return {"message": "Communication deleted successfully"}
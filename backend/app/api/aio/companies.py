@@ -0,0 +1,64 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from ...database import get_async_db, get_async_read_db
+from ...core.pagination import decode_cursor, next_cursor
+from ...core.counting import CountMode, count_rows
+from ...models.company import Company
+from ...schemas.company import CompanyCreate, CompanyUpdate, Company as CompanySchema, CompanyList
+
+router = APIRouter()
+
+@router.get("/", response_model=CompanyList)
+async def get_companies(skip: int = 0, limit: int = 100, cursor: Optional[str] = None, count_mode: CountMode = CountMode.EXACT, db: AsyncSession = Depends(get_async_read_db)):
+    stmt = select(Company).order_by(Company.id)
+    if cursor:
+        stmt = stmt.where(Company.id > decode_cursor(cursor)).limit(limit)
+    else:
+        stmt = stmt.offset(skip).limit(limit)
+    companies = (await db.execute(stmt)).scalars().all()
+    total, total_is_estimate = await db.run_sync(count_rows, select(Company), count_mode)
+    return CompanyList(
+        companies=companies, total=total, total_is_estimate=total_is_estimate,
+        next_cursor=next_cursor(companies, limit, "id")
+    )
+
+@router.get("/{company_id}", response_model=CompanySchema)
+async def get_company(company_id: int, db: AsyncSession = Depends(get_async_db)):
+    company = await db.get(Company, company_id)
+    if not company:
+        raise HTTPException(status_code=404, detail="Company not found")
+    return company
+
+@router.post("/", response_model=CompanySchema)
+async def create_company(company: CompanyCreate, db: AsyncSession = Depends(get_async_db)):
+    db_company = Company(**company.dict())
+    db.add(db_company)
+    await db.commit()
+    await db.refresh(db_company)
+    return db_company
+
+@router.put("/{company_id}", response_model=CompanySchema)
+async def update_company(company_id: int, company: CompanyUpdate, db: AsyncSession = Depends(get_async_db)):
+    db_company = await db.get(Company, company_id)
+    if not db_company:
+        raise HTTPException(status_code=404, detail="Company not found")
+
+    update_data = company.dict(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(db_company, field, value)
+
+    await db.commit()
+    await db.refresh(db_company)
+    return db_company
+
+@router.delete("/{company_id}")
+async def delete_company(company_id: int, db: AsyncSession = Depends(get_async_db)):
+    db_company = await db.get(Company, company_id)
+    if not db_company:
+        raise HTTPException(status_code=404, detail="Company not found")
+
+    await db.delete(db_company)
+    await db.commit()
+    return {"message": "Company deleted successfully"}
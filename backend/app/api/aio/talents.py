@@ -0,0 +1,220 @@
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from ...database import SessionLocal, get_async_db, get_async_read_db
+from ...core.pagination import decode_cursor, next_cursor
+from ...core.counting import CountMode, count_cache, count_rows
+from ...crud.talent import (
+    talent_search_condition, talent_search_text, index_talent_change, rebuild_talent_search_index,
+    apply_talent_facet_filters, build_talent_facet, prepare_talent_data, bulk_import_talents, phone_owner_query,
+    talent_ids_query, bulk_delete_talents
+)
+from ...core.config import settings
+from ...core.search_index import talent_search_index
+from ...models.talent import Talent
+from ...schemas.talent import (
+    TalentCreate, TalentUpdate, Talent as TalentSchema, TalentList, ClassifyRequest, ClassifyResponse,
+    TalentBulkCreate, TalentBulkResult, TalentBulkMode, TalentBulkDelete
+)
+from ...core.classifier import CLASSIFIER_VERSION, classify_many, classification_cache
+from ...core.reclassify import reclassify_job
+
+router = APIRouter()
+
+# 清空人才表接口的确认口令
+TRUNCATE_CONFIRM = "TRUNCATE"
+
+def _check_phone_unique(owner_id: Optional[int]):
+    """电话号码已被其他人才使用时返回 409"""
+    if owner_id is not None:
+        raise HTTPException(status_code=409, detail=f"电话号码已存在（人才 {owner_id}）")
+
+def _rebuild_search_index():
+    db = SessionLocal()
+    try:
+        return rebuild_talent_search_index(db)
+    finally:
+        db.close()
+
+@router.post("/search-index/rebuild")
+async def rebuild_search_index():
+    """重建人才搜索的 n-gram 索引（仅 ngram 搜索后端），在线程中执行以免阻塞事件循环"""
+    if settings.talent_search_backend != "ngram":
+        raise HTTPException(status_code=400, detail="当前搜索后端不是 ngram")
+    await asyncio.to_thread(_rebuild_search_index)
+    return talent_search_index.stats()
+
+@router.post("/bulk", response_model=TalentBulkResult)
+async def bulk_create_talents(
+    request: TalentBulkCreate,
+    mode: TalentBulkMode = Query(TalentBulkMode.INSERT, description="导入方式：insert/upsert（按电话新增或更新）"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """批量导入人才：逐行校验，校验通过的行在一个事务内用多行 INSERT（upsert 时 INSERT ... ON CONFLICT）写入"""
+    if len(request.talents) > settings.talent_bulk_max_rows:
+        raise HTTPException(status_code=400, detail=f"单次最多新增 {settings.talent_bulk_max_rows} 条")
+
+    result, index_changes = await db.run_sync(bulk_import_talents, request.talents, mode == TalentBulkMode.UPSERT)
+    await db.commit()
+
+    for talent_id, old_text, new_text in index_changes:
+        index_talent_change(talent_id, old_text, new_text)
+    return result
+
+@router.delete("/bulk")
+async def bulk_delete_talents_endpoint(request: TalentBulkDelete, db: AsyncSession = Depends(get_async_db)):
+    """批量删除人才：按 id 列表和/或筛选条件选出人才，一条 DELETE 完成"""
+    if not any(request.model_dump().values()):
+        raise HTTPException(status_code=400, detail="请指定要删除的人才 id 或筛选条件")
+
+    deleted, index_changes = await db.run_sync(bulk_delete_talents, talent_ids_query(**request.model_dump()))
+    await db.commit()
+
+    for talent_id, old_text in index_changes:
+        index_talent_change(talent_id, old_text=old_text)
+    return {"deleted": deleted}
+
+@router.post("/truncate")
+async def truncate_talents(
+    confirm: str = Query(..., description=f"确认口令，必须为 {TRUNCATE_CONFIRM}"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """清空人才表并重置 id（TRUNCATE ... RESTART IDENTITY CASCADE）
+
+    沟通记录、证书、分类结果等引用人才表的表会被一并清空，需开启 ALLOW_TRUNCATE
+    """
+    if not settings.allow_truncate:
+        raise HTTPException(status_code=403, detail="未开启 ALLOW_TRUNCATE，不允许清空人才表")
+    if confirm != TRUNCATE_CONFIRM:
+        raise HTTPException(status_code=400, detail=f"确认口令应为 {TRUNCATE_CONFIRM}")
+
+    await db.execute(text("TRUNCATE TABLE talents RESTART IDENTITY CASCADE"))
+    await db.commit()
+
+    if settings.talent_search_backend == "ngram":
+        talent_search_index.rebuild([])
+    count_cache.clear()
+    return {"message": "人才数据已清空"}
+
+@router.post("/classify", response_model=ClassifyResponse)
+def classify_texts(request: ClassifyRequest):
+    """批量分类证书信息/沟通内容（不访问数据库）"""
+    # 纯 CPU 计算，定义为同步函数由线程池执行，不阻塞事件循环
+    if len(request.texts) > settings.classify_max_batch:
+        raise HTTPException(status_code=400, detail=f"单次最多分类 {settings.classify_max_batch} 条")
+    results = classify_many(request.texts)
+    return {"classifier_version": CLASSIFIER_VERSION, "results": [result._asdict() for result in results]}
+
+@router.get("/classify/cache")
+async def get_classification_cache_stats():
+    """分类缓存的命中统计"""
+    return classification_cache.stats()
+
+@router.post("/reclassify", status_code=202)
+async def start_reclassify(chunk_size: Optional[int] = Query(None, ge=1, le=50000)):
+    """启动后台重新分类任务（按主键分批重跑分类器，补齐为空的社保情况、合同价格）"""
+    if not reclassify_job.start(chunk_size or settings.reclassify_chunk_size):
+        raise HTTPException(status_code=409, detail="重新分类任务正在运行")
+    return reclassify_job.snapshot()
+
+@router.get("/reclassify/status")
+async def get_reclassify_status():
+    """重新分类任务的进度与吞吐"""
+    return reclassify_job.snapshot()
+
+@router.get("/", response_model=TalentList)
+async def get_talents(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="分页游标，传入后忽略 skip"),
+    search: Optional[str] = Query(None),
+    certificate_level: Optional[str] = Query(None),
+    certificate_specialty: Optional[str] = Query(None),
+    social_security_status: Optional[str] = Query(None),
+    count_mode: CountMode = Query(CountMode.EXACT, description="总数计算方式：exact/estimated/cached"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    stmt = select(Talent)
+
+    if search:
+        stmt = stmt.where(talent_search_condition(search))
+
+    # 证书等级、专业（支持多选）、社保情况筛选，走 talent_facets 索引
+    stmt = apply_talent_facet_filters(stmt, certificate_level, certificate_specialty, social_security_status)
+
+    total, total_is_estimate = await db.run_sync(count_rows, stmt, count_mode)
+
+    stmt = stmt.order_by(Talent.id)
+    if cursor:
+        stmt = stmt.where(Talent.id > decode_cursor(cursor)).limit(limit)
+    else:
+        stmt = stmt.offset(skip).limit(limit)
+    talents = (await db.execute(stmt)).scalars().all()
+
+    return TalentList(
+        talents=talents, total=total, total_is_estimate=total_is_estimate,
+        next_cursor=next_cursor(talents, limit, "id")
+    )
+
+@router.get("/{talent_id}", response_model=TalentSchema)
+async def get_talent(talent_id: int, db: AsyncSession = Depends(get_async_db)):
+    talent = await db.get(Talent, talent_id)
+    if not talent:
+        raise HTTPException(status_code=404, detail="Talent not found")
+    return talent
+
+@router.post("/", response_model=TalentSchema)
+async def create_talent(talent: TalentCreate, db: AsyncSession = Depends(get_async_db)):
+    owner_query = phone_owner_query(talent.phone)
+    if owner_query is not None:
+        _check_phone_unique(await db.scalar(owner_query))
+
+    db_talent = Talent(**prepare_talent_data(talent))
+    db.add(db_talent)
+    await db.flush()
+    await db.merge(build_talent_facet(db_talent))
+    await db.commit()
+    await db.refresh(db_talent)
+    index_talent_change(db_talent.id, new_text=talent_search_text(db_talent))
+    return db_talent
+
+@router.put("/{talent_id}", response_model=TalentSchema)
+async def update_talent(talent_id: int, talent: TalentUpdate, db: AsyncSession = Depends(get_async_db)):
+    db_talent = await db.get(Talent, talent_id)
+    if not db_talent:
+        raise HTTPException(status_code=404, detail="Talent not found")
+
+    update_data = talent.dict(exclude_unset=True)
+
+    # 处理空字符串，将其转换为None
+    for field, value in update_data.items():
+        if value == '':
+            update_data[field] = None
+
+    owner_query = phone_owner_query(update_data.get('phone'), talent_id)
+    if owner_query is not None:
+        _check_phone_unique(await db.scalar(owner_query))
+
+    old_text = talent_search_text(db_talent)
+    for field, value in update_data.items():
+        setattr(db_talent, field, value)
+    await db.merge(build_talent_facet(db_talent))
+
+    await db.commit()
+    await db.refresh(db_talent)
+    index_talent_change(db_talent.id, old_text, talent_search_text(db_talent))
+    return db_talent
+
+@router.delete("/{talent_id}")
+async def delete_talent(talent_id: int, db: AsyncSession = Depends(get_async_db)):
+    db_talent = await db.get(Talent, talent_id)
+    if not db_talent:
+        raise HTTPException(status_code=404, detail="Talent not found")
+
+    old_text = talent_search_text(db_talent)
+    await db.delete(db_talent)
+    await db.commit()
+    index_talent_change(talent_id, old_text=old_text)
+    return {"message": "Talent deleted successfully"}
@@ -1,14 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from typing import List
-from ..database import get_db
+from typing import List, Optional
+from ..database import get_db, get_read_db
+from ..core.pagination import decode_cursor, next_cursor
+from ..core.counting import CountMode, count_rows
 from ..models.communication import Communication
 from ..schemas.communication import CommunicationCreate, CommunicationUpdate, Communication as CommunicationSchema, CommunicationList
 
 router = APIRouter()
 
 @router.get("/", response_model=CommunicationList)
-def get_communications(skip: int = 0, limit: int = 100, company_id: int = None, talent_id: int = None, db: Session = Depends(get_db)):
+def get_communications(skip: int = 0, limit: int = 100, cursor: Optional[str] = None, company_id: int = None, talent_id: int = None, count_mode: CountMode = CountMode.EXACT, db: Session = Depends(get_read_db)):
     query = db.query(Communication)
     
     if company_id:
@@ -16,9 +18,16 @@ def get_communications(skip: int = 0, limit: int = 100, company_id: int = None,
     if talent_id:
         query = query.filter(Communication.talent_id == talent_id)
     
-    communications = query.offset(skip).limit(limit).all()
-    total = query.count()
-    return CommunicationList(communications=communications, total=total)
+    page_query = query.order_by(Communication.id)
+    if cursor:
+        communications = page_query.filter(Communication.id > decode_cursor(cursor)).limit(limit).all()
+    else:
+        communications = page_query.offset(skip).limit(limit).all()
+    total, total_is_estimate = count_rows(db, query.statement, count_mode)
+    return CommunicationList(
+        communications=communications, total=total, total_is_estimate=total_is_estimate,
+        next_cursor=next_cursor(communications, limit, "id")
+    )
 
 @router.get("/{communication_id}", response_model=CommunicationSchema)
 def get_communication(communication_id: int, db: Session = Depends(get_db)):
@@ -1,17 +1,27 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import List
-from ..database import get_db
+from typing import List, Optional
+from ..database import get_db, get_read_db
+from ..core.pagination import decode_cursor, next_cursor
+from ..core.counting import CountMode, count_rows
 from ..models.company import Company
 from ..schemas.company import CompanyCreate, CompanyUpdate, Company as CompanySchema, CompanyList
 
 router = APIRouter()
 
 @router.get("/", response_model=CompanyList)
-def get_companies(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    companies = db.query(Company).offset(skip).limit(limit).all()
-    total = db.query(Company).count()
-    return CompanyList(companies=companies, total=total)
+def get_companies(skip: int = 0, limit: int = 100, cursor: Optional[str] = None, count_mode: CountMode = CountMode.EXACT, db: Session = Depends(get_read_db)):
+    query = db.query(Company).order_by(Company.id)
+    if cursor:
+        companies = query.filter(Company.id > decode_cursor(cursor)).limit(limit).all()
+    else:
+        companies = query.offset(skip).limit(limit).all()
+    total, total_is_estimate = count_rows(db, select(Company), count_mode)
+    return CompanyList(
+        companies=companies, total=total, total_is_estimate=total_is_estimate,
+        next_cursor=next_cursor(companies, limit, "id")
+    )
 
 @router.get("/{company_id}", response_model=CompanySchema)
 def get_company(company_id: int, db: Session = Depends(get_db)):
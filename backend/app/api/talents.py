@@ -1,175 +1,152 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
+from sqlalchemy import text
 from typing import List, Optional
-import re
-from ..database import get_db
+from ..database import get_db, get_read_db
+from ..core.pagination import decode_cursor, next_cursor
+from ..core.counting import CountMode, count_cache, count_rows
+from ..crud.talent import (
+    talent_search_condition, talent_search_text, index_talent_change, rebuild_talent_search_index,
+    apply_talent_facet_filters, build_talent_facet, prepare_talent_data, bulk_import_talents, phone_owner_query,
+    talent_ids_query, bulk_delete_talents
+)
+from ..core.config import settings
+from ..core.search_index import talent_search_index
 from ..models.talent import Talent, CertificateLevel, CertificateSpecialty, SocialSecurityStatus
-from ..schemas.talent import TalentCreate, TalentUpdate, Talent as TalentSchema, TalentList
+from ..schemas.talent import (
+    TalentCreate, TalentUpdate, Talent as TalentSchema, TalentList, ClassifyRequest, ClassifyResponse,
+    TalentBulkCreate, TalentBulkResult, TalentBulkMode, TalentBulkDelete
+)
+from ..core.classifier import CLASSIFIER_VERSION, classify_many, classification_cache
+from ..core.reclassify import reclassify_job
 
 router = APIRouter()
 
-def auto_classify_certificate(cert_info: str, comm_content: str = None):
-    """自动分类证书信息"""
-    if not cert_info and not comm_content:
-        return None, None, None, None
-
-    # 合并证书信息和沟通内容
-    full_text = ""
-    if cert_info:
-        full_text += cert_info
-    if comm_content and comm_content != cert_info:
-        full_text += " " + comm_content
-
-    if not full_text:
-        return None, None, None, None
-
-    text_lower = full_text.lower()
-
-    # 提取证书等级
-    certificate_level = None
-    if any(keyword in text_lower for keyword in ["一建", "一级建造师", "考一建", "备考一建", "增项一建"]):
-        certificate_level = "一级"
-    elif any(keyword in text_lower for keyword in ["二建", "二级建造师", "2建", "二级"]):
-        certificate_level = "二级"
-    elif any(keyword in text_lower for keyword in ["高级工程师", "高工", "正高级工程师"]):
-        certificate_level = "高级工程师"
-    elif any(keyword in text_lower for keyword in ["中级工程师", "中工", "工程师"]) and "高级" not in text_lower and "初级" not in text_lower:
-        certificate_level = "中级工程师"
-    elif any(keyword in text_lower for keyword in ["初级工程师", "助理工程师", "技术员"]):
-        certificate_level = "初级工程师"
-    elif any(keyword in text_lower for keyword in ["三类人员a", "a类", "企业主要负责人", "法定代表人"]):
-        certificate_level = "三类人员A类"
-    elif any(keyword in text_lower for keyword in ["三类人员b", "b类", "项目负责人", "项目经理"]):
-        certificate_level = "三类人员B类"
-    elif any(keyword in text_lower for keyword in ["三类人员c", "c类", "安全员", "专职安全", "c1", "c2", "c3"]):
-        certificate_level = "三类人员C类"
-
-    # 提取证书专业
-    certificate_specialty = None
-    specialty_mapping = [
-        # 建造师专业
-        ("建筑工程", "建筑工程"),
-        ("市政公用工程", "市政公用工程"),
-        ("机电工程", "机电工程"),
-        ("公路工程", "公路工程"),
-        ("水利水电工程", "水利水电工程"),
-        ("矿业工程", "矿业工程"),
-        ("铁路工程", "铁路工程"),
-        ("民航机场工程", "民航机场工程"),
-        ("港口与航道工程", "港口与航道工程"),
-        ("通信与广电工程", "通信与广电工程"),
-        # 建造师简称
-        ("房建", "建筑工程"),
-        ("建筑", "建筑工程"),
-        ("市政", "市政公用工程"),
-        ("机电", "机电工程"),
-        ("公路", "公路工程"),
-        ("水利水电", "水利水电工程"),
-        ("水利", "水利水电工程"),
-        ("矿业", "矿业工程"),
-        ("铁路", "铁路工程"),
-        ("民航", "民航机场工程"),
-        ("港口", "港口与航道工程"),
-        ("航道", "港口与航道工程"),
-        ("通信", "通信与广电工程"),
-        ("广电", "通信与广电工程"),
-        # 工程师专业
-        ("建筑工程师", "建筑工程师"),
-        ("结构工程师", "结构工程师"),
-        ("电气工程师", "电气工程师"),
-        ("给排水工程师", "给排水工程师"),
-        ("暖通工程师", "暖通工程师"),
-        ("建筑设计工程师", "建筑设计工程师"),
-        ("工程造价工程师", "工程造价工程师"),
-        ("造价工程师", "工程造价工程师"),
-        ("测绘工程师", "测绘工程师"),
-        ("岩土工程师", "岩土工程师"),
-        ("建筑材料工程师", "建筑材料工程师"),
-        # 三类人员
-        ("安全员", "安全管理"),
-        ("安全管理", "安全管理"),
-        ("专职安全", "安全管理")
-    ]
-
-    for keyword, specialty in specialty_mapping:
-        if keyword in full_text:
-            certificate_specialty = specialty
-            break
-
-    # 提取社保情况
-    social_security_status = None
-    if any(keyword in text_lower for keyword in ["无社保", "没有社保", "社保不配合", "不配合", "社保公积金"]):
-        social_security_status = "无社保"
-    elif any(keyword in text_lower for keyword in ["唯一社保", "独立社保", "单独社保"]):
-        social_security_status = "唯一社保"
-
-    # 提取合同价格
-    contract_price = None
-    price_patterns = [
-        r'挂了(\d+\.?\d*)[万w]',
-        r'挂.*?(\d+\.?\d*)[万w]',
-        r'报价.*?(\d+\.?\d*)[万w]?',
-        r'价格.*?(\d+\.?\d*)[万w]?',
-        r'(\d+\.?\d*)[万w]',
-        r'(\d+\.?\d*)w',
-    ]
-
-    for pattern in price_patterns:
-        match = re.search(pattern, full_text)
-        if match:
-            try:
-                price = float(match.group(1))
-                if 'w' in full_text.lower() or '万' in full_text or price < 100:
-                    price = price * 10000
-                contract_price = price
-                break
-            except:
-                continue
-
-    return certificate_level, certificate_specialty, social_security_status, contract_price
+# 清空人才表接口的确认口令
+TRUNCATE_CONFIRM = "TRUNCATE"
+
+def _check_phone_unique(owner_id: Optional[int]):
+    """电话号码已被其他人才使用时返回 409"""
+    if owner_id is not None:
+        raise HTTPException(status_code=409, detail=f"电话号码已存在（人才 {owner_id}）")
+
+@router.post("/search-index/rebuild")
+def rebuild_search_index(db: Session = Depends(get_db)):
+    """重建人才搜索的 n-gram 索引（仅 ngram 搜索后端）"""
+    if settings.talent_search_backend != "ngram":
+        raise HTTPException(status_code=400, detail="当前搜索后端不是 ngram")
+    rebuild_talent_search_index(db)
+    return talent_search_index.stats()
+
+@router.post("/bulk", response_model=TalentBulkResult)
+def bulk_create_talents(
+    request: TalentBulkCreate,
+    mode: TalentBulkMode = Query(TalentBulkMode.INSERT, description="导入方式：insert/upsert（按电话新增或更新）"),
+    db: Session = Depends(get_db)
+):
+    """批量导入人才：逐行校验，校验通过的行在一个事务内用多行 INSERT（upsert 时 INSERT ... ON CONFLICT）写入"""
+    if len(request.talents) > settings.talent_bulk_max_rows:
+        raise HTTPException(status_code=400, detail=f"单次最多新增 {settings.talent_bulk_max_rows} 条")
+
+    result, index_changes = bulk_import_talents(db, request.talents, mode == TalentBulkMode.UPSERT)
+    db.commit()
+
+    for talent_id, old_text, new_text in index_changes:
+        index_talent_change(talent_id, old_text, new_text)
+    return result
+
+@router.delete("/bulk")
+def bulk_delete_talents_endpoint(request: TalentBulkDelete, db: Session = Depends(get_db)):
+    """批量删除人才：按 id 列表和/或筛选条件选出人才，一条 DELETE 完成"""
+    if not any(request.model_dump().values()):
+        raise HTTPException(status_code=400, detail="请指定要删除的人才 id 或筛选条件")
+
+    deleted, index_changes = bulk_delete_talents(db, talent_ids_query(**request.model_dump()))
+    db.commit()
+
+    for talent_id, old_text in index_changes:
+        index_talent_change(talent_id, old_text=old_text)
+    return {"deleted": deleted}
+
+@router.post("/truncate")
+def truncate_talents(
+    confirm: str = Query(..., description=f"确认口令，必须为 {TRUNCATE_CONFIRM}"),
+    db: Session = Depends(get_db)
+):
+    """清空人才表并重置 id（TRUNCATE ... RESTART IDENTITY CASCADE）
+
+    沟通记录、证书、分类结果等引用人才表的表会被一并清空，需开启 ALLOW_TRUNCATE
+    """
+    if not settings.allow_truncate:
+        raise HTTPException(status_code=403, detail="未开启 ALLOW_TRUNCATE，不允许清空人才表")
+    if confirm != TRUNCATE_CONFIRM:
+        raise HTTPException(status_code=400, detail=f"确认口令应为 {TRUNCATE_CONFIRM}")
+
+    db.execute(text("TRUNCATE TABLE talents RESTART IDENTITY CASCADE"))
+    db.commit()
+
+    if settings.talent_search_backend == "ngram":
+        talent_search_index.rebuild([])
+    count_cache.clear()
+    return {"message": "人才数据已清空"}
+
+@router.post("/classify", response_model=ClassifyResponse)
+def classify_texts(request: ClassifyRequest):
+    """批量分类证书信息/沟通内容（不访问数据库）"""
+    if len(request.texts) > settings.classify_max_batch:
+        raise HTTPException(status_code=400, detail=f"单次最多分类 {settings.classify_max_batch} 条")
+    results = classify_many(request.texts)
+    return {"classifier_version": CLASSIFIER_VERSION, "results": [result._asdict() for result in results]}
+
+@router.get("/classify/cache")
+def get_classification_cache_stats():
+    """分类缓存的命中统计"""
+    return classification_cache.stats()
+
+@router.post("/reclassify", status_code=202)
+def start_reclassify(chunk_size: Optional[int] = Query(None, ge=1, le=50000)):
+    """启动后台重新分类任务（按主键分批重跑分类器，补齐为空的社保情况、合同价格）"""
+    if not reclassify_job.start(chunk_size or settings.reclassify_chunk_size):
+        raise HTTPException(status_code=409, detail="重新分类任务正在运行")
+    return reclassify_job.snapshot()
+
+@router.get("/reclassify/status")
+def get_reclassify_status():
+    """重新分类任务的进度与吞吐"""
+    return reclassify_job.snapshot()
 
 @router.get("/", response_model=TalentList)
 def get_talents(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="分页游标，传入后忽略 skip"),
     search: Optional[str] = Query(None),
     certificate_level: Optional[str] = Query(None),  # 改为字符串类型
     certificate_specialty: Optional[str] = Query(None),  # 改为字符串类型
     social_security_status: Optional[str] = Query(None),  # 改为字符串类型
-    db: Session = Depends(get_db)
+    count_mode: CountMode = Query(CountMode.EXACT, description="总数计算方式：exact/estimated/cached"),
+    db: Session = Depends(get_read_db)
 ):
     query = db.query(Talent)
 
     if search:
-        query = query.filter(
-            Talent.name.contains(search) |
-            Talent.phone.contains(search) |
-            Talent.certificate_info.contains(search) |
-            Talent.communication_content.contains(search)
-        )
-
-    # 证书等级筛选
-    if certificate_level:
-        query = query.filter(Talent.certificate_level == certificate_level)
-
-    # 证书专业筛选（支持多选）
-    if certificate_specialty:
-        if ',' in certificate_specialty:
-            # 多选情况，分割字符串
-            specialties = [s.strip() for s in certificate_specialty.split(',')]
-            query = query.filter(Talent.certificate_specialty.in_(specialties))
-        else:
-            # 单选情况
-            query = query.filter(Talent.certificate_specialty == certificate_specialty)
-
-    # 社保情况筛选
-    if social_security_status:
-        query = query.filter(Talent.social_security_status == social_security_status)
-
-    total = query.count()
-    talents = query.offset(skip).limit(limit).all()
-
-    return TalentList(talents=talents, total=total)
+        query = query.filter(talent_search_condition(search))
+
+    # 证书等级、专业（支持多选）、社保情况筛选，走 talent_facets 索引
+    query = apply_talent_facet_filters(query, certificate_level, certificate_specialty, social_security_status)
+
+    total, total_is_estimate = count_rows(db, query.statement, count_mode)
+
+    query = query.order_by(Talent.id)
+    if cursor:
+        talents = query.filter(Talent.id > decode_cursor(cursor)).limit(limit).all()
+    else:
+        talents = query.offset(skip).limit(limit).all()
+
+    return TalentList(
+        talents=talents, total=total, total_is_estimate=total_is_estimate,
+        next_cursor=next_cursor(talents, limit, "id")
+    )
 
 @router.get("/{talent_id}", response_model=TalentSchema)
 def get_talent(talent_id: int, db: Session = Depends(get_db)):
@@ -180,22 +157,17 @@ def get_talent(talent_id: int, db: Session = Depends(get_db)):
 
 @router.post("/", response_model=TalentSchema)
 def create_talent(talent: TalentCreate, db: Session = Depends(get_db)):
-    talent_data = talent.dict()
-
-    # 处理空字符串，将其转换为None
-    for field in ['certificate_level', 'certificate_specialty', 'social_security_status',
-                  'gender', 'phone', 'wechat_note', 'certificate_info', 'communication_content']:
-        if talent_data.get(field) == '':
-            talent_data[field] = None
+    owner_query = phone_owner_query(talent.phone)
+    if owner_query is not None:
+        _check_phone_unique(db.scalar(owner_query))
 
-    # 设置默认意向等级
-    if not talent_data.get('intention_level'):
-        talent_data['intention_level'] = 'C'
-
-    db_talent = Talent(**talent_data)
+    db_talent = Talent(**prepare_talent_data(talent))
     db.add(db_talent)
+    db.flush()
+    db.merge(build_talent_facet(db_talent))
     db.commit()
     db.refresh(db_talent)
+    index_talent_change(db_talent.id, new_text=talent_search_text(db_talent))
     return db_talent
 
 @router.put("/{talent_id}", response_model=TalentSchema)
@@ -211,11 +183,18 @@ def update_talent(talent_id: int, talent: TalentUpdate, db: Session = Depends(ge
         if value == '':
             update_data[field] = None
 
+    owner_query = phone_owner_query(update_data.get('phone'), talent_id)
+    if owner_query is not None:
+        _check_phone_unique(db.scalar(owner_query))
+
+    old_text = talent_search_text(db_talent)
     for field, value in update_data.items():
         setattr(db_talent, field, value)
+    db.merge(build_talent_facet(db_talent))
 
     db.commit()
     db.refresh(db_talent)
+    index_talent_change(db_talent.id, old_text, talent_search_text(db_talent))
     return db_talent
 
 @router.delete("/{talent_id}")
@@ -223,7 +202,9 @@ def delete_talent(talent_id: int, db: Session = Depends(get_db)):
     db_talent = db.query(Talent).filter(Talent.id == talent_id).first()
     if not db_talent:
         raise HTTPException(status_code=404, detail="Talent not found")
-    
+
+    old_text = talent_search_text(db_talent)
     db.delete(db_talent)
     db.commit()
+    index_talent_change(talent_id, old_text=old_text)
     return {"message": "Talent deleted successfully"}
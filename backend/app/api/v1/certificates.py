@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from ...database import get_db
+from ...database import get_db, get_read_db
+from ...core.config import settings
+from ...core.pagination import decode_cursor, next_cursor
 from ...crud import certificate as crud_certificate
 from ...schemas.certificate import (
     Certificate, CertificateCreate, CertificateUpdate, CertificateQuery,
@@ -75,11 +77,11 @@ def get_certificates(
     talent_name: Optional[str] = Query(None, description="人才姓名"),
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="分页游标（响应头 X-Next-Cursor），传入后忽略 skip"),
+    response: Response = None,
+    db: Session = Depends(get_read_db)
 ):
     """获取证书列表"""
-    from ...models.talent import Talent
-
     query = CertificateQuery(
         talent_id=talent_id,
         certificate_type=certificate_type,
@@ -89,12 +91,18 @@ def get_certificates(
         level=level
     )
 
-    # 获取证书列表，支持人才名称搜索
-    certificates = crud_certificate.get_certificates(db, query, talent_name=talent_name, skip=skip, limit=limit)
+    # 获取证书列表，人才姓名和电话在同一条查询中关联取出
+    after_id = decode_cursor(cursor, str) if cursor else None
+    rows = crud_certificate.get_certificates_with_talent(db, query, talent_name=talent_name, skip=skip, limit=limit, after_id=after_id)
+
+    # 列表响应保持数组结构，下一页游标放在响应头中
+    cursor_token = next_cursor([cert for cert, _, _ in rows], limit, "certificate_id")
+    if cursor_token:
+        response.headers["X-Next-Cursor"] = cursor_token
 
     # 为每个证书添加人才信息
     result = []
-    for cert in certificates:
+    for cert, cert_talent_name, cert_talent_phone in rows:
         cert_dict = {
             'certificate_id': cert.certificate_id,
             'talent_id': cert.talent_id,
@@ -113,10 +121,9 @@ def get_certificates(
         }
 
         if cert.talent_id:
-            talent = db.query(Talent).filter(Talent.id == cert.talent_id).first()
-            if talent:
-                cert_dict['talent_name'] = talent.name
-                cert_dict['talent_phone'] = talent.phone
+            if cert_talent_name is not None:
+                cert_dict['talent_name'] = cert_talent_name
+                cert_dict['talent_phone'] = cert_talent_phone
             else:
                 cert_dict['talent_name'] = '未知'
                 cert_dict['talent_phone'] = ''
@@ -138,12 +145,9 @@ def get_certificate_stats(
     level: Optional[str] = Query(None, description="等级"),
     search: Optional[str] = Query(None, description="搜索关键词"),
     talent_name: Optional[str] = Query(None, description="人才姓名"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """获取证书统计信息"""
-    from ...models.talent import Talent
-    from datetime import datetime, timedelta
-
     query = CertificateQuery(
         talent_id=talent_id,
         certificate_type=certificate_type,
@@ -153,40 +157,10 @@ def get_certificate_stats(
         level=level
     )
 
-    # 获取所有符合条件的证书（不分页）
-    all_certificates = crud_certificate.get_certificates(db, query, talent_name=talent_name, skip=0, limit=10000)
-
-    # 统计数据
-    total = len(all_certificates)
-
-    # 导入枚举类型
-    from ...models.certificate import CertificateStatus
-
-    valid = len([cert for cert in all_certificates if cert.status == CertificateStatus.VALID])
-    expired = len([cert for cert in all_certificates if cert.status == CertificateStatus.EXPIRED])
-
-    # 计算即将过期的证书（30天内过期）
-    expiring_soon = 0
-    current_date = datetime.now().date()
-    for cert in all_certificates:
-        if cert.expiry_date and cert.status == CertificateStatus.VALID:
-            expiry_date = cert.expiry_date
-            if isinstance(expiry_date, str):
-                try:
-                    expiry_date = datetime.strptime(expiry_date, '%Y-%m-%d').date()
-                except:
-                    continue
-
-            days_until_expiry = (expiry_date - current_date).days
-            if 0 <= days_until_expiry <= 30:
-                expiring_soon += 1
-
-    return {
-        "total": total,
-        "valid": valid,
-        "expired": expired,
-        "expiring": expiring_soon
-    }
+    # 在数据库端一次聚合得到各项计数，不再把证书逐条加载到内存
+    return crud_certificate.get_certificate_stats(
+        db, query, talent_name=talent_name, use_rollup=settings.certificate_stats_rollup
+    )
 
 @router.post("/", response_model=Certificate)
 def create_certificate(
@@ -309,7 +283,7 @@ def get_talent_certificate_summary(
 def search_talents_by_certificate_type(
     certificate_type: str = Query(..., description="证书类型"),
     status: str = Query("VALID", description="证书状态"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """根据证书类型搜索人才"""
     return crud_certificate.search_talents_by_certificate_type(db, certificate_type, status)
@@ -318,7 +292,7 @@ def search_talents_by_certificate_type(
 def search_talents_by_category(
     category: str = Query(..., description="证书大类"),
     status: str = Query("VALID", description="证书状态"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """根据证书大类搜索人才"""
     return crud_certificate.search_talents_by_category(db, category, status)
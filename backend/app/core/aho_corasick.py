@@ -0,0 +1,55 @@
+"""
+Aho-Corasick 多模式匹配：一次扫描文本即可找出所有出现的关键字（包括相互重叠的关键字）
+只依赖标准库
+"""
+
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+
+class AhoCorasick:
+    """关键字自动机，转移表在构建时补全（不再需要沿失败指针回溯）"""
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: Tuple[str, ...] = tuple(dict.fromkeys(k for k in keywords if k))
+
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[Tuple[str, ...]] = [()]
+        for keyword in self.keywords:
+            state = 0
+            for char in keyword:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    outputs.append(())
+                state = next_state
+            outputs[state] += (keyword,)
+
+        # 按层序计算失败指针，并把失败状态的转移和输出合并进来
+        delta: List[Dict[str, int]] = [dict(goto[0])] + [{} for _ in goto[1:]]
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            delta[state] = dict(delta[fail[state]])
+            delta[state].update(goto[state])
+            outputs[state] += outputs[fail[state]]
+            for char, next_state in goto[state].items():
+                fail[next_state] = delta[fail[state]].get(char, 0)
+                queue.append(next_state)
+
+        self._delta = delta
+        self._outputs: List[FrozenSet[str]] = [frozenset(output) for output in outputs]
+
+    def find_all(self, text: str) -> set:
+        """返回文本中出现过的全部关键字"""
+        delta = self._delta
+        outputs = self._outputs
+        found = set()
+        state = 0
+        for char in text:
+            state = delta[state].get(char, 0)
+            if outputs[state]:
+                found |= outputs[state]
+        return found
@@ -0,0 +1,274 @@
+"""
+证书信息自动分类：证书等级、证书专业、社保情况、合同价格
+后端接口和 tools/ 下的导入脚本共用同一套规则（只依赖标准库，导入脚本通过 sys.path 引用），
+规则在进程内编译一次；规则变化时递增 CLASSIFIER_VERSION
+"""
+
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+from .aho_corasick import AhoCorasick
+
+CLASSIFIER_VERSION = 3
+
+class ClassificationResult(NamedTuple):
+    certificate_level: Optional[str] = None
+    certificate_specialty: Optional[str] = None
+    social_security_status: Optional[str] = None
+    contract_price: Optional[float] = None
+
+# 证书等级规则：按顺序取第一个命中的等级；excluded 中任一关键字出现时该等级不成立
+CERTIFICATE_LEVEL_RULES = [
+    ("一级", ("一建", "一级建造师", "考一建", "备考一建", "增项一建"), ()),
+    ("二级", ("二建", "二级建造师", "2建", "二级"), ()),
+    ("高级工程师", ("高级工程师", "高工", "正高级工程师"), ()),
+    ("中级工程师", ("中级工程师", "中工", "工程师"), ("高级", "初级")),
+    ("初级工程师", ("初级工程师", "助理工程师", "技术员"), ()),
+    ("三类人员A类", ("三类人员a", "a类", "企业主要负责人", "法定代表人"), ()),
+    ("三类人员B类", ("三类人员b", "b类", "项目负责人", "项目经理"), ()),
+    ("三类人员C类", ("三类人员c", "c类", "安全员", "专职安全", "c1", "c2", "c3"), ()),
+]
+
+# 证书专业关键字：多个命中时取表中靠前的一项
+SPECIALTY_MAPPING = [
+    # 建造师专业
+    ("建筑工程", "建筑工程"),
+    ("市政公用工程", "市政公用工程"),
+    ("机电工程", "机电工程"),
+    ("公路工程", "公路工程"),
+    ("水利水电工程", "水利水电工程"),
+    ("矿业工程", "矿业工程"),
+    ("铁路工程", "铁路工程"),
+    ("民航机场工程", "民航机场工程"),
+    ("港口与航道工程", "港口与航道工程"),
+    ("通信与广电工程", "通信与广电工程"),
+    # 建造师简称
+    ("房建", "建筑工程"),
+    ("建筑", "建筑工程"),
+    ("市政", "市政公用工程"),
+    ("机电", "机电工程"),
+    ("公路", "公路工程"),
+    ("水利水电", "水利水电工程"),
+    ("水利", "水利水电工程"),
+    ("矿业", "矿业工程"),
+    ("铁路", "铁路工程"),
+    ("民航机场", "民航机场工程"),
+    ("民航", "民航机场工程"),
+    ("港口与航道", "港口与航道工程"),
+    ("港口", "港口与航道工程"),
+    ("航道", "港口与航道工程"),
+    ("通信与广电", "通信与广电工程"),
+    ("通信", "通信与广电工程"),
+    ("广电", "通信与广电工程"),
+    # 工程师专业
+    ("建筑工程师", "建筑工程师"),
+    ("结构工程师", "结构工程师"),
+    ("电气工程师", "电气工程师"),
+    ("给排水工程师", "给排水工程师"),
+    ("暖通工程师", "暖通工程师"),
+    ("建筑设计工程师", "建筑设计工程师"),
+    ("工程造价工程师", "工程造价工程师"),
+    ("造价工程师", "工程造价工程师"),
+    ("测绘工程师", "测绘工程师"),
+    ("岩土工程师", "岩土工程师"),
+    ("建筑材料工程师", "建筑材料工程师"),
+    # 三类人员
+    ("安全员", "安全管理"),
+    ("安全管理", "安全管理"),
+    ("专职安全", "安全管理")
+]
+
+# 社保情况规则：按顺序取第一个命中的状态
+SOCIAL_SECURITY_RULES = [
+    ("无社保", ("无社保", "没有社保", "社保不配合", "不配合", "社保公积金")),
+    ("唯一社保", ("唯一社保", "独立社保", "单独社保")),
+]
+
+# 合同价格：按顺序取第一个匹配的模式，金额和单位都取自该次匹配；
+# 金额整数部分最多 6 位，前后都不能紧跟数字，电话号码等长数字串整体不会被当作金额
+_AMOUNT = r'(?<![\d.])(?P<amount>\d{1,6}(?:\.\d+)?)(?!\d)'
+_UNIT = r'(?P<unit>[万wW])'
+PRICE_PATTERNS = [
+    r'挂了' + _AMOUNT + _UNIT,               # 挂了2w
+    r'挂.*?' + _AMOUNT + _UNIT,              # 挂xxx2w
+    r'报价.*?' + _AMOUNT + _UNIT + '?',      # 报价3.5, 报价2.2
+    r'价格.*?' + _AMOUNT + _UNIT + '?',      # 价格2.7w
+    _AMOUNT + _UNIT,                         # 直接的数字+万/w
+]
+PRICE_UNITS = {"万": 10000, "w": 10000, "W": 10000}
+WAN_AMOUNT_THRESHOLD = 100  # 没有单位且小于该值的金额按万元计
+# 价格上限，与 contract_price、talent_facets.price 列的 NUMERIC(10, 2) 一致；超出的按未识别处理
+MAX_CONTRACT_PRICE = 99999999.99
+
+# 纯 Python 的自动机逐字符推进，文本较长时逐个关键字做 C 实现的子串查找（命中即停）反而更快
+AUTOMATON_MAX_TEXT_LENGTH = 24
+
+def _contains_any(source, keywords) -> bool:
+    if isinstance(source, set):
+        return not source.isdisjoint(keywords)
+    return any(keyword in source for keyword in keywords)
+
+class CertificateClassifier:
+    """编译后的分类规则；关键字均为中文或小写字母，统一在小写文本上匹配"""
+
+    def __init__(self, level_rules=CERTIFICATE_LEVEL_RULES, specialty_mapping=SPECIALTY_MAPPING,
+                 social_security_rules=SOCIAL_SECURITY_RULES, price_patterns=PRICE_PATTERNS,
+                 version: int = CLASSIFIER_VERSION):
+        self.version = version
+        self.level_rules = tuple((level, tuple(keywords), tuple(excluded)) for level, keywords, excluded in level_rules)
+        self.specialty_mapping = tuple(specialty_mapping)
+        self.social_security_rules = tuple((status, tuple(keywords)) for status, keywords in social_security_rules)
+        self.price_patterns = tuple(re.compile(pattern) for pattern in price_patterns)
+
+        self.keywords = tuple(dict.fromkeys(
+            [keyword for _, keywords, excluded in self.level_rules for keyword in keywords + excluded]
+            + [keyword for keyword, _ in self.specialty_mapping]
+            + [keyword for _, keywords in self.social_security_rules for keyword in keywords]
+        ))
+        self._automaton = AhoCorasick(self.keywords)
+
+    def _keyword_source(self, text_lower: str):
+        """短文本返回自动机一次扫描得到的命中集合，长文本直接返回文本；两者都支持 `关键字 in ...`"""
+        if len(text_lower) <= AUTOMATON_MAX_TEXT_LENGTH:
+            return self._automaton.find_all(text_lower)
+        return text_lower
+
+    def _level(self, source) -> Optional[str]:
+        for level, keywords, excluded in self.level_rules:
+            if _contains_any(source, keywords) and not _contains_any(source, excluded):
+                return level
+        return None
+
+    def _specialty(self, source) -> Optional[str]:
+        for keyword, specialty in self.specialty_mapping:
+            if keyword in source:
+                return specialty
+        return None
+
+    def _social_security(self, source) -> Optional[str]:
+        for status, keywords in self.social_security_rules:
+            if _contains_any(source, keywords):
+                return status
+        return None
+
+    def _price(self, text: str) -> Optional[float]:
+        for pattern in self.price_patterns:
+            match = pattern.search(text)
+            if match:
+                amount = float(match.group("amount"))
+                unit = match.group("unit")
+                if unit:
+                    price = amount * PRICE_UNITS[unit]
+                else:
+                    price = amount * 10000 if amount < WAN_AMOUNT_THRESHOLD else amount
+                return price if price <= MAX_CONTRACT_PRICE else None
+        return None
+
+    def classify(self, text: str) -> ClassificationResult:
+        """对一段文本提取全部分类字段"""
+        if not text:
+            return ClassificationResult()
+        text = str(text)
+        text_lower = text.lower()
+        source = self._keyword_source(text_lower)
+        return ClassificationResult(
+            self._level(source),
+            self._specialty(source),
+            self._social_security(source),
+            self._price(text),
+        )
+
+    def level(self, text: str) -> Optional[str]:
+        return self._level(self._keyword_source(str(text).lower())) if text else None
+
+    def specialty(self, text: str) -> Optional[str]:
+        return self._specialty(self._keyword_source(str(text).lower())) if text else None
+
+    def social_security(self, text: str) -> Optional[str]:
+        return self._social_security(self._keyword_source(str(text).lower())) if text else None
+
+    def price(self, text: str) -> Optional[float]:
+        return self._price(str(text)) if text else None
+
+default_classifier = CertificateClassifier()
+
+# 只折叠空格和制表符，换行会影响价格模式（.*? 不跨行）的匹配范围
+_HORIZONTAL_SPACE = re.compile(r'[ \t\u3000]+')
+
+def normalize_text(text: str) -> str:
+    """分类前的文本规范化：转小写、去首尾空白、折叠连续空格；规范化前后分类结果相同"""
+    return _HORIZONTAL_SPACE.sub(' ', str(text).strip().lower())
+
+class ClassificationCache:
+    """分类结果的 LRU 缓存，键为规范化文本的摘要和规则版本；规则版本变化时自动清空"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+
+    def classify(self, text: str, classifier: CertificateClassifier = None) -> ClassificationResult:
+        classifier = classifier or default_classifier
+        if not text:
+            return ClassificationResult()
+        normalized = normalize_text(text)
+        key = (classifier.version, hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).digest())
+
+        with self._lock:
+            if classifier.version != self._version:
+                self._entries.clear()
+                self._version = classifier.version
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+            self.misses += 1
+
+        result = classifier.classify(normalized)
+        with self._lock:
+            self._entries[key] = result
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "classifier_version": self._version,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+classification_cache = ClassificationCache(int(os.getenv("CLASSIFICATION_CACHE_SIZE", "50000")))
+
+def classify_text(text: str) -> ClassificationResult:
+    """经过缓存的分类"""
+    return classification_cache.classify(text)
+
+def classify_many(texts) -> list:
+    """批量分类，重复文本直接取缓存结果"""
+    return [classify_text(text) for text in texts]
+
+def classify_certificate(cert_info: Optional[str], comm_content: Optional[str] = None) -> ClassificationResult:
+    """合并证书信息和沟通内容后分类"""
+    full_text = cert_info or ""
+    if comm_content and comm_content != cert_info:
+        full_text += " " + comm_content
+    return classify_text(full_text)
@@ -7,6 +7,46 @@ class Settings(BaseSettings):
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
 
+    # 连接池配置
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: float = 30  # 签出连接的最长等待秒数
+    db_pool_recycle: int = 1800  # 连接最长复用秒数，-1 表示不回收
+    db_pool_pre_ping: bool = True
+
+    # 只读副本：列表、搜索、统计等只读接口走副本，副本不可用或延迟过大时回退主库
+    replica_database_url: str = os.getenv("REPLICA_DATABASE_URL", "")
+    replica_max_lag_seconds: float = 10
+    replica_check_interval: float = 5  # 副本健康检查间隔（秒）
+
+    # 列表总数：cached 模式的缓存时长与容量；estimated 模式下估算值低于该阈值时改为精确计数
+    count_cache_ttl: float = 30
+    count_cache_size: int = 1024
+    count_estimate_threshold: int = 1000
+
+    # 人才搜索：trgm 使用 search_text 列（pg_trgm 索引），ngram 使用进程内倒排索引，like 逐列匹配
+    talent_search_backend: str = "trgm"
+    search_index_max_candidates: int = 5000  # ngram 候选 id 超过该数量时退回 like
+
+    # 批量分类接口单次最多文本数
+    classify_max_batch: int = 50000
+
+    # 批量新增人才接口单次最多行数
+    talent_bulk_max_rows: int = 10000
+
+    # 允许 POST /api/talents/truncate 清空人才及关联数据（仅用于测试/重新导入环境）
+    allow_truncate: bool = False
+
+    # 后台重新分类任务每批处理的人才数
+    reclassify_chunk_size: int = 1000
+
+    # 证书统计读取汇总表（需先执行 migrations/add_certificate_stats_rollup.py 安装触发器）
+    certificate_stats_rollup: bool = False
+
+    # 异步数据库模式：开启后使用 AsyncSession + asyncpg 驱动的路由
+    async_db: bool = False
+    async_database_url: str = os.getenv("ASYNC_DATABASE_URL", "")  # 为空时由 database_url 推导
+
     class Config:
         env_file = ".env"
 
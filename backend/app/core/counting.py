@@ -0,0 +1,112 @@
+"""
+分页列表总数的计算方式：
+- exact：精确 COUNT(*)
+- estimated：PostgreSQL 估算值，无筛选时读 pg_class.reltuples，有筛选时取 EXPLAIN 的 Plan Rows；
+  估算值小于 count_estimate_threshold 时精确计数的代价很低，直接返回精确值
+- cached：精确值按查询签名（SQL + 参数）缓存 count_cache_ttl 秒
+"""
+
+import enum
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from sqlalchemy import select, func, text, Table
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from .config import settings
+
+class CountMode(str, enum.Enum):
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    CACHED = "cached"
+
+class CountCache:
+    """带过期时间的 LRU 计数缓存（线程安全）"""
+
+    def __init__(self, max_entries: int):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.max_entries = max_entries
+
+    def get(self, key: str) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, total = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return total
+
+    def set(self, key: str, total: int, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, total)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+count_cache = CountCache(settings.count_cache_size)
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) <statement>，参数按正常方式绑定"""
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+def _exact_count(db: Session, stmt) -> int:
+    return db.execute(select(func.count()).select_from(stmt.order_by(None).subquery())).scalar()
+
+def _planner_estimate(db: Session, stmt) -> Optional[int]:
+    froms = stmt.get_final_froms()
+    if stmt.whereclause is None and len(froms) == 1 and isinstance(froms[0], Table):
+        # reltuples 为 -1 表示表从未 ANALYZE 过
+        reltuples = db.execute(
+            text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:table_name)"),
+            {"table_name": froms[0].name}
+        ).scalar()
+        return int(reltuples) if reltuples is not None and reltuples >= 0 else None
+
+    plan = db.execute(Explain(stmt.order_by(None))).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+def _signature(db: Session, stmt) -> str:
+    compiled = stmt.compile(dialect=db.get_bind().dialect)
+    raw = compiled.string + "|" + repr(sorted(compiled.params.items()))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+def count_rows(db: Session, stmt, mode: CountMode = CountMode.EXACT) -> Tuple[int, bool]:
+    """按指定方式计算 stmt 的结果总数，返回 (总数, 是否为估算值)
+
+    异步会话通过 AsyncSession.run_sync(count_rows, stmt, mode) 调用
+    """
+    if mode == CountMode.CACHED:
+        key = _signature(db, stmt)
+        total = count_cache.get(key)
+        if total is None:
+            total = _exact_count(db, stmt)
+            count_cache.set(key, total, settings.count_cache_ttl)
+        return total, False
+
+    if mode == CountMode.ESTIMATED and db.get_bind().dialect.name == "postgresql":
+        estimate = _planner_estimate(db, stmt)
+        if estimate is not None and estimate >= settings.count_estimate_threshold:
+            return estimate, True
+
+    return _exact_count(db, stmt), False
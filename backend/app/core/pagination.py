@@ -0,0 +1,30 @@
+"""
+游标（keyset）分页：游标是对上一页最后一行主键的不透明编码，
+下一页通过 WHERE pk > :last ORDER BY pk 定位，不随页深扫描被跳过的行
+"""
+
+import base64
+import json
+from fastapi import HTTPException
+
+def encode_cursor(last_key) -> str:
+    """将上一页最后一行的主键编码为游标"""
+    raw = json.dumps({"k": last_key}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+def decode_cursor(cursor: str, key_type=int):
+    """解析游标，返回上一页最后一行的主键"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))["k"]
+        if not isinstance(value, key_type) or isinstance(value, bool):
+            raise ValueError(cursor)
+        return value
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="无效的分页游标")
+
+def next_cursor(rows, limit: int, key: str):
+    """本页已满时返回下一页游标，否则说明已到末页"""
+    if len(rows) < limit:
+        return None
+    return encode_cursor(getattr(rows[-1], key))
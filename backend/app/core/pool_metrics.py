@@ -0,0 +1,84 @@
+"""
+连接池监控：记录连接签出等待时间，并汇总连接池实时状态
+"""
+
+import threading
+import time
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+class CheckoutMetrics:
+    """连接签出等待时间统计（线程安全）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.last_wait = 0.0
+
+    def record(self, wait: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+                self.total_wait += wait
+                self.last_wait = wait
+                if wait > self.max_wait:
+                    self.max_wait = wait
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            avg_wait = self.total_wait / self.checkouts if self.checkouts else 0.0
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(avg_wait * 1000, 3),
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+                "last_wait_ms": round(self.last_wait * 1000, 3),
+            }
+
+class _TimedCheckoutMixin:
+    """在连接池取连接时计时，等待时间包含排队与新建连接的耗时"""
+
+    @property
+    def checkout_metrics(self) -> CheckoutMetrics:
+        metrics = self.__dict__.get("_checkout_metrics")
+        if metrics is None:
+            metrics = self.__dict__.setdefault("_checkout_metrics", CheckoutMetrics())
+        return metrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            self.checkout_metrics.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.checkout_metrics.record(time.perf_counter() - start)
+        return conn
+
+class TimedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+class TimedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+def pool_status(pool) -> dict:
+    """汇总连接池状态：已签出、空闲、溢出连接数以及签出等待时间"""
+    status = {"pool_class": type(pool).__name__}
+    # 非 QueuePool（如 SQLite 使用的 SingletonThreadPool）没有这些计数方法
+    if isinstance(pool, QueuePool):
+        status.update({
+            "pool_size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+            "timeout": pool.timeout(),
+        })
+    if isinstance(pool, _TimedCheckoutMixin):
+        status["checkout_wait"] = pool.checkout_metrics.snapshot()
+    return status
@@ -0,0 +1,89 @@
+"""
+后台批量重新分类任务：规则更新后对全部人才重跑分类器
+按主键分批处理，每批独立的短事务，内存中只保留一批数据；同一进程内同时只运行一个任务
+"""
+
+import threading
+import time
+from typing import Optional
+from sqlalchemy import select
+from .classifier import CLASSIFIER_VERSION
+from .counting import CountMode, count_rows
+from ..database import SessionLocal
+from ..crud.talent import reclassify_talents_chunk
+from ..models.talent import Talent
+
+class ReclassifyJob:
+    """任务状态与后台线程"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._state = {"status": "idle"}
+
+    def start(self, chunk_size: int) -> bool:
+        """启动任务，已有任务在运行时返回 False"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            self._state = {
+                "status": "running",
+                "classifier_version": CLASSIFIER_VERSION,
+                "chunk_size": chunk_size,
+                "started_at": time.time(),
+                "finished_at": None,
+                "total_estimate": None,
+                "processed": 0,
+                "updated": 0,
+                "last_id": 0,
+                "rows_per_second": 0.0,
+                "error": None,
+            }
+            self._thread = threading.Thread(target=self._run, args=(chunk_size,), name="talent-reclassify", daemon=True)
+            self._thread.start()
+            return True
+
+    def _update(self, **changes):
+        with self._lock:
+            self._state.update(changes)
+
+    def _run(self, chunk_size: int):
+        start = time.perf_counter()
+        processed = updated = 0
+        last_id = 0
+        db = SessionLocal()
+        try:
+            total, _ = count_rows(db, select(Talent), CountMode.ESTIMATED)
+            db.commit()
+            self._update(total_estimate=total)
+
+            while True:
+                chunk_last_id, chunk_processed, chunk_updated = reclassify_talents_chunk(db, last_id, chunk_size)
+                if chunk_last_id is None:
+                    break
+                last_id = chunk_last_id
+                processed += chunk_processed
+                updated += chunk_updated
+                elapsed = time.perf_counter() - start
+                self._update(
+                    processed=processed, updated=updated, last_id=last_id,
+                    rows_per_second=round(processed / elapsed, 1) if elapsed > 0 else 0.0
+                )
+
+            self._update(status="completed", finished_at=time.time())
+        except Exception as e:
+            db.rollback()
+            self._update(status="failed", error=str(e), finished_at=time.time())
+        finally:
+            db.close()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            state = dict(self._state)
+        if state.get("status") == "running" and state.get("started_at"):
+            state["elapsed_seconds"] = round(time.time() - state["started_at"], 1)
+        if state.get("total_estimate"):
+            state["progress"] = round(min(state["processed"] / state["total_estimate"], 1.0), 4)
+        return state
+
+reclassify_job = ReclassifyJob()
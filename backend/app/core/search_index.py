@@ -0,0 +1,153 @@
+"""
+进程内 n-gram 倒排索引，用于没有 pg_trgm 的部署（TALENT_SEARCH_BACKEND=ngram）
+以单字和相邻两字为词项，倒排表为按 id 升序的 array('I')；
+查询时对关键字的二元组倒排表求交集得到候选 id，再由数据库按原条件校验。
+索引只存在于当前进程，多进程（多个 worker）部署时各进程的索引不会互相同步。
+"""
+
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+def _grams(text: str) -> Set[str]:
+    """文本的单字与二元组词项（跳过含空白字符的词项）"""
+    grams = set()
+    previous = ""
+    for char in text:
+        if char.isspace():
+            previous = ""
+            continue
+        grams.add(char)
+        if previous:
+            grams.add(previous + char)
+        previous = char
+    return grams
+
+def _query_grams(query: str) -> Set[str]:
+    """查询关键字的词项：优先用二元组，关键字只有单字时用单字"""
+    grams = _grams(query)
+    bigrams = {gram for gram in grams if len(gram) == 2}
+    return bigrams or grams
+
+def _insert(posting: array, doc_id: int):
+    if not posting or posting[-1] < doc_id:
+        posting.append(doc_id)
+        return
+    i = bisect_left(posting, doc_id)
+    if i == len(posting) or posting[i] != doc_id:
+        posting.insert(i, doc_id)
+
+def _discard(posting: array, doc_id: int):
+    i = bisect_left(posting, doc_id)
+    if i < len(posting) and posting[i] == doc_id:
+        posting.pop(i)
+
+class NgramIndex:
+    """线程安全的 n-gram 倒排索引；文本由调用方统一转小写"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings: Dict[str, array] = {}
+        self._journal: Optional[List[Tuple[int, str, str]]] = None  # 重建期间的增量修改
+        self.ready = False
+        self.documents = 0
+        self.built_at: Optional[float] = None
+        self.build_seconds: Optional[float] = None
+
+    def _apply(self, postings: Dict[str, array], doc_id: int, old_text: str, new_text: str):
+        old_grams = _grams(old_text)
+        new_grams = _grams(new_text)
+        for gram in old_grams - new_grams:
+            posting = postings.get(gram)
+            if posting is not None:
+                _discard(posting, doc_id)
+                if not posting:
+                    del postings[gram]
+        for gram in new_grams - old_grams:
+            posting = postings.get(gram)
+            if posting is None:
+                posting = postings[gram] = array("I")
+            _insert(posting, doc_id)
+
+    def update(self, doc_id: int, old_text: str, new_text: str):
+        """文档变更：新增时 old_text 为空，删除时 new_text 为空"""
+        with self._lock:
+            self._apply(self._postings, doc_id, old_text, new_text)
+            if self._journal is not None:
+                self._journal.append((doc_id, old_text, new_text))
+            self.documents += bool(new_text) - bool(old_text)
+
+    def rebuild(self, documents: Iterable[Tuple[int, str]]) -> int:
+        """从 (id, 文本) 序列重建索引，重建期间的增量修改在切换前补做"""
+        start = time.perf_counter()
+        with self._lock:
+            self._journal = []
+
+        postings: Dict[str, array] = {}
+        count = 0
+        try:
+            for doc_id, text in documents:
+                for gram in _grams(text):
+                    posting = postings.get(gram)
+                    if posting is None:
+                        posting = postings[gram] = array("I")
+                    _insert(posting, doc_id)
+                count += 1
+        except Exception:
+            with self._lock:
+                self._journal = None
+            raise
+
+        with self._lock:
+            # 重建读到的快照可能已包含部分增量修改，插入和删除都是幂等的，按顺序重放即可
+            for doc_id, old_text, new_text in self._journal:
+                self._apply(postings, doc_id, old_text, new_text)
+                count += bool(new_text) - bool(old_text)
+            self._journal = None
+            self._postings = postings
+            self.documents = count
+            self.ready = True
+            self.built_at = time.time()
+            self.build_seconds = round(time.perf_counter() - start, 3)
+        return count
+
+    def candidates(self, query: str, max_candidates: int) -> Optional[List[int]]:
+        """返回可能包含关键字的 id（升序）；索引未就绪、关键字无词项或候选过多时返回 None"""
+        grams = _query_grams(query.lower())
+        if not grams:
+            return None
+
+        with self._lock:
+            if not self.ready:
+                return None
+            postings = sorted((self._postings.get(gram, array("I")) for gram in grams), key=len)
+            result = list(postings[0])
+            for posting in postings[1:]:
+                if not result:
+                    break
+                size = len(posting)
+                kept = []
+                for doc_id in result:
+                    i = bisect_left(posting, doc_id)
+                    if i < size and posting[i] == doc_id:
+                        kept.append(doc_id)
+                result = kept
+
+        if len(result) > max_candidates:
+            return None
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "documents": self.documents,
+                "grams": len(self._postings),
+                "postings": sum(len(posting) for posting in self._postings.values()),
+                "built_at": self.built_at,
+                "build_seconds": self.build_seconds,
+            }
+
+talent_search_index = NgramIndex()
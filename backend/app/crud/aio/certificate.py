@@ -0,0 +1,220 @@
+from sqlalchemy import select, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from ...models.certificate import Certificate, CertificateType
+from ...models.talent import Talent
+from ..certificate import (
+    apply_certificate_filters, paginate_certificates,
+    certificate_stats_statement, rollup_stats_statement, rollup_supports
+)
+from ...schemas.certificate import (
+    CertificateCreate, CertificateUpdate, CertificateQuery,
+    CertificateTypeCreate, CertificateTypeUpdate,
+    TalentCertificateSummary, CertificateSearchResult
+)
+
+# 证书类型CRUD操作（异步版本，与 crud/certificate.py 一一对应）
+async def get_certificate_types(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[CertificateType]:
+    """获取证书类型列表"""
+    result = await db.execute(
+        select(CertificateType).where(CertificateType.is_active == True)
+        .order_by(CertificateType.sort_order, CertificateType.type_name)
+        .offset(skip).limit(limit)
+    )
+    return result.scalars().all()
+
+async def get_certificate_type_by_code(db: AsyncSession, type_code: str) -> Optional[CertificateType]:
+    """根据类型代码获取证书类型"""
+    return await db.scalar(select(CertificateType).where(CertificateType.type_code == type_code))
+
+async def get_certificate_type_by_name(db: AsyncSession, type_name: str) -> Optional[CertificateType]:
+    """根据类型名称获取证书类型"""
+    return await db.scalar(select(CertificateType).where(CertificateType.type_name == type_name))
+
+async def create_certificate_type(db: AsyncSession, certificate_type: CertificateTypeCreate) -> CertificateType:
+    """创建证书类型"""
+    db_certificate_type = CertificateType(**certificate_type.model_dump())
+    db.add(db_certificate_type)
+    await db.commit()
+    await db.refresh(db_certificate_type)
+    return db_certificate_type
+
+async def update_certificate_type(db: AsyncSession, type_code: str, certificate_type: CertificateTypeUpdate) -> Optional[CertificateType]:
+    """更新证书类型"""
+    db_certificate_type = await get_certificate_type_by_code(db, type_code)
+    if db_certificate_type:
+        update_data = certificate_type.model_dump(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(db_certificate_type, field, value)
+        await db.commit()
+        await db.refresh(db_certificate_type)
+    return db_certificate_type
+
+# 具体证书CRUD操作
+async def get_certificate(db: AsyncSession, certificate_id: str) -> Optional[Certificate]:
+    """根据证书ID获取证书"""
+    return await db.get(Certificate, certificate_id)
+
+async def get_certificates_by_talent(db: AsyncSession, talent_id: int) -> List[Certificate]:
+    """获取某个人才的所有证书"""
+    result = await db.execute(select(Certificate).where(Certificate.talent_id == talent_id))
+    return result.scalars().all()
+
+async def get_certificates(db: AsyncSession, query: CertificateQuery, talent_name: str = None, skip: int = 0, limit: int = 100, after_id: str = None) -> List[Certificate]:
+    """根据查询条件获取证书列表，after_id 为游标分页的上一页最后一个证书ID"""
+    stmt = apply_certificate_filters(select(Certificate), query, talent_name)
+    result = await db.execute(paginate_certificates(stmt, skip, limit, after_id))
+    return result.scalars().all()
+
+async def get_certificates_with_talent(db: AsyncSession, query: CertificateQuery, talent_name: str = None, skip: int = 0, limit: int = 100, after_id: str = None):
+    """获取证书列表并在同一条查询中带出人才姓名和电话"""
+    stmt = select(
+        Certificate,
+        Talent.name.label('talent_name'),
+        Talent.phone.label('talent_phone')
+    ).outerjoin(Talent, Certificate.talent_id == Talent.id)
+    stmt = apply_certificate_filters(stmt, query, talent_name, talent_joined=True)
+    result = await db.execute(paginate_certificates(stmt, skip, limit, after_id))
+    return result.all()
+
+async def get_certificate_stats(db: AsyncSession, query: CertificateQuery, talent_name: str = None, expiring_days: int = 30, use_rollup: bool = False) -> dict:
+    """获取证书统计信息（数据库端聚合），use_rollup 含义同 crud.certificate.get_certificate_stats"""
+    if use_rollup and rollup_supports(query, talent_name):
+        stmt = rollup_stats_statement(query, expiring_days)
+    else:
+        stmt = certificate_stats_statement(query, talent_name, expiring_days)
+    row = (await db.execute(stmt)).one()
+    return {
+        "total": row.total,
+        "valid": row.valid,
+        "expired": row.expired,
+        "expiring": row.expiring
+    }
+
+async def create_certificate(db: AsyncSession, certificate: CertificateCreate) -> Certificate:
+    """创建证书"""
+    cert_data = certificate.model_dump()
+
+    # 自动生成证书名称（如果没有提供）
+    if not cert_data.get('certificate_name'):
+        certificate_name = cert_data.get('certificate_type', '')
+        if cert_data.get('specialty'):
+            certificate_name += f"（{cert_data['specialty']}）"
+        cert_data['certificate_name'] = certificate_name
+
+    db_certificate = Certificate(**cert_data)
+    db.add(db_certificate)
+    await db.commit()
+    await db.refresh(db_certificate)
+    return db_certificate
+
+async def update_certificate(db: AsyncSession, certificate_id: str, certificate: CertificateUpdate) -> Optional[Certificate]:
+    """更新证书"""
+    db_certificate = await get_certificate(db, certificate_id)
+    if db_certificate:
+        update_data = certificate.model_dump(exclude_unset=True)
+
+        # 如果更新了证书类型或专业，自动更新证书名称
+        if 'certificate_type' in update_data or 'specialty' in update_data:
+            cert_type = update_data.get('certificate_type', db_certificate.certificate_type)
+            specialty = update_data.get('specialty', db_certificate.specialty)
+
+            certificate_name = cert_type
+            if specialty:
+                certificate_name += f"（{specialty}）"
+            update_data['certificate_name'] = certificate_name
+
+        for field, value in update_data.items():
+            setattr(db_certificate, field, value)
+        await db.commit()
+        await db.refresh(db_certificate)
+    return db_certificate
+
+async def delete_certificate(db: AsyncSession, certificate_id: str) -> bool:
+    """删除证书"""
+    db_certificate = await get_certificate(db, certificate_id)
+    if db_certificate:
+        await db.delete(db_certificate)
+        await db.commit()
+        return True
+    return False
+
+# 高级查询功能
+def _search_result_columns():
+    return select(
+        Certificate.talent_id,
+        Talent.name.label('talent_name'),
+        Talent.phone,
+        Certificate.certificate_type,
+        Certificate.certificate_name,
+        Certificate.specialty,
+        Certificate.level,
+        Certificate.status,
+        Certificate.expiry_date
+    ).join(Talent, Certificate.talent_id == Talent.id)
+
+def _to_search_results(rows) -> List[CertificateSearchResult]:
+    return [CertificateSearchResult(
+        talent_id=r.talent_id,
+        talent_name=r.talent_name,
+        phone=r.phone,
+        certificate_type=r.certificate_type,
+        certificate_name=r.certificate_name,
+        specialty=r.specialty,
+        level=r.level,
+        status=r.status,
+        expiry_date=r.expiry_date
+    ) for r in rows]
+
+async def search_talents_by_certificate_type(db: AsyncSession, certificate_type: str, status: str = "VALID") -> List[CertificateSearchResult]:
+    """根据证书类型搜索人才"""
+    result = await db.execute(
+        _search_result_columns()
+        .where(and_(Certificate.certificate_type == certificate_type, Certificate.status == status))
+    )
+    return _to_search_results(result.all())
+
+async def search_talents_by_category(db: AsyncSession, category: str, status: str = "VALID") -> List[CertificateSearchResult]:
+    """根据证书大类搜索人才"""
+    result = await db.execute(
+        _search_result_columns()
+        .join(CertificateType, Certificate.certificate_type == CertificateType.type_name)
+        .where(and_(CertificateType.category == category, Certificate.status == status))
+    )
+    return _to_search_results(result.all())
+
+async def get_talent_certificate_summary(db: AsyncSession, talent_id: int) -> Optional[TalentCertificateSummary]:
+    """获取人才证书汇总信息"""
+    talent = await db.get(Talent, talent_id)
+    if not talent:
+        return None
+
+    result = await db.execute(
+        select(Certificate.certificate_type)
+        .where(and_(Certificate.talent_id == talent_id, Certificate.status == "VALID"))
+        .distinct()
+    )
+    certificate_types = [cert.certificate_type for cert in result.all()]
+
+    return TalentCertificateSummary(
+        talent_id=talent_id,
+        talent_name=talent.name,
+        certificates=certificate_types,
+        certificate_count=len(certificate_types)
+    )
+
+async def get_expiring_certificates(db: AsyncSession, days: int = 30) -> List[Certificate]:
+    """获取即将到期的证书"""
+    from datetime import date, timedelta
+    expiry_threshold = date.today() + timedelta(days=days)
+
+    result = await db.execute(
+        select(Certificate)
+        .where(and_(
+            Certificate.expiry_date <= expiry_threshold,
+            Certificate.expiry_date >= date.today(),
+            Certificate.status == "VALID"
+        ))
+        .order_by(Certificate.expiry_date)
+    )
+    return result.scalars().all()
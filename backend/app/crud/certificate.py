@@ -1,7 +1,8 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, select, func, insert, delete, cast, String, text
 from typing import List, Optional
-from ..models.certificate import Certificate, CertificateType
+from datetime import date, timedelta
+from ..models.certificate import Certificate, CertificateType, CertificateStatus, CertificateStatsRollup
 from ..models.talent import Talent
 from ..schemas.certificate import (
     CertificateCreate, CertificateUpdate, CertificateQuery,
@@ -53,21 +54,16 @@ def get_certificates_by_talent(db: Session, talent_id: int) -> List[Certificate]
     """获取某个人才的所有证书"""
     return db.query(Certificate).filter(Certificate.talent_id == talent_id).all()
 
-def get_certificates(db: Session, query: CertificateQuery, talent_name: str = None, skip: int = 0, limit: int = 100) -> List[Certificate]:
-    """根据查询条件获取证书列表"""
-    from ..models.talent import Talent
-
-    db_query = db.query(Certificate)
-
-    # 记录已经JOIN的表，避免重复JOIN
-    joined_talent = False
-    joined_cert_type = False
+def apply_certificate_filters(db_query, query: CertificateQuery, talent_name: str = None, talent_joined: bool = False):
+    """按查询条件过滤证书，同步 Query 与 select() 语句通用
 
+    talent_joined 表示调用方已关联人才表，按人才名称搜索时不再重复 JOIN
+    """
     # 如果需要按人才名称搜索，需要关联人才表
     if talent_name:
-        db_query = db_query.join(Talent, Certificate.talent_id == Talent.id)
+        if not talent_joined:
+            db_query = db_query.join(Talent, Certificate.talent_id == Talent.id)
         db_query = db_query.filter(Talent.name.like(f"%{talent_name}%"))
-        joined_talent = True
 
     if query.talent_id:
         db_query = db_query.filter(Certificate.talent_id == query.talent_id)
@@ -82,12 +78,121 @@ def get_certificates(db: Session, query: CertificateQuery, talent_name: str = No
 
     # 如果指定了证书大类，需要关联证书类型表
     if query.category:
-        if not joined_cert_type:
-            db_query = db_query.join(CertificateType, Certificate.certificate_type == CertificateType.type_name)
-            joined_cert_type = True
+        db_query = db_query.join(CertificateType, Certificate.certificate_type == CertificateType.type_name)
         db_query = db_query.filter(CertificateType.category == query.category)
 
-    return db_query.offset(skip).limit(limit).all()
+    return db_query
+
+def paginate_certificates(db_query, skip: int, limit: int, after_id: str = None):
+    """按证书ID排序分页：传入 after_id 时走游标分页，否则走偏移分页"""
+    db_query = db_query.order_by(Certificate.certificate_id)
+    if after_id is not None:
+        return db_query.filter(Certificate.certificate_id > after_id).limit(limit)
+    return db_query.offset(skip).limit(limit)
+
+def get_certificates(db: Session, query: CertificateQuery, talent_name: str = None, skip: int = 0, limit: int = 100, after_id: str = None) -> List[Certificate]:
+    """根据查询条件获取证书列表，after_id 为游标分页的上一页最后一个证书ID"""
+    db_query = apply_certificate_filters(db.query(Certificate), query, talent_name)
+    return paginate_certificates(db_query, skip, limit, after_id).all()
+
+def get_certificates_with_talent(db: Session, query: CertificateQuery, talent_name: str = None, skip: int = 0, limit: int = 100, after_id: str = None):
+    """获取证书列表并在同一条查询中带出人才姓名和电话
+
+    返回 (Certificate, talent_name, talent_phone) 行；未关联人才或人才不存在时后两列为 None
+    """
+    db_query = db.query(
+        Certificate,
+        Talent.name.label('talent_name'),
+        Talent.phone.label('talent_phone')
+    ).outerjoin(Talent, Certificate.talent_id == Talent.id)
+    db_query = apply_certificate_filters(db_query, query, talent_name, talent_joined=True)
+    return paginate_certificates(db_query, skip, limit, after_id).all()
+
+def certificate_stats_statement(query: CertificateQuery, talent_name: str = None, expiring_days: int = 30):
+    """证书统计的聚合查询：一次扫描得到总数、有效、过期和即将到期数量"""
+    today = date.today()
+    expiring_soon = and_(
+        Certificate.status == CertificateStatus.VALID,
+        Certificate.expiry_date >= today,
+        Certificate.expiry_date <= today + timedelta(days=expiring_days)
+    )
+    stmt = select(
+        func.count().label('total'),
+        func.count().filter(Certificate.status == CertificateStatus.VALID).label('valid'),
+        func.count().filter(Certificate.status == CertificateStatus.EXPIRED).label('expired'),
+        func.count().filter(expiring_soon).label('expiring')
+    ).select_from(Certificate)
+    return apply_certificate_filters(stmt, query, talent_name)
+
+# 汇总表 status 列不允许为空，状态为空的证书计入该分桶（与迁移脚本中触发器的 COALESCE 一致）
+ROLLUP_NULL_STATUS = ""
+
+def rollup_supports(query: CertificateQuery, talent_name: str = None) -> bool:
+    """汇总表只包含状态、证书类型、到期日维度，其余筛选条件需要查询证书表"""
+    return not (talent_name or query.talent_id or query.specialty or query.level)
+
+def rollup_stats_statement(query: CertificateQuery, expiring_days: int = 30):
+    """从汇总表计算证书统计，只读取汇总表（及证书类型字典表）
+
+    状态为空的证书（ROLLUP_NULL_STATUS 分桶）计入总数，不计入有效、过期、即将到期，与聚合证书表的结果一致
+    """
+    today = date.today()
+    rollup = CertificateStatsRollup
+    valid = CertificateStatus.VALID.value
+    stmt = select(
+        func.coalesce(func.sum(rollup.cert_count), 0).label('total'),
+        func.coalesce(func.sum(rollup.cert_count).filter(rollup.status == valid), 0).label('valid'),
+        func.coalesce(func.sum(rollup.cert_count).filter(rollup.status == CertificateStatus.EXPIRED.value), 0).label('expired'),
+        func.coalesce(func.sum(rollup.cert_count).filter(and_(
+            rollup.status == valid,
+            rollup.expiry_date >= today,
+            rollup.expiry_date <= today + timedelta(days=expiring_days)
+        )), 0).label('expiring')
+    ).select_from(rollup)
+
+    if query.status:
+        stmt = stmt.filter(rollup.status == query.status.value)
+    if query.certificate_type:
+        stmt = stmt.filter(rollup.certificate_type == query.certificate_type)
+    if query.category:
+        stmt = stmt.join(CertificateType, rollup.certificate_type == CertificateType.type_name)
+        stmt = stmt.filter(CertificateType.category == query.category)
+    return stmt
+
+def get_certificate_stats(db: Session, query: CertificateQuery, talent_name: str = None, expiring_days: int = 30, use_rollup: bool = False) -> dict:
+    """获取证书统计信息（数据库端聚合）
+
+    use_rollup 为 True 且筛选条件都在汇总表维度内时读取汇总表，否则聚合证书表
+    """
+    if use_rollup and rollup_supports(query, talent_name):
+        stmt = rollup_stats_statement(query, expiring_days)
+    else:
+        stmt = certificate_stats_statement(query, talent_name, expiring_days)
+    row = db.execute(stmt).one()
+    return {
+        "total": row.total,
+        "valid": row.valid,
+        "expired": row.expired,
+        "expiring": row.expiring
+    }
+
+def rebuild_certificate_stats_rollup(db: Session) -> int:
+    """从证书表全量重建统计汇总表，用于定期校正；返回汇总行数
+
+    状态为空的证书与触发器一致，计入 ROLLUP_NULL_STATUS 分桶
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        # 重建期间阻止证书写入，避免与触发器的增量更新交错
+        db.execute(text("LOCK TABLE certificates IN SHARE MODE"))
+    db.execute(delete(CertificateStatsRollup))
+    status_text = func.coalesce(cast(Certificate.status, String), ROLLUP_NULL_STATUS)
+    db.execute(insert(CertificateStatsRollup).from_select(
+        ['status', 'certificate_type', 'expiry_date', 'cert_count'],
+        select(status_text, Certificate.certificate_type, Certificate.expiry_date, func.count())
+        .group_by(status_text, Certificate.certificate_type, Certificate.expiry_date)
+    ))
+    db.commit()
+    return db.query(func.count(CertificateStatsRollup.id)).scalar()
 
 def create_certificate(db: Session, certificate: CertificateCreate) -> Certificate:
     """创建证书"""
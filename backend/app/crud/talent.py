@@ -0,0 +1,417 @@
+from sqlalchemy import or_, and_, select, update, delete, insert, values, column, func, cast, Integer, String, Numeric
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+import re
+from typing import Dict, List, Optional, Tuple
+from pydantic import ValidationError
+from ..core.classifier import CLASSIFIER_VERSION, MAX_CONTRACT_PRICE, classify_certificate
+from ..core.config import settings
+from ..core.search_index import talent_search_index
+from ..models.talent import Talent, TalentFacet
+from ..models.communication import Communication
+from ..models.certificate import Certificate
+from ..schemas.talent import TalentCreate
+
+SEARCH_FIELDS = ("name", "phone", "wechat_note", "communication_content")
+
+# 新增人才时空字符串按未填写处理的字段
+BLANK_AS_NULL_FIELDS = ('certificate_level', 'certificate_specialty', 'social_security_status',
+                        'gender', 'phone', 'wechat_note', 'certificate_info', 'communication_content')
+
+def talent_search_text(talent) -> str:
+    """n-gram 索引使用的人才文本（与 search_text 列的拼接方式一致），talent 可以是人才对象或字段字典"""
+    get = talent.get if isinstance(talent, dict) else lambda field: getattr(talent, field)
+    return "\n".join(get(field) or "" for field in SEARCH_FIELDS).lower()
+
+_NON_DIGITS = re.compile(r'[^0-9]')
+
+def normalize_phone(phone: Optional[str]) -> Optional[str]:
+    """与 phone_normalized 列一致：去掉非数字字符，结果为空时返回 None"""
+    return _NON_DIGITS.sub('', phone) or None if phone else None
+
+def phone_owner_query(phone: Optional[str], exclude_id: Optional[int] = None):
+    """查询已使用该电话（按 phone_normalized）的人才 id，电话为空时返回 None"""
+    phone_key = normalize_phone(phone)
+    if not phone_key:
+        return None
+    stmt = select(Talent.id).where(Talent.phone_normalized == phone_key)
+    if exclude_id is not None:
+        stmt = stmt.where(Talent.id != exclude_id)
+    return stmt.limit(1)
+
+def prepare_talent_data(talent: TalentCreate) -> dict:
+    """新增人才的字段：空字符串转换为 None，未填写意向等级时默认为 C"""
+    talent_data = talent.model_dump()
+
+    # 处理空字符串，将其转换为None
+    for field in BLANK_AS_NULL_FIELDS:
+        if talent_data.get(field) == '':
+            talent_data[field] = None
+
+    # 设置默认意向等级
+    if not talent_data.get('intention_level'):
+        talent_data['intention_level'] = 'C'
+
+    return talent_data
+
+def _like_condition(search: str):
+    return or_(*(getattr(Talent, field).contains(search, autoescape=True) for field in SEARCH_FIELDS))
+
+def talent_search_condition(search: str, backend: Optional[str] = None):
+    """人才关键字搜索条件（姓名、电话、微信备注、沟通内容，子串匹配）
+
+    trgm：匹配 search_text 列，配合 pg_trgm GIN 索引，不区分大小写；
+    关键字少于 3 个字符时 pg_trgm 无法提取三元组，仍会退化为扫描
+    ngram：由进程内倒排索引给出候选 id，再逐列 LIKE 校验；索引未就绪或候选过多时退回 like
+    like：逐列 LIKE '%关键字%'
+    """
+    backend = backend or settings.talent_search_backend
+    if backend == "trgm":
+        return Talent.search_text.contains(search.lower(), autoescape=True)
+
+    if backend == "ngram":
+        ids = talent_search_index.candidates(search, settings.search_index_max_candidates)
+        if ids is not None:
+            return and_(Talent.id.in_(ids), _like_condition(search))
+
+    return _like_condition(search)
+
+def apply_talent_facet_filters(db_query, certificate_level: Optional[str] = None,
+                               certificate_specialty: Optional[str] = None,
+                               social_security_status: Optional[str] = None):
+    """按分类结果筛选人才（同时适用于 Query 和 select），专业支持逗号分隔多选"""
+    if not (certificate_level or certificate_specialty or social_security_status):
+        return db_query
+
+    db_query = db_query.join(TalentFacet, TalentFacet.talent_id == Talent.id)
+
+    # 证书等级筛选
+    if certificate_level:
+        db_query = db_query.where(TalentFacet.level == certificate_level)
+
+    # 证书专业筛选（支持多选）
+    if certificate_specialty:
+        specialties = [s.strip() for s in certificate_specialty.split(',') if s.strip()]
+        db_query = db_query.where(TalentFacet.specialty.in_(specialties))
+
+    # 社保情况筛选
+    if social_security_status:
+        db_query = db_query.where(TalentFacet.social_security_status == social_security_status)
+
+    return db_query
+
+def facet_price(price):
+    """超出 NUMERIC(10, 2) 范围的价格按未识别处理，不写入分类结果"""
+    if price is None or abs(price) > MAX_CONTRACT_PRICE:
+        return None
+    return price
+
+def talent_facet_values(talent_id: int, communication_content: Optional[str], wechat_note: Optional[str],
+                        social_security_status: Optional[str] = None, contract_price=None) -> dict:
+    """分类结果表的一行，已填写的社保情况、合同价格优先于分类器"""
+    result = classify_certificate(communication_content, wechat_note)
+    return {
+        "talent_id": talent_id,
+        "level": result.certificate_level,
+        "specialty": result.certificate_specialty,
+        "social_security_status": social_security_status or result.social_security_status,
+        "price": facet_price(contract_price if contract_price is not None else result.contract_price),
+        "classifier_version": CLASSIFIER_VERSION
+    }
+
+def build_talent_facet(talent) -> TalentFacet:
+    """根据人才当前的字段生成分类结果"""
+    return TalentFacet(**talent_facet_values(
+        talent.id, talent.communication_content, talent.wechat_note,
+        talent.social_security_status, talent.contract_price
+    ))
+
+def validate_talent_rows(rows: List[dict]) -> Tuple[List[Tuple[int, dict]], List[dict]]:
+    """按 TalentCreate 逐行校验批量新增的数据，返回 ([(下标, 人才字段)], [逐行错误])"""
+    valid = []
+    errors = []
+    for index, row in enumerate(rows):
+        try:
+            valid.append((index, prepare_talent_data(TalentCreate.model_validate(row))))
+        except ValidationError as e:
+            errors.append({
+                "index": index,
+                "errors": [f"{'.'.join(str(loc) for loc in error['loc'])}: {error['msg']}" for error in e.errors()]
+            })
+    return valid, errors
+
+def bulk_insert_talents(db: Session, talents: List[dict]) -> List[Optional[int]]:
+    """多行 INSERT ... RETURNING 写入人才及其分类结果，返回与 talents 顺序一致的 id，不提交事务
+
+    有电话的行使用 ON CONFLICT (phone_normalized) DO NOTHING：电话已被其他人才占用
+    （包括预检查之后由并发请求写入的）时不写入，对应的 id 为 None，不会让整批因唯一索引冲突失败
+    """
+    ids = [None] * len(talents)
+    without_phone = [index for index, talent in enumerate(talents) if not normalize_phone(talent.get("phone"))]
+    with_phone = [index for index, talent in enumerate(talents) if normalize_phone(talent.get("phone"))]
+
+    if without_phone:
+        # executemany + RETURNING 由 SQLAlchemy 合并为多行 INSERT，sort_by_parameter_order 保证 id 与参数顺序一致
+        inserted = db.scalars(
+            insert(Talent).returning(Talent.id, sort_by_parameter_order=True),
+            [talents[index] for index in without_phone]
+        ).all()
+        for index, talent_id in zip(without_phone, inserted):
+            ids[index] = talent_id
+
+    if with_phone:
+        # 冲突的行没有返回值，按电话对应回参数（同一批中的电话已去重）
+        stmt = pg_insert(Talent).on_conflict_do_nothing(
+            index_elements=[Talent.phone_normalized],
+            index_where=Talent.phone_normalized.isnot(None)
+        ).returning(Talent.phone_normalized, Talent.id)
+        written = {row.phone_normalized: row.id for row in db.execute(stmt, [talents[index] for index in with_phone])}
+        for index in with_phone:
+            ids[index] = written.get(normalize_phone(talents[index]["phone"]))
+
+    facets = [
+        talent_facet_values(
+            talent_id, talent.get("communication_content"), talent.get("wechat_note"),
+            talent.get("social_security_status"), talent.get("contract_price")
+        )
+        for talent_id, talent in zip(ids, talents) if talent_id is not None
+    ]
+    if facets:
+        db.execute(insert(TalentFacet), facets)
+    return ids
+
+def _row_error(index: int, message: str) -> dict:
+    return {"index": index, "errors": [message]}
+
+def _talents_by_phone(db: Session, phone_keys) -> Dict[str, tuple]:
+    """按 phone_normalized 取出已有人才（id 及搜索字段）"""
+    phone_keys = list(phone_keys)
+    if not phone_keys:
+        return {}
+    rows = db.execute(
+        select(Talent.phone_normalized, Talent.id, *(getattr(Talent, field) for field in SEARCH_FIELDS))
+        .where(Talent.phone_normalized.in_(phone_keys))
+    )
+    return {row.phone_normalized: row for row in rows}
+
+def _upsert_talents_by_phone(db: Session, talents: List[dict]) -> Dict[str, int]:
+    """INSERT ... ON CONFLICT (phone_normalized) DO UPDATE，返回实际写入（新增或有变化）的 {电话: id}
+
+    talents 每行只包含请求中提供且非空的字段：新增时其余字段取默认值，更新时只写这些字段，
+    未提供的字段和空值都不覆盖已有值；所有字段都与已有值相同的行不写（WHERE IS DISTINCT FROM）。
+    字段不同的行分组，每组一条语句
+    """
+    groups = {}
+    for talent in talents:
+        groups.setdefault(tuple(talent), []).append(talent)
+
+    written = {}
+    for fields, group in groups.items():
+        stmt = pg_insert(Talent)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Talent.phone_normalized],
+            index_where=Talent.phone_normalized.isnot(None),
+            set_={**{field: stmt.excluded[field] for field in fields}, "updated_at": func.now()},
+            where=or_(*(Talent.__table__.c[field].is_distinct_from(stmt.excluded[field]) for field in fields))
+        ).returning(Talent.phone_normalized, Talent.id)
+        written.update((row.phone_normalized, row.id) for row in db.execute(stmt, group))
+    return written
+
+def _refresh_talent_facets(db: Session, talent_ids: List[int]) -> Dict[int, str]:
+    """按人才表中的当前值重建这些人才的分类结果，返回 {id: 搜索文本}"""
+    rows = db.execute(
+        select(Talent.id, Talent.social_security_status, Talent.contract_price,
+               *(getattr(Talent, field) for field in SEARCH_FIELDS))
+        .where(Talent.id.in_(talent_ids))
+    ).all()
+
+    stmt = pg_insert(TalentFacet)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[TalentFacet.talent_id],
+        set_={column.name: stmt.excluded[column.name]
+              for column in TalentFacet.__table__.c if column.name != "talent_id"}
+    )
+    db.execute(stmt, [
+        talent_facet_values(row.id, row.communication_content, row.wechat_note,
+                            row.social_security_status, row.contract_price)
+        for row in rows
+    ])
+    return {row.id: talent_search_text(row) for row in rows}
+
+def bulk_import_talents(db: Session, rows: List[dict], upsert: bool = False) -> Tuple[dict, List[Tuple[int, str, str]]]:
+    """批量导入人才，不提交事务；返回 (TalentBulkResult 内容, 搜索索引变更 [(id, 旧文本, 新文本)])
+
+    逐行校验；同一批中电话重复时以最后一行为准。insert：电话已存在的行报错（先按电话预查询，
+    写入时 ON CONFLICT DO NOTHING 兜底并发写入的相同电话）；
+    upsert：电话已存在的行按电话更新（只写请求中提供的非空字段，且只写有变化的行），没有电话的行直接新增
+    """
+    valid, errors = validate_talent_rows(rows)
+    ids = [None] * len(rows)
+
+    last_index_by_phone = {}
+    for index, talent in valid:
+        phone_key = normalize_phone(talent.get("phone"))
+        if phone_key:
+            last_index_by_phone[phone_key] = index
+    existing = _talents_by_phone(db, last_index_by_phone)
+
+    inserts = []
+    upserts = []
+    for index, talent in valid:
+        phone_key = normalize_phone(talent.get("phone"))
+        if phone_key and last_index_by_phone[phone_key] != index:
+            errors.append(_row_error(index, f"phone: 与 talents[{last_index_by_phone[phone_key]}] 电话重复，以后者为准"))
+        elif phone_key and upsert:
+            # 只保留请求中提供且非空的字段，未提供的字段（如默认意向等级 C）不覆盖已有值
+            supplied = {field: value for field, value in talent.items() if field in rows[index] and value is not None}
+            upserts.append((index, phone_key, supplied))
+        elif phone_key in existing:
+            errors.append(_row_error(index, f"phone: 电话号码已存在（人才 {existing[phone_key].id}）"))
+        else:
+            inserts.append((index, talent))
+
+    index_changes = []
+    created = 0
+    inserted_ids = bulk_insert_talents(db, [talent for _, talent in inserts])
+    for (index, talent), talent_id in zip(inserts, inserted_ids):
+        if talent_id is None:
+            # 预检查之后电话才被并发请求占用
+            errors.append(_row_error(index, "phone: 电话号码已存在"))
+            continue
+        ids[index] = talent_id
+        created += 1
+        index_changes.append((talent_id, "", talent_search_text(talent)))
+
+    updated = 0
+    unchanged = 0
+    if upserts:
+        written = _upsert_talents_by_phone(db, [talent for _, _, talent in upserts])
+        new_texts = _refresh_talent_facets(db, list(written.values())) if written else {}
+        for index, phone_key, _ in upserts:
+            old = existing.get(phone_key)
+            if phone_key in written:
+                talent_id = written[phone_key]
+                index_changes.append((talent_id, talent_search_text(old) if old else "", new_texts[talent_id]))
+                if old:
+                    updated += 1
+                else:
+                    created += 1
+            else:
+                talent_id = old.id
+                unchanged += 1
+            ids[index] = talent_id
+
+    errors.sort(key=lambda error: error["index"])
+    result = {"created": created, "updated": updated, "unchanged": unchanged, "ids": ids, "errors": errors}
+    return result, index_changes
+
+def talent_ids_query(ids: Optional[List[int]] = None, search: Optional[str] = None,
+                     certificate_level: Optional[str] = None, certificate_specialty: Optional[str] = None,
+                     social_security_status: Optional[str] = None):
+    """按 id 列表和/或人才列表的筛选条件选出人才 id（select 子查询）"""
+    stmt = select(Talent.id)
+    if ids:
+        stmt = stmt.where(Talent.id.in_(ids))
+    if search:
+        stmt = stmt.where(talent_search_condition(search))
+    return apply_talent_facet_filters(stmt, certificate_level, certificate_specialty, social_security_status)
+
+def bulk_delete_talents(db: Session, target) -> Tuple[int, List[Tuple[int, str]]]:
+    """一条 DELETE 删除 target（talent_ids_query）选出的人才，不提交事务
+
+    与逐个删除一致，先将这些人才的沟通记录、证书的 talent_id 置空；分类结果随外键级联删除。
+    返回 (删除数, 搜索索引变更 [(id, 旧文本)])，只有 ngram 搜索后端需要旧文本
+    """
+    db.execute(update(Communication).where(Communication.talent_id.in_(target)).values(talent_id=None))
+    db.execute(update(Certificate).where(Certificate.talent_id.in_(target)).values(talent_id=None))
+
+    stmt = delete(Talent).where(Talent.id.in_(target)).execution_options(synchronize_session=False)
+    if settings.talent_search_backend != "ngram":
+        return db.execute(stmt).rowcount, []
+
+    rows = db.execute(stmt.returning(Talent.id, *(getattr(Talent, field) for field in SEARCH_FIELDS))).all()
+    return len(rows), [(row.id, talent_search_text(row)) for row in rows]
+
+def index_talent_change(talent_id: int, old_text: str = "", new_text: str = ""):
+    """人才新增、修改、删除后同步 n-gram 索引（仅 ngram 搜索后端）"""
+    if settings.talent_search_backend == "ngram":
+        talent_search_index.update(talent_id, old_text, new_text)
+
+def rebuild_talent_search_index(db: Session) -> int:
+    """从人才表重建 n-gram 索引，返回索引的人才数"""
+    rows = db.query(Talent.id, *(getattr(Talent, field) for field in SEARCH_FIELDS))\
+             .order_by(Talent.id)\
+             .yield_per(2000)
+    return talent_search_index.rebuild((row.id, talent_search_text(row)) for row in rows)
+
+def reclassify_talents_chunk(db: Session, after_id: int, chunk_size: int,
+                             update_talents: bool = True) -> Tuple[Optional[int], int, int]:
+    """重新分类主键大于 after_id 的下一批人才，重建这批的 talent_facets，并用分类结果补齐为空的社保情况和合同价格
+
+    每批一个短事务：按主键读取一批（服务端游标），分类后先整批替换分类结果，
+    再用 UPDATE ... FROM (VALUES ...) 一次写回人才表（update_talents=False 时只重建分类结果）。
+    已填写的值优先于分类器（与新增、修改人才时的分类结果一致），只写原来为空的字段。
+    返回 (本批最大 id, 读取行数, 更新行数)，没有更多数据时 id 为 None
+    """
+    rows = db.execute(
+        select(Talent.id, Talent.wechat_note, Talent.communication_content,
+               Talent.social_security_status, Talent.contract_price)
+        .where(Talent.id > after_id)
+        .order_by(Talent.id)
+        .limit(chunk_size)
+        .execution_options(stream_results=True, yield_per=chunk_size)
+    )
+
+    last_id = None
+    processed = 0
+    changes = []
+    facets = []
+    for talent_id, wechat_note, communication_content, status, price in rows:
+        last_id = talent_id
+        processed += 1
+        result = classify_certificate(communication_content, wechat_note)
+        classified_price = facet_price(result.contract_price)
+        if update_talents and ((status is None and result.social_security_status is not None)
+                               or (price is None and classified_price is not None)):
+            changes.append((talent_id, result.social_security_status, classified_price))
+        status = status or result.social_security_status
+        price = price if price is not None else classified_price
+        facets.append({
+            "talent_id": talent_id,
+            "level": result.certificate_level,
+            "specialty": result.certificate_specialty,
+            "social_security_status": status,
+            "price": price,
+            "classifier_version": CLASSIFIER_VERSION
+        })
+    rows.close()
+
+    if facets:
+        db.execute(delete(TalentFacet).where(TalentFacet.talent_id > after_id, TalentFacet.talent_id <= last_id))
+        db.execute(insert(TalentFacet), facets)
+
+    updated = 0
+    if changes:
+        batch = values(
+            column("id", Integer),
+            column("social_security_status", String),
+            column("contract_price", Numeric),
+            name="classified"
+        ).data(changes)
+        # 已有值优先，分类结果只补空值；读取之后被人工填写的值也不会被覆盖
+        new_status = func.coalesce(Talent.social_security_status, batch.c.social_security_status)
+        new_price = func.coalesce(Talent.contract_price, cast(batch.c.contract_price, Numeric(10, 2)))
+        stmt = (
+            update(Talent)
+            .where(Talent.id == batch.c.id)
+            .where(or_(
+                Talent.social_security_status.is_distinct_from(new_status),
+                Talent.contract_price.is_distinct_from(new_price)
+            ))
+            .values(social_security_status=new_status, contract_price=new_price)
+            .execution_options(synchronize_session=False)
+        )
+        updated = db.execute(stmt).rowcount
+
+    db.commit()
+    return last_id, processed, updated
@@ -1,11 +1,37 @@
-from sqlalchemy import create_engine
+import threading
+import time
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .core.config import settings
+from .core.pool_metrics import TimedQueuePool, TimedAsyncQueuePool
 
-engine = create_engine(settings.database_url)
+def _pool_options(url: str, poolclass) -> dict:
+    """连接池参数；SQLite 等不使用 QueuePool 的方言保持默认"""
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+engine = create_engine(settings.database_url, **_pool_options(settings.database_url, TimedQueuePool))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 只读副本（可选）
+replica_engine = None
+ReplicaSessionLocal = None
+if settings.replica_database_url:
+    replica_engine = create_engine(settings.replica_database_url, **_pool_options(settings.replica_database_url, TimedQueuePool))
+    ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+
 Base = declarative_base()
 
 def get_db():
@@ -14,3 +40,151 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# 副本延迟（秒）：WAL 已全部回放时视为 0；在主库上执行时两个函数返回 NULL，同样得到 0
+REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+class ReplicaHealth:
+    """只读副本健康状态，检测结果按 replica_check_interval 缓存"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.available = False
+        self.lag_seconds = None
+        self.error = None
+        self.checked_at = float("-inf")
+
+    def claim_check(self) -> bool:
+        """到达检查间隔时返回 True，同一时刻只让一个请求去检查"""
+        if time.monotonic() - self.checked_at < settings.replica_check_interval:
+            return False
+        with self._lock:
+            if time.monotonic() - self.checked_at < settings.replica_check_interval:
+                return False
+            self.checked_at = time.monotonic()
+            return True
+
+    def record(self, lag_seconds=None, error=None):
+        if error is not None:
+            self.available = False
+            self.lag_seconds = None
+            self.error = str(error)
+        else:
+            self.lag_seconds = float(lag_seconds or 0)
+            self.available = self.lag_seconds <= settings.replica_max_lag_seconds
+            self.error = None if self.available else "replica lag exceeds replica_max_lag_seconds"
+
+    def mark_down(self, error):
+        """查询过程中副本连接失败，立即标记不可用，下个检查周期再恢复"""
+        self.record(error=error)
+        self.checked_at = time.monotonic()
+
+    def snapshot(self) -> dict:
+        return {"available": self.available, "lag_seconds": self.lag_seconds, "error": self.error}
+
+replica_health = ReplicaHealth()
+
+def _replica_usable() -> bool:
+    if replica_health.claim_check():
+        try:
+            with replica_engine.connect() as connection:
+                replica_health.record(lag_seconds=connection.execute(REPLICA_LAG_SQL).scalar())
+        except Exception as e:
+            replica_health.record(error=e)
+    return replica_health.available
+
+def _connect_replica(db):
+    """先取得副本连接（连接池取出时会 pre-ping），连接失败时标记副本不可用并返回 False"""
+    try:
+        db.connection()
+        return True
+    except OperationalError as e:
+        replica_health.mark_down(e)
+        db.close()
+        return False
+
+def get_read_db():
+    """只读接口使用的会话：优先副本，副本不可用、延迟过大或连接失败时回退主库"""
+    if ReplicaSessionLocal is None or not _replica_usable():
+        yield from get_db()
+        return
+
+    db = ReplicaSessionLocal()
+    if not _connect_replica(db):
+        # 健康检查之后副本才宕机：本次请求改用主库，不返回 500
+        yield from get_db()
+        return
+    try:
+        yield db
+    except OperationalError as e:
+        replica_health.mark_down(e)
+        raise
+    finally:
+        db.close()
+
+def _async_url(url: str) -> str:
+    """将同步连接串转换为 asyncpg 驱动的连接串"""
+    return make_url(url).set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+# 异步引擎仅在开启异步模式时创建，避免未安装 asyncpg 时导入失败
+async_engine = None
+AsyncSessionLocal = None
+async_replica_engine = None
+AsyncReplicaSessionLocal = None
+if settings.async_db:
+    _async_database_url = settings.async_database_url or _async_url(settings.database_url)
+    async_engine = create_async_engine(_async_database_url, **_pool_options(_async_database_url, TimedAsyncQueuePool))
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    if settings.replica_database_url:
+        _async_replica_url = _async_url(settings.replica_database_url)
+        async_replica_engine = create_async_engine(_async_replica_url, **_pool_options(_async_replica_url, TimedAsyncQueuePool))
+        AsyncReplicaSessionLocal = async_sessionmaker(async_replica_engine, autoflush=False, expire_on_commit=False)
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def _async_replica_usable() -> bool:
+    if replica_health.claim_check():
+        try:
+            async with async_replica_engine.connect() as connection:
+                replica_health.record(lag_seconds=(await connection.execute(REPLICA_LAG_SQL)).scalar())
+        except Exception as e:
+            replica_health.record(error=e)
+    return replica_health.available
+
+async def _async_connect_replica(db) -> bool:
+    # asyncpg 连接被拒绝、超时时直接抛出 OSError，不包装为 OperationalError
+    try:
+        await db.connection()
+        return True
+    except (OperationalError, OSError) as e:
+        replica_health.mark_down(e)
+        return False
+
+async def get_async_read_db():
+    """异步只读会话：优先副本，副本不可用、延迟过大或连接失败时回退主库"""
+    if AsyncReplicaSessionLocal is None or not await _async_replica_usable():
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+
+    async with AsyncReplicaSessionLocal() as db:
+        connected = await _async_connect_replica(db)
+        if connected:
+            try:
+                yield db
+            except OperationalError as e:
+                replica_health.mark_down(e)
+                raise
+
+    if not connected:
+        # 健康检查之后副本才宕机：本次请求改用主库，不返回 500
+        async with AsyncSessionLocal() as db:
+            yield db
@@ -1,8 +1,16 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .database import engine, Base
-from .api import companies, talents, communications
-from .api.v1 import certificates
+from .core.config import settings
+from sqlalchemy import text
+from .database import SessionLocal, engine, async_engine, replica_engine, async_replica_engine, replica_health, Base
+from .core.pool_metrics import pool_status
+
+# 根据配置选择同步或异步路由实现
+if settings.async_db:
+    from .api.aio import companies, talents, communications, certificates
+else:
+    from .api import companies, talents, communications
+    from .api.v1 import certificates
 
 # 创建数据库表
 Base.metadata.create_all(bind=engine)
@@ -16,8 +24,30 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # 证书列表的游标分页
 )
 
+@app.on_event("startup")
+def build_talent_search_index():
+    """ngram 搜索后端：后台线程构建人才倒排索引，构建完成前搜索退回逐列 LIKE"""
+    if settings.talent_search_backend != "ngram":
+        return
+
+    import threading
+    from .crud.talent import rebuild_talent_search_index
+
+    def build():
+        db = SessionLocal()
+        try:
+            count = rebuild_talent_search_index(db)
+            print(f"人才搜索索引构建完成，共 {count} 条")
+        except Exception as e:
+            print(f"人才搜索索引构建失败: {e}")
+        finally:
+            db.close()
+
+    threading.Thread(target=build, name="talent-search-index", daemon=True).start()
+
 # 注册路由
 app.include_router(companies.router, prefix="/api/companies", tags=["companies"])
 app.include_router(talents.router, prefix="/api/talents", tags=["talents"])
@@ -31,3 +61,30 @@ def read_root():
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
+
+@app.get("/health/db")
+def db_health_check():
+    """数据库健康检查与连接池实时状态"""
+    import time
+
+    start = time.perf_counter()
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        status = "healthy"
+    except Exception as e:
+        status = f"unhealthy: {e}"
+    latency_ms = round((time.perf_counter() - start) * 1000, 3)
+
+    pools = {"primary": pool_status(engine.pool)}
+    if async_engine is not None:
+        pools["async"] = pool_status(async_engine.sync_engine.pool)
+    if replica_engine is not None:
+        pools["replica"] = pool_status(replica_engine.pool)
+    if async_replica_engine is not None:
+        pools["async_replica"] = pool_status(async_replica_engine.sync_engine.pool)
+
+    result = {"status": status, "latency_ms": latency_ms, "pools": pools}
+    if replica_engine is not None:
+        result["replica"] = replica_health.snapshot()
+    return result
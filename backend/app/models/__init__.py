@@ -1,5 +1,5 @@
 # Models package
-from .talent import Talent
+from .talent import Talent, TalentFacet
 from .company import Company
 from .communication import Communication
-from .certificate import Certificate, CertificateType
+from .certificate import Certificate, CertificateType, CertificateStatsRollup
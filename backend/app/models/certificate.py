@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Date, Enum, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, Date, Enum, Boolean, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..database import Base
@@ -50,3 +50,23 @@ class CertificateType(Base):
 
     def __repr__(self):
         return f"<CertificateType(type_code='{self.type_code}', type_name='{self.type_name}')>"
+
+class CertificateStatsRollup(Base):
+    """证书统计汇总表 - 按状态、证书类型、到期日聚合的证书数量
+
+    由 certificates 表上的触发器随增删改实时维护（见 migrations/add_certificate_stats_rollup.py），
+    到期日按天分桶，"N天内到期"等统计随日期推移依然精确；证书大类通过 certificate_types 关联得到，
+    修改证书类型的大类后无需重建汇总表
+    """
+    __tablename__ = "certificate_stats_rollup"
+
+    id = Column(Integer, primary_key=True)
+    status = Column(String(20), nullable=False)  # 证书状态，状态为空的证书记为空字符串（ROLLUP_NULL_STATUS）
+    certificate_type = Column(String(100), nullable=False, index=True)  # 证书类型
+    expiry_date = Column(Date)  # 到期日，为空表示无到期日
+    cert_count = Column(Integer, nullable=False, default=0)  # 证书数量
+
+    __table_args__ = (
+        Index('uq_certificate_stats_rollup_key', 'status', 'certificate_type', 'expiry_date',
+              unique=True, postgresql_nulls_not_distinct=True),
+    )
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, Numeric
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, Numeric, Computed, ForeignKey, Index
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from ..database import Base
 import enum
 
@@ -73,9 +73,50 @@ class Talent(Base):
     communication_content = Column(Text)  # 沟通内容
     social_security_status = Column(String(20))  # 社保情况 - 改为字符串类型
 
+    # 搜索列：姓名、电话、微信备注、沟通内容的小写拼接（各字段以换行分隔），由数据库生成；
+    # pg_trgm GIN 索引见 migrations/add_talent_search_index.py
+    search_text = deferred(Column(Text, Computed(
+        "lower(coalesce(name, '') || '\n' || coalesce(phone, '') || '\n' || "
+        "coalesce(wechat_note, '') || '\n' || coalesce(communication_content, ''))",
+        persisted=True
+    )))
+
+    # 去掉非数字字符后的电话号码，由数据库生成；非空时唯一（部分唯一索引），用于按电话去重和增量导入
+    phone_normalized = Column(String(20), Computed(
+        "NULLIF(regexp_replace(phone, '[^0-9]', '', 'g'), '')",
+        persisted=True
+    ))
+
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # 关联关系
     communications = relationship("Communication", back_populates="talent")
     certificates = relationship("Certificate", back_populates="talent")
+
+    __table_args__ = (
+        Index('uq_talents_phone_normalized', 'phone_normalized', unique=True,
+              postgresql_where=phone_normalized.isnot(None)),
+    )
+
+class TalentFacet(Base):
+    """人才分类结果 - 证书等级、专业、社保情况、价格
+
+    由分类器根据沟通内容和微信备注生成，人才上已填写的社保情况、合同价格优先；
+    人才列表的等级/专业/社保筛选走这张表的索引。随人才删除级联删除（ON DELETE CASCADE）
+    """
+    __tablename__ = "talent_facets"
+
+    talent_id = Column(Integer, ForeignKey("talents.id", ondelete="CASCADE"), primary_key=True)
+    level = Column(String(20))  # 证书等级
+    specialty = Column(String(50))  # 证书专业
+    social_security_status = Column(String(20))  # 社保情况
+    price = Column(Numeric(10, 2))  # 合同价格
+    classifier_version = Column(Integer, nullable=False)  # 生成时的分类规则版本
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        Index('ix_talent_facets_level_specialty', 'level', 'specialty', 'talent_id'),
+        Index('ix_talent_facets_specialty', 'specialty', 'talent_id'),
+        Index('ix_talent_facets_social_security', 'social_security_status', 'talent_id'),
+    )
@@ -35,3 +35,5 @@ class Communication(CommunicationBase):
 class CommunicationList(BaseModel):
     communications: List[Communication]
     total: int
+    next_cursor: Optional[str] = None  # 游标分页：下一页游标，末页为空
+    total_is_estimate: bool = False  # total 是否为估算值（count_mode=estimated）
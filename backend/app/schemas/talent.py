@@ -1,9 +1,23 @@
 from pydantic import BaseModel, field_validator
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from datetime import datetime, date
 from decimal import Decimal
+from enum import Enum
 from ..models.talent import IntentionLevel, CertificateLevel, CertificateSpecialty, SocialSecurityStatus
 
+# contract_price 列为 NUMERIC(10, 2)：最多 8 位整数、2 位小数
+CONTRACT_PRICE_LIMIT = Decimal("100000000")
+
+def check_contract_price(v: Optional[Decimal]) -> Optional[Decimal]:
+    """合同价格保留两位小数，超出列范围时报校验错误（批量导入中只让这一行失败，不会让整批写入出错）"""
+    if v is None:
+        return None
+    if abs(v) < CONTRACT_PRICE_LIMIT:
+        v = v.quantize(Decimal("0.01"))
+        if abs(v) < CONTRACT_PRICE_LIMIT:
+            return v
+    raise ValueError("合同价格超出范围（最大 99999999.99）")
+
 class TalentBase(BaseModel):
     name: str
     gender: Optional[str] = None
@@ -31,6 +45,11 @@ class TalentBase(BaseModel):
             return None
         return v
 
+    @field_validator('contract_price')
+    @classmethod
+    def check_contract_price_range(cls, v):
+        return check_contract_price(v)
+
     @field_validator('age', mode='before')
     @classmethod
     def validate_age(cls, v):
@@ -59,6 +78,11 @@ class TalentUpdate(BaseModel):
     communication_content: Optional[str] = None
     social_security_status: Optional[str] = None  # 改为字符串类型
 
+    @field_validator('contract_price')
+    @classmethod
+    def check_contract_price_range(cls, v):
+        return check_contract_price(v)
+
 class Talent(TalentBase):
     id: int
     created_at: datetime
@@ -67,6 +91,48 @@ class Talent(TalentBase):
     class Config:
         from_attributes = True
 
+class ClassifyRequest(BaseModel):
+    texts: List[str]  # 证书信息或沟通内容原文
+
+class ClassificationItem(BaseModel):
+    certificate_level: Optional[str] = None
+    certificate_specialty: Optional[str] = None
+    social_security_status: Optional[str] = None
+    contract_price: Optional[float] = None
+
+class ClassifyResponse(BaseModel):
+    classifier_version: int
+    results: List[ClassificationItem]  # 与请求中的 texts 一一对应
+
+class TalentBulkMode(str, Enum):
+    """批量导入方式"""
+    INSERT = "insert"  # 只新增，电话已存在的行报错
+    UPSERT = "upsert"  # 按电话新增或更新，只写有变化的行，未提供的字段和空值不覆盖已有值
+
+class TalentBulkCreate(BaseModel):
+    talents: List[Dict[str, Any]]  # 每项按 TalentCreate 逐行校验，校验失败的行不影响其他行
+
+class TalentBulkError(BaseModel):
+    index: int  # 在请求 talents 中的下标
+    errors: List[str]
+
+class TalentBulkResult(BaseModel):
+    created: int
+    updated: int = 0  # upsert：按电话匹配到并有变化的行
+    unchanged: int = 0  # upsert：按电话匹配到但没有变化的行
+    ids: List[Optional[int]]  # 与请求中的 talents 一一对应，失败的行为空
+    errors: List[TalentBulkError]
+
+class TalentBulkDelete(BaseModel):
+    """批量删除条件：id 列表和/或与人才列表相同的筛选条件（同时给出时取交集），不能全部为空"""
+    ids: Optional[List[int]] = None
+    search: Optional[str] = None
+    certificate_level: Optional[str] = None
+    certificate_specialty: Optional[str] = None
+    social_security_status: Optional[str] = None
+
 class TalentList(BaseModel):
     talents: List[Talent]
     total: int
+    next_cursor: Optional[str] = None  # 游标分页：下一页游标，末页为空
+    total_is_estimate: bool = False  # total 是否为估算值（count_mode=estimated）
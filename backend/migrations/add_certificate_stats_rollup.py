@@ -0,0 +1,114 @@
+"""
+数据库迁移脚本：添加证书统计汇总表及维护触发器
+证书增删改时由触发器增量更新 certificate_stats_rollup，TRUNCATE 证书表时同步清空；
+唯一索引使用 NULLS NOT DISTINCT，需要 PostgreSQL 15 及以上版本；状态为空的证书计入空字符串分桶
+（汇总表 status 列 NOT NULL）。脚本可重复执行，已安装的触发器函数会被替换
+迁移完成后设置环境变量 CERTIFICATE_STATS_ROLLUP=true，统计接口即改为读取汇总表
+"""
+
+from sqlalchemy import text
+from app.database import engine, SessionLocal
+from app.crud.certificate import rebuild_certificate_stats_rollup
+
+def create_rollup_table():
+    """创建证书统计汇总表"""
+
+    create_table_sql = """
+    CREATE TABLE IF NOT EXISTS certificate_stats_rollup (
+        id SERIAL PRIMARY KEY,
+        status VARCHAR(20) NOT NULL,
+        certificate_type VARCHAR(100) NOT NULL,
+        expiry_date DATE,
+        cert_count INT NOT NULL DEFAULT 0
+    );
+
+    CREATE UNIQUE INDEX IF NOT EXISTS uq_certificate_stats_rollup_key
+        ON certificate_stats_rollup (status, certificate_type, expiry_date) NULLS NOT DISTINCT;
+    CREATE INDEX IF NOT EXISTS ix_certificate_stats_rollup_certificate_type
+        ON certificate_stats_rollup (certificate_type);
+    """
+
+    with engine.connect() as connection:
+        connection.execute(text(create_table_sql))
+        connection.commit()
+        print("证书统计汇总表创建成功")
+
+def create_rollup_triggers():
+    """创建维护汇总表的触发器"""
+
+    create_functions_sql = """
+    CREATE OR REPLACE FUNCTION certificate_stats_rollup_apply(p_status TEXT, p_type TEXT, p_expiry DATE, p_delta INT)
+    RETURNS VOID AS $$
+    BEGIN
+        INSERT INTO certificate_stats_rollup (status, certificate_type, expiry_date, cert_count)
+        VALUES (p_status, p_type, p_expiry, p_delta)
+        ON CONFLICT (status, certificate_type, expiry_date)
+        DO UPDATE SET cert_count = certificate_stats_rollup.cert_count + EXCLUDED.cert_count;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    CREATE OR REPLACE FUNCTION certificate_stats_rollup_row() RETURNS TRIGGER AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            PERFORM certificate_stats_rollup_apply(COALESCE(OLD.status::TEXT, ''), OLD.certificate_type, OLD.expiry_date, -1);
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            PERFORM certificate_stats_rollup_apply(COALESCE(NEW.status::TEXT, ''), NEW.certificate_type, NEW.expiry_date, 1);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    CREATE OR REPLACE FUNCTION certificate_stats_rollup_truncate() RETURNS TRIGGER AS $$
+    BEGIN
+        TRUNCATE certificate_stats_rollup;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """
+
+    create_triggers_sql = """
+    DROP TRIGGER IF EXISTS certificates_stats_rollup_row ON certificates;
+    CREATE TRIGGER certificates_stats_rollup_row
+        AFTER INSERT OR DELETE OR UPDATE OF status, certificate_type, expiry_date ON certificates
+        FOR EACH ROW EXECUTE FUNCTION certificate_stats_rollup_row();
+
+    DROP TRIGGER IF EXISTS certificates_stats_rollup_truncate ON certificates;
+    CREATE TRIGGER certificates_stats_rollup_truncate
+        AFTER TRUNCATE ON certificates
+        FOR EACH STATEMENT EXECUTE FUNCTION certificate_stats_rollup_truncate();
+    """
+
+    with engine.connect() as connection:
+        connection.execute(text(create_functions_sql))
+        connection.execute(text(create_triggers_sql))
+        connection.commit()
+        print("汇总表触发器创建成功")
+
+def run_migration():
+    """执行完整的迁移流程"""
+    print("开始证书统计汇总表迁移...")
+
+    try:
+        # 1. 创建汇总表
+        create_rollup_table()
+
+        # 2. 安装触发器
+        create_rollup_triggers()
+
+        # 3. 用现有证书数据初始化汇总表
+        db = SessionLocal()
+        try:
+            rows = rebuild_certificate_stats_rollup(db)
+            print(f"汇总表初始化完成，共 {rows} 行")
+        finally:
+            db.close()
+
+        print("证书统计汇总表迁移完成！")
+
+    except Exception as e:
+        print(f"迁移过程中出现错误: {e}")
+        raise
+
+if __name__ == "__main__":
+    run_migration()
@@ -0,0 +1,81 @@
+"""
+数据库迁移脚本：人才分类结果表 talent_facets
+每个人才一行（证书等级、专业、社保情况、价格），人才列表的等级/专业/社保筛选
+通过联接这张表的组合索引完成，不再在请求里对沟通内容做分类或全表扫描。
+建表后按主键分批调用分类器回填已有人才，回填只写分类结果表，不改人才表。
+"""
+
+from sqlalchemy import text
+from app.database import engine, SessionLocal
+from app.core.config import settings
+from app.crud.talent import reclassify_talents_chunk
+
+def create_facets_table():
+    """创建 talent_facets 表和索引"""
+
+    create_table_sql = """
+    CREATE TABLE IF NOT EXISTS talent_facets (
+        talent_id INTEGER PRIMARY KEY REFERENCES talents(id) ON DELETE CASCADE,
+        level VARCHAR(20),
+        specialty VARCHAR(50),
+        social_security_status VARCHAR(20),
+        price NUMERIC(10, 2),
+        classifier_version INTEGER NOT NULL,
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+    );
+    """
+
+    create_indexes_sql = [
+        "CREATE INDEX IF NOT EXISTS ix_talent_facets_level_specialty ON talent_facets(level, specialty, talent_id);",
+        "CREATE INDEX IF NOT EXISTS ix_talent_facets_specialty ON talent_facets(specialty, talent_id);",
+        "CREATE INDEX IF NOT EXISTS ix_talent_facets_social_security ON talent_facets(social_security_status, talent_id);"
+    ]
+
+    with engine.connect() as connection:
+        connection.execute(text(create_table_sql))
+        for index_sql in create_indexes_sql:
+            connection.execute(text(index_sql))
+        connection.commit()
+        print("talent_facets 表创建成功")
+
+def backfill_facets(chunk_size: int = None):
+    """按主键分批为已有人才生成分类结果"""
+    chunk_size = chunk_size or settings.reclassify_chunk_size
+    after_id = 0
+    total = 0
+
+    db = SessionLocal()
+    try:
+        while True:
+            last_id, processed, _ = reclassify_talents_chunk(db, after_id, chunk_size, update_talents=False)
+            if last_id is None:
+                break
+            after_id = last_id
+            total += processed
+            print(f"已回填 {total} 条人才分类结果")
+    finally:
+        db.close()
+
+    with engine.connect() as connection:
+        connection.execute(text("ANALYZE talent_facets"))
+        connection.commit()
+
+def run_migration():
+    """执行完整的迁移流程"""
+    print("开始人才分类结果表迁移...")
+
+    try:
+        # 1. 创建表和索引
+        create_facets_table()
+
+        # 2. 回填已有人才
+        backfill_facets()
+
+        print("人才分类结果表迁移完成！")
+
+    except Exception as e:
+        print(f"迁移过程中出现错误: {e}")
+        raise
+
+if __name__ == "__main__":
+    run_migration()
@@ -0,0 +1,75 @@
+"""
+数据库迁移脚本：人才电话去重
+添加由数据库生成的 phone_normalized 列（电话去掉非数字字符，为空时为 NULL），
+并建立部分唯一索引，批量导入可以按电话 INSERT ... ON CONFLICT 增量更新。
+已有数据中存在重复电话时不会建索引，需先人工合并或修正列出的重复记录后重新执行。
+"""
+
+from sqlalchemy import text
+from app.database import engine
+
+def create_phone_column():
+    """添加 phone_normalized 生成列"""
+
+    add_column_sql = """
+    ALTER TABLE talents ADD COLUMN IF NOT EXISTS phone_normalized VARCHAR(20)
+        GENERATED ALWAYS AS (NULLIF(regexp_replace(phone, '[^0-9]', '', 'g'), '')) STORED;
+    """
+
+    with engine.connect() as connection:
+        connection.execute(text(add_column_sql))
+        connection.commit()
+        print("phone_normalized 列添加成功")
+
+def find_duplicate_phones():
+    """列出电话重复的人才，返回重复的电话数"""
+
+    with engine.connect() as connection:
+        duplicates = connection.execute(text("""
+            SELECT phone_normalized, array_agg(id ORDER BY id) AS ids
+            FROM talents
+            WHERE phone_normalized IS NOT NULL
+            GROUP BY phone_normalized
+            HAVING count(*) > 1
+            ORDER BY phone_normalized
+        """)).fetchall()
+
+    for phone, ids in duplicates:
+        print(f"  重复电话 {phone}: 人才 id {', '.join(str(talent_id) for talent_id in ids)}")
+    return len(duplicates)
+
+def create_unique_index():
+    """创建部分唯一索引"""
+
+    # CONCURRENTLY 不能在事务中执行，避免建索引期间锁住人才表写入
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text("""
+            CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_talents_phone_normalized
+                ON talents (phone_normalized) WHERE phone_normalized IS NOT NULL
+        """))
+        print("电话唯一索引创建成功")
+
+def run_migration():
+    """执行完整的迁移流程"""
+    print("开始人才电话去重迁移...")
+
+    try:
+        # 1. 添加生成列（会重写人才表）
+        create_phone_column()
+
+        # 2. 检查重复电话
+        duplicate_count = find_duplicate_phones()
+        if duplicate_count:
+            raise RuntimeError(f"存在 {duplicate_count} 个重复电话，请处理后重新执行迁移")
+
+        # 3. 创建唯一索引
+        create_unique_index()
+
+        print("人才电话去重迁移完成！")
+
+    except Exception as e:
+        print(f"迁移过程中出现错误: {e}")
+        raise
+
+if __name__ == "__main__":
+    run_migration()
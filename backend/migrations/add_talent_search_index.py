@@ -0,0 +1,62 @@
+"""
+数据库迁移脚本：人才搜索列及 pg_trgm 索引
+添加由数据库生成的 search_text 列（姓名、电话、微信备注、沟通内容的小写拼接），
+并建立 gin_trgm_ops 索引，使 LIKE '%关键字%' 子串搜索可以走索引。
+pg_trgm 按数据库的 LC_CTYPE 判断字符是否为单词字符，中文需要 UTF-8 locale（如 en_US.utf8），
+C locale 下中文字符会被忽略；少于 3 个字符的关键字无法利用三元组索引。
+"""
+
+from sqlalchemy import text
+from app.database import engine
+
+def create_search_column():
+    """添加 search_text 生成列"""
+
+    add_column_sql = """
+    ALTER TABLE talents ADD COLUMN IF NOT EXISTS search_text TEXT
+        GENERATED ALWAYS AS (
+            lower(coalesce(name, '') || E'\\n' || coalesce(phone, '') || E'\\n' ||
+                  coalesce(wechat_note, '') || E'\\n' || coalesce(communication_content, ''))
+        ) STORED;
+    """
+
+    with engine.connect() as connection:
+        connection.execute(text(add_column_sql))
+        connection.commit()
+        print("search_text 列添加成功")
+
+def create_trgm_index():
+    """安装 pg_trgm 扩展并创建 GIN 索引"""
+
+    with engine.connect() as connection:
+        connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        connection.commit()
+
+    # CONCURRENTLY 不能在事务中执行，避免建索引期间锁住人才表写入
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_talents_search_text_trgm
+                ON talents USING gin (search_text gin_trgm_ops)
+        """))
+        connection.execute(text("ANALYZE talents"))
+        print("pg_trgm 索引创建成功")
+
+def run_migration():
+    """执行完整的迁移流程"""
+    print("开始人才搜索索引迁移...")
+
+    try:
+        # 1. 添加生成列（会重写人才表）
+        create_search_column()
+
+        # 2. 创建三元组索引
+        create_trgm_index()
+
+        print("人才搜索索引迁移完成！")
+
+    except Exception as e:
+        print(f"迁移过程中出现错误: {e}")
+        raise
+
+if __name__ == "__main__":
+    run_migration()
@@ -1,11 +1,19 @@
 #!/usr/bin/env python3
 """
 直接数据库插入脚本 - 不依赖API，直接操作数据库
+
+所有步骤共用一个连接；id 通过序列一次性分配，数据按批生成后用 COPY FROM STDIN
+（或 --loader values 时用 execute_values 多行 INSERT）写入，可用 --talents/--companies 生成大规模数据：
+    python scripts/direct_data_insert.py --talents 1000000 --companies 10000
 """
 
 import sys
 import os
+import io
+import time
+import argparse
 import psycopg2
+from psycopg2.extras import execute_values
 import random
 from datetime import datetime, timedelta
 import uuid
@@ -13,6 +21,8 @@ import uuid
 # 添加项目根目录到Python路径
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from app.core.classifier import CLASSIFIER_VERSION, classify_certificate
+
 def get_db_connection():
     """获取数据库连接"""
     # Docker环境下的数据库连接参数
@@ -81,184 +91,29 @@ CERTIFICATE_TYPES = ["一级建造师", "二级建造师", "一级造价工程
 SPECIALTIES = ["建筑工程", "市政工程", "机电工程", "公路工程", "水利工程", "矿业工程", "通信工程", "港口工程", "民航工程", "铁路工程"]
 LEVELS = ["一级", "二级", "高级", "中级", "初级"]
 
-def insert_certificate_types():
-    """插入证书类型数据"""
-    conn = None
-    cursor = None
-    
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        print("插入证书类型数据...")
-        
-        for i, (type_code, type_name, category, description) in enumerate(CERTIFICATE_TYPES_DATA):
-            cursor.execute("""
-                INSERT INTO certificate_types (type_code, type_name, category, description, is_active, sort_order, created_at)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (type_code) DO NOTHING
-            """, (type_code, type_name, category, description, True, i+1, datetime.now()))
-        
-        conn.commit()
-        print(f"✓ 成功插入 {len(CERTIFICATE_TYPES_DATA)} 个证书类型")
-        return True
-        
-    except Exception as e:
-        print(f"✗ 插入证书类型失败: {e}")
-        if conn:
-            conn.rollback()
-        return False
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
-
-def insert_talents():
-    """插入人才数据"""
-    conn = None
-    cursor = None
-    
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        print("插入人才数据...")
-        talents = []
-        
-        for i in range(20):
-            province = random.choice(PROVINCES)
-            city = random.choice(CITIES[province])
-            
-            talent_data = (
-                random.choice(NAMES) + str(i+1),  # name
-                random.choice(["男", "女"]),  # gender
-                random.randint(25, 55),  # age
-                f"1{random.randint(3,9)}{random.randint(100000000, 999999999)}",  # phone
-                f"微信备注{i+1}",  # wechat_note
-                random.randint(20000, 80000),  # contract_price
-                random.choice(["A", "B", "C"]),  # intention_level
-                province,  # province
-                city,  # city
-                f"{city}某某区某某街道{random.randint(1, 999)}号",  # address
-                f"初次沟通记录{i+1}，人才表现积极",  # communication_content
-                random.choice(["唯一社保", "无社保"]),  # social_security_status
-                datetime.now(),  # created_at
-                datetime.now()   # updated_at
-            )
-            
-            cursor.execute("""
-                INSERT INTO talents (name, gender, age, phone, wechat_note, contract_price, 
-                                   intention_level, province, city, address, communication_content, 
-                                   social_security_status, created_at, updated_at)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                RETURNING id
-            """, talent_data)
-            
-            talent_id = cursor.fetchone()[0]
-            talents.append({"id": talent_id, "name": talent_data[0]})
-        
-        conn.commit()
-        print(f"✓ 成功插入 {len(talents)} 个人才")
-        return talents
-        
-    except Exception as e:
-        print(f"✗ 插入人才数据失败: {e}")
-        if conn:
-            conn.rollback()
-        return []
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
-
-def insert_certificates(talents):
-    """插入证书数据"""
-    if not talents:
-        print("没有人才数据，跳过证书插入")
-        return []
-
-    conn = None
-    cursor = None
-
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        print("插入证书数据...")
-        certificates = []
-
-        # 定义更真实的证书组合
-        cert_combinations = [
-            # 建造师 + 对应专业
-            {"type": "一级建造师", "specialty": "建筑工程", "level": "一级"},
-            {"type": "一级建造师", "specialty": "市政工程", "level": "一级"},
-            {"type": "一级建造师", "specialty": "机电工程", "level": "一级"},
-            {"type": "二级建造师", "specialty": "建筑工程", "level": "二级"},
-            {"type": "二级建造师", "specialty": "市政工程", "level": "二级"},
-            {"type": "二级建造师", "specialty": "机电工程", "level": "二级"},
-
-            # 工程师职称
-            {"type": "注册电气工程师", "specialty": "电气工程", "level": "中级"},
-            {"type": "注册给排水工程师", "specialty": "给排水工程", "level": "中级"},
-            {"type": "注册建筑师", "specialty": "建筑工程", "level": "高级"},
-            {"type": "注册结构师", "specialty": "结构工程", "level": "高级"},
-            {"type": "监理工程师", "specialty": "建筑工程", "level": "中级"},
-            {"type": "一级造价工程师", "specialty": "工程造价", "level": "高级"},
-
-            # 安全员
-            {"type": "三类人员A类", "specialty": "安全管理", "level": "三类人员A类"},
-            {"type": "三类人员B类", "specialty": "安全管理", "level": "三类人员B类"},
-            {"type": "三类人员C类", "specialty": "安全管理", "level": "三类人员C类"},
-        ]
-
-        for talent in talents:
-            cert_count = random.randint(1, 4)  # 每个人才1-4个证书
-            selected_certs = random.sample(cert_combinations, min(cert_count, len(cert_combinations)))
-
-            for j, cert_info in enumerate(selected_certs):
-                cert_id = str(uuid.uuid4())[:8].upper()
-                cert_data = (
-                    cert_id,  # certificate_id
-                    talent["id"],  # talent_id
-                    cert_info["type"],  # certificate_type
-                    f"{cert_info['type']}（{cert_info['specialty']}）",  # certificate_name
-                    f"CERT{random.randint(100000, 999999)}",  # certificate_number
-                    (datetime.now() - timedelta(days=random.randint(365, 1825))).date(),  # issue_date
-                    (datetime.now() + timedelta(days=random.randint(365, 1825))).date(),  # expiry_date
-                    random.choice(["住建部", "人社部", "工信部", "交通部"]),  # issuing_authority
-                    cert_info["specialty"],  # specialty
-                    cert_info["level"],  # level
-                    random.choice(["VALID", "VALID", "VALID", "EXPIRED"]),  # status (大部分有效)
-                    f"证书备注{j+1}",  # notes
-                    datetime.now(),  # created_at
-                    datetime.now()   # updated_at
-                )
-
-                cursor.execute("""
-                    INSERT INTO certificates (certificate_id, talent_id, certificate_type, certificate_name,
-                                            certificate_number, issue_date, expiry_date, issuing_authority,
-                                            specialty, level, status, notes, created_at, updated_at)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """, cert_data)
-
-                certificates.append({"id": cert_id, "talent_id": talent["id"]})
-
-        conn.commit()
-        print(f"✓ 成功插入 {len(certificates)} 个证书")
-        return certificates
-
-    except Exception as e:
-        print(f"✗ 插入证书数据失败: {e}")
-        if conn:
-            conn.rollback()
-        return []
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
+# 证书组合（证书类型 + 对应专业 + 等级）
+CERT_COMBINATIONS = [
+    # 建造师 + 对应专业
+    {"type": "一级建造师", "specialty": "建筑工程", "level": "一级"},
+    {"type": "一级建造师", "specialty": "市政工程", "level": "一级"},
+    {"type": "一级建造师", "specialty": "机电工程", "level": "一级"},
+    {"type": "二级建造师", "specialty": "建筑工程", "level": "二级"},
+    {"type": "二级建造师", "specialty": "市政工程", "level": "二级"},
+    {"type": "二级建造师", "specialty": "机电工程", "level": "二级"},
+
+    # 工程师职称
+    {"type": "注册电气工程师", "specialty": "电气工程", "level": "中级"},
+    {"type": "注册给排水工程师", "specialty": "给排水工程", "level": "中级"},
+    {"type": "注册建筑师", "specialty": "建筑工程", "level": "高级"},
+    {"type": "注册结构师", "specialty": "结构工程", "level": "高级"},
+    {"type": "监理工程师", "specialty": "建筑工程", "level": "中级"},
+    {"type": "一级造价工程师", "specialty": "工程造价", "level": "高级"},
+
+    # 安全员
+    {"type": "三类人员A类", "specialty": "安全管理", "level": "三类人员A类"},
+    {"type": "三类人员B类", "specialty": "安全管理", "level": "三类人员B类"},
+    {"type": "三类人员C类", "specialty": "安全管理", "level": "三类人员C类"},
+]
 
 # 公司数据
 COMPANY_NAMES = [
@@ -302,185 +157,395 @@ CERTIFICATE_REQUIREMENTS = [
     "注册电气工程师1名，一级建造师（建筑工程）1名"
 ]
 
-def insert_companies():
-    """插入公司数据"""
-    conn = None
-    cursor = None
 
+TALENT_COLUMNS = ("id", "name", "gender", "age", "phone", "wechat_note", "contract_price",
+                  "intention_level", "province", "city", "address", "communication_content",
+                  "social_security_status", "created_at", "updated_at")
+FACET_COLUMNS = ("talent_id", "level", "specialty", "social_security_status", "price", "classifier_version")
+CERTIFICATE_COLUMNS = ("certificate_id", "talent_id", "certificate_type", "certificate_name",
+                       "certificate_number", "issue_date", "expiry_date", "issuing_authority",
+                       "specialty", "level", "status", "notes", "created_at", "updated_at")
+COMPANY_COLUMNS = ("id", "name", "contact_info", "communication_notes", "intention",
+                   "intention_level", "price", "certificate_requirements", "created_at", "updated_at")
+COMMUNICATION_COLUMNS = ("company_id", "talent_id", "content", "communication_type",
+                         "communication_date", "created_at", "updated_at")
+
+# 每批生成并写入的行数（人才、证书、公司按批生成，内存占用与总数无关）
+CHUNK_SIZE = 50000
+
+# execute_values 每条 INSERT 包含的行数
+PAGE_SIZE = 1000
+
+class IteratorFile(io.TextIOBase):
+    """把逐行产出的 COPY 文本包装成 copy_expert 需要的文件对象，边生成边发送"""
+
+    def __init__(self, lines):
+        self._lines = iter(lines)
+        self._buffer = ""
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        chunks = [self._buffer]
+        length = len(self._buffer)
+        while size is None or size < 0 or length < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            chunks.append(line)
+            length += len(line)
+
+        data = "".join(chunks)
+        if size is None or size < 0:
+            self._buffer = ""
+            return data
+        self._buffer = data[size:]
+        return data[:size]
+
+def _copy_value(value):
+    """COPY 文本格式的字段值：NULL 为 \\N，转义反斜杠、制表符和换行"""
+    if value is None:
+        return "\\N"
+    return (str(value).replace("\\", "\\\\").replace("\t", "\\t")
+            .replace("\n", "\\n").replace("\r", "\\r"))
+
+def write_rows(cursor, table, columns, rows, loader="copy", page_size=PAGE_SIZE):
+    """批量写入行，返回写入行数
+
+    copy：COPY FROM STDIN 流式发送，最快；values：execute_values 每 page_size 行一条多行 INSERT
+    """
+    count = 0
+
+    def counted():
+        nonlocal count
+        for row in rows:
+            count += 1
+            yield row
+
+    column_list = ", ".join(columns)
+    if loader == "copy":
+        lines = ("\t".join(_copy_value(value) for value in row) + "\n" for row in counted())
+        cursor.copy_expert(f"COPY {table} ({column_list}) FROM STDIN", IteratorFile(lines))
+    else:
+        execute_values(cursor, f"INSERT INTO {table} ({column_list}) VALUES %s", counted(), page_size=page_size)
+    return count
+
+def allocate_ids(cursor, table, count):
+    """一次从表的序列中取出 count 个 id，行数据中直接带上 id，不再逐行 RETURNING"""
+    cursor.execute(
+        "SELECT nextval(pg_get_serial_sequence(%s, 'id')) FROM generate_series(1, %s)",
+        (table, count)
+    )
+    return [row[0] for row in cursor]
+
+def insert_certificate_types(conn):
+    """插入证书类型数据"""
+    cursor = conn.cursor()
+    try:
+        print("插入证书类型数据...")
+
+        now = datetime.now()
+        execute_values(cursor, """
+            INSERT INTO certificate_types (type_code, type_name, category, description, is_active, sort_order, created_at)
+            VALUES %s
+            ON CONFLICT (type_code) DO NOTHING
+        """, [(type_code, type_name, category, description, True, i+1, now)
+              for i, (type_code, type_name, category, description) in enumerate(CERTIFICATE_TYPES_DATA)])
+
+        conn.commit()
+        print(f"✓ 成功插入 {len(CERTIFICATE_TYPES_DATA)} 个证书类型")
+        return True
+
+    except Exception as e:
+        print(f"✗ 插入证书类型失败: {e}")
+        conn.rollback()
+        return False
+    finally:
+        cursor.close()
+
+def generate_talent(talent_id, i, now):
+    """生成第 i 个人才的数据行"""
+    province = random.choice(PROVINCES)
+    city = random.choice(CITIES[province])
+
+    return (
+        talent_id,  # id
+        random.choice(NAMES) + str(i+1),  # name
+        random.choice(["男", "女"]),  # gender
+        random.randint(25, 55),  # age
+        f"13{talent_id:09d}",  # phone：由 id 生成，不会与电话唯一索引冲突
+        f"微信备注{i+1}",  # wechat_note
+        random.randint(20000, 80000),  # contract_price
+        random.choice(["A", "B", "C"]),  # intention_level
+        province,  # province
+        city,  # city
+        f"{city}某某区某某街道{random.randint(1, 999)}号",  # address
+        f"初次沟通记录{i+1}，人才表现积极",  # communication_content
+        random.choice(["唯一社保", "无社保"]),  # social_security_status
+        now,  # created_at
+        now   # updated_at
+    )
+
+def talent_facet(talent):
+    """人才的分类结果行（与后端新增人才时的规则一致）"""
+    talent_id, wechat_note, contract_price = talent[0], talent[5], talent[6]
+    communication_content, social_security_status = talent[11], talent[12]
+    result = classify_certificate(communication_content, wechat_note)
+    return (
+        talent_id,
+        result.certificate_level,
+        result.certificate_specialty,
+        social_security_status or result.social_security_status,
+        contract_price if contract_price is not None else result.contract_price,
+        CLASSIFIER_VERSION
+    )
+
+def insert_talents(conn, count, loader="copy"):
+    """插入人才数据及其分类结果，返回人才 id 列表"""
+    cursor = conn.cursor()
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        print("插入人才数据...")
+        talent_ids = allocate_ids(cursor, "talents", count)
+        now = datetime.now()
+
+        for start in range(0, count, CHUNK_SIZE):
+            talents = [generate_talent(talent_id, i, now)
+                       for i, talent_id in enumerate(talent_ids[start:start + CHUNK_SIZE], start)]
+            write_rows(cursor, "talents", TALENT_COLUMNS, talents, loader)
+            write_rows(cursor, "talent_facets", FACET_COLUMNS, (talent_facet(talent) for talent in talents), loader)
+
+        conn.commit()
+        print(f"✓ 成功插入 {len(talent_ids)} 个人才")
+        return talent_ids
+
+    except Exception as e:
+        print(f"✗ 插入人才数据失败: {e}")
+        conn.rollback()
+        return []
+    finally:
+        cursor.close()
+
+def generate_certificates(talent_id, now):
+    """生成一个人才的 1-4 个证书"""
+    cert_count = random.randint(1, 4)  # 每个人才1-4个证书
+    selected_certs = random.sample(CERT_COMBINATIONS, min(cert_count, len(CERT_COMBINATIONS)))
+
+    for j, cert_info in enumerate(selected_certs):
+        yield (
+            uuid.uuid4().hex[:16].upper(),  # certificate_id（主键，百万级数据下 8 位会重复）
+            talent_id,  # talent_id
+            cert_info["type"],  # certificate_type
+            f"{cert_info['type']}（{cert_info['specialty']}）",  # certificate_name
+            f"CERT{random.randint(100000, 999999)}",  # certificate_number
+            (now - timedelta(days=random.randint(365, 1825))).date(),  # issue_date
+            (now + timedelta(days=random.randint(365, 1825))).date(),  # expiry_date
+            random.choice(["住建部", "人社部", "工信部", "交通部"]),  # issuing_authority
+            cert_info["specialty"],  # specialty
+            cert_info["level"],  # level
+            random.choice(["VALID", "VALID", "VALID", "EXPIRED"]),  # status (大部分有效)
+            f"证书备注{j+1}",  # notes
+            now,  # created_at
+            now   # updated_at
+        )
+
+def insert_certificates(conn, talent_ids, loader="copy"):
+    """插入证书数据，返回证书数"""
+    if not talent_ids:
+        print("没有人才数据，跳过证书插入")
+        return 0
+
+    cursor = conn.cursor()
+    try:
+        print("插入证书数据...")
+        now = datetime.now()
+        inserted = 0
 
+        for start in range(0, len(talent_ids), CHUNK_SIZE):
+            certificates = (certificate
+                            for talent_id in talent_ids[start:start + CHUNK_SIZE]
+                            for certificate in generate_certificates(talent_id, now))
+            inserted += write_rows(cursor, "certificates", CERTIFICATE_COLUMNS, certificates, loader)
+
+        conn.commit()
+        print(f"✓ 成功插入 {inserted} 个证书")
+        return inserted
+
+    except Exception as e:
+        print(f"✗ 插入证书数据失败: {e}")
+        conn.rollback()
+        return 0
+    finally:
+        cursor.close()
+
+def generate_company(company_id, i, now):
+    """生成第 i 个公司的数据行，超出公司名单后名称加序号"""
+    company_name = COMPANY_NAMES[i % len(COMPANY_NAMES)]
+    if i >= len(COMPANY_NAMES):
+        company_name = f"{company_name}{i // len(COMPANY_NAMES) + 1}"
+
+    # 随机选择城市和地址
+    city = random.choice(list(CITIES_ADDRESSES.keys()))
+    address = random.choice(CITIES_ADDRESSES[city])
+
+    # 生成联系信息
+    contact_name = random.choice(CONTACT_NAMES)
+    phone = f"1{random.randint(3,9)}{random.randint(100000000, 999999999)}"
+    email = f"{contact_name.replace('经理', '').replace('总监', '').replace('主任', '').replace('部长', '').replace('总', '').replace('主管', '')}@{company_name[:4].replace('有限公司', '').replace('股份', '').replace('集团', '')}.com"
+
+    contact_template = random.choice(CONTACT_TEMPLATES)
+    contact_info = contact_template.format(
+        name=contact_name,
+        phone=phone,
+        email=email,
+        office_phone=f"010-{random.randint(10000000, 99999999)}",
+        wechat=f"wx_{random.randint(100000, 999999)}",
+        address=f"{city}{address}{random.randint(1, 999)}号"
+    )
+
+    return (
+        company_id,  # id
+        company_name,  # name
+        contact_info,  # contact_info
+        f"与{company_name}的初步沟通记录，了解了项目需求和合作意向。",  # communication_notes
+        f"有{random.choice(['住宅', '商业', '基础设施', '工业'])}项目合作需求，预计项目周期{random.randint(6, 24)}个月。",  # intention
+        random.choice(["A", "B", "C"]),  # intention_level
+        f"{random.randint(3, 15)}万/年",  # price
+        random.choice(CERTIFICATE_REQUIREMENTS),  # certificate_requirements
+        now,  # created_at
+        now   # updated_at
+    )
+
+def insert_companies(conn, count=len(COMPANY_NAMES), loader="copy"):
+    """插入公司数据，返回公司 id 列表"""
+    cursor = conn.cursor()
+    try:
         print("插入公司数据...")
-        companies = []
-
-        for i, company_name in enumerate(COMPANY_NAMES):
-            # 随机选择城市和地址
-            city = random.choice(list(CITIES_ADDRESSES.keys()))
-            address = random.choice(CITIES_ADDRESSES[city])
-
-            # 生成联系信息
-            contact_name = random.choice(CONTACT_NAMES)
-            phone = f"1{random.randint(3,9)}{random.randint(100000000, 999999999)}"
-            email = f"{contact_name.replace('经理', '').replace('总监', '').replace('主任', '').replace('部长', '').replace('总', '').replace('主管', '')}@{company_name[:4].replace('有限公司', '').replace('股份', '').replace('集团', '')}.com"
-
-            contact_template = random.choice(CONTACT_TEMPLATES)
-            contact_info = contact_template.format(
-                name=contact_name,
-                phone=phone,
-                email=email,
-                office_phone=f"010-{random.randint(10000000, 99999999)}",
-                wechat=f"wx_{random.randint(100000, 999999)}",
-                address=f"{city}{address}{random.randint(1, 999)}号"
-            )
-
-            company_data = (
-                company_name,  # name
-                contact_info,  # contact_info
-                f"与{company_name}的初步沟通记录，了解了项目需求和合作意向。",  # communication_notes
-                f"有{random.choice(['住宅', '商业', '基础设施', '工业'])}项目合作需求，预计项目周期{random.randint(6, 24)}个月。",  # intention
-                random.choice(["A", "B", "C"]),  # intention_level
-                f"{random.randint(3, 15)}万/年",  # price
-                random.choice(CERTIFICATE_REQUIREMENTS),  # certificate_requirements
-                datetime.now(),  # created_at
-                datetime.now()   # updated_at
-            )
-
-            cursor.execute("""
-                INSERT INTO companies (name, contact_info, communication_notes, intention,
-                                     intention_level, price, certificate_requirements, created_at, updated_at)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                RETURNING id
-            """, company_data)
-
-            company_id = cursor.fetchone()[0]
-            companies.append({"id": company_id, "name": company_name})
+        company_ids = allocate_ids(cursor, "companies", count)
+        now = datetime.now()
+
+        for start in range(0, count, CHUNK_SIZE):
+            companies = (generate_company(company_id, i, now)
+                         for i, company_id in enumerate(company_ids[start:start + CHUNK_SIZE], start))
+            write_rows(cursor, "companies", COMPANY_COLUMNS, companies, loader)
 
         conn.commit()
-        print(f"✓ 成功插入 {len(companies)} 个公司")
-        return companies
+        print(f"✓ 成功插入 {len(company_ids)} 个公司")
+        return company_ids
 
     except Exception as e:
         print(f"✗ 插入公司数据失败: {e}")
-        if conn:
-            conn.rollback()
+        conn.rollback()
         return []
     finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
-
-def insert_communications(talents, companies):
-    """插入沟通记录数据"""
-    if not talents and not companies:
-        print("没有人才或公司数据，跳过沟通记录插入")
-        return []
+        cursor.close()
 
-    conn = None
-    cursor = None
+def insert_communications(conn, talent_ids, company_ids, loader="copy"):
+    """插入沟通记录数据（前 10 个人才和前 10 个公司），返回记录数"""
+    if not talent_ids and not company_ids:
+        print("没有人才或公司数据，跳过沟通记录插入")
+        return 0
 
+    cursor = conn.cursor()
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
         print("插入沟通记录数据...")
+        now = datetime.now()
+
+        cursor.execute("SELECT id, name FROM talents WHERE id = ANY(%s) ORDER BY id", (talent_ids[:10],))
+        talents = cursor.fetchall()
+        cursor.execute("SELECT id, name FROM companies WHERE id = ANY(%s) ORDER BY id", (company_ids[:10],))
+        companies = cursor.fetchall()
+
         communications = []
 
         # 为人才创建沟通记录
-        for talent in talents[:10]:  # 只为前10个人才创建记录
-            comm_data = (
+        for talent_id, talent_name in talents:
+            communications.append((
                 None,  # company_id
-                talent["id"],  # talent_id
-                f"与{talent['name']}的沟通记录",  # content
+                talent_id,  # talent_id
+                f"与{talent_name}的沟通记录",  # content
                 random.choice(["电话沟通", "微信沟通", "面谈", "邮件沟通"]),  # communication_type
-                datetime.now() - timedelta(days=random.randint(1, 30)),  # communication_date
-                datetime.now(),  # created_at
-                datetime.now()   # updated_at
-            )
-
-            cursor.execute("""
-                INSERT INTO communications (company_id, talent_id, content, communication_type,
-                                          communication_date, created_at, updated_at)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-                RETURNING id
-            """, comm_data)
-
-            comm_id = cursor.fetchone()[0]
-            communications.append({"id": comm_id, "type": "talent"})
+                now - timedelta(days=random.randint(1, 30)),  # communication_date
+                now,  # created_at
+                now   # updated_at
+            ))
 
         # 为公司创建沟通记录
-        for company in companies[:10]:  # 只为前10个公司创建记录
-            comm_data = (
-                company["id"],  # company_id
+        for company_id, company_name in companies:
+            communications.append((
+                company_id,  # company_id
                 None,  # talent_id
-                f"与{company['name']}的项目洽谈记录",  # content
+                f"与{company_name}的项目洽谈记录",  # content
                 random.choice(["电话沟通", "现场拜访", "邮件沟通", "视频会议"]),  # communication_type
-                datetime.now() - timedelta(days=random.randint(1, 30)),  # communication_date
-                datetime.now(),  # created_at
-                datetime.now()   # updated_at
-            )
-
-            cursor.execute("""
-                INSERT INTO communications (company_id, talent_id, content, communication_type,
-                                          communication_date, created_at, updated_at)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-                RETURNING id
-            """, comm_data)
-
-            comm_id = cursor.fetchone()[0]
-            communications.append({"id": comm_id, "type": "company"})
+                now - timedelta(days=random.randint(1, 30)),  # communication_date
+                now,  # created_at
+                now   # updated_at
+            ))
 
+        inserted = write_rows(cursor, "communications", COMMUNICATION_COLUMNS, communications, loader)
         conn.commit()
-        print(f"✓ 成功插入 {len(communications)} 条沟通记录")
-        return communications
+        print(f"✓ 成功插入 {inserted} 条沟通记录")
+        return inserted
 
     except Exception as e:
         print(f"✗ 插入沟通记录失败: {e}")
-        if conn:
-            conn.rollback()
-        return []
+        conn.rollback()
+        return 0
     finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
-
-def main():
+        cursor.close()
+
+def build_arg_parser():
+    """数据规模与写入方式参数（reset_database.py 原样透传）"""
+    parser = argparse.ArgumentParser(description="直接数据库插入工具")
+    parser.add_argument("--talents", type=int, default=20, help="人才数（默认 20）")
+    parser.add_argument("--companies", type=int, default=len(COMPANY_NAMES), help=f"公司数（默认 {len(COMPANY_NAMES)}）")
+    parser.add_argument("--loader", choices=["copy", "values"], default="copy",
+                        help="写入方式：copy 为 COPY FROM STDIN，values 为 execute_values 多行 INSERT")
+    return parser
+
+def main(argv=None):
     """主函数"""
+    args = build_arg_parser().parse_args(argv)
+
     print("=" * 50)
     print("直接数据库插入工具")
     print("=" * 50)
     print(f"开始时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    started = time.perf_counter()
 
-    # 1. 插入证书类型
-    if not insert_certificate_types():
-        print("证书类型插入失败，终止操作")
-        return
+    # 所有步骤共用一个连接
+    conn = get_db_connection()
+    try:
+        # 1. 插入证书类型
+        if not insert_certificate_types(conn):
+            print("证书类型插入失败，终止操作")
+            return
 
-    # 2. 插入人才数据
-    talents = insert_talents()
-    if not talents:
-        print("人才数据插入失败，终止操作")
-        return
+        # 2. 插入人才数据
+        talent_ids = insert_talents(conn, args.talents, args.loader)
+        if not talent_ids:
+            print("人才数据插入失败，终止操作")
+            return
 
-    # 3. 插入证书数据
-    certificates = insert_certificates(talents)
+        # 3. 插入证书数据
+        certificate_count = insert_certificates(conn, talent_ids, args.loader)
 
-    # 4. 插入公司数据
-    companies = insert_companies()
+        # 4. 插入公司数据
+        company_ids = insert_companies(conn, args.companies, args.loader)
 
-    # 5. 插入沟通记录
-    communications = insert_communications(talents, companies)
+        # 5. 插入沟通记录
+        communication_count = insert_communications(conn, talent_ids, company_ids, args.loader)
+    finally:
+        conn.close()
 
-    print(f"\n完成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"\n完成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}（用时 {time.perf_counter() - started:.1f} 秒）")
     print("=" * 50)
     print("数据插入完成！")
     print(f"证书类型: {len(CERTIFICATE_TYPES_DATA)} 个")
-    print(f"人才: {len(talents)} 个")
-    print(f"证书: {len(certificates)} 个")
-    print(f"公司: {len(companies)} 个")
-    print(f"沟通记录: {len(communications)} 条")
+    print(f"人才: {len(talent_ids)} 个")
+    print(f"证书: {certificate_count} 个")
+    print(f"公司: {len(company_ids)} 个")
+    print(f"沟通记录: {communication_count} 条")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+证书统计汇总表重建脚本 - 从证书表全量重算 certificate_stats_rollup
+触发器负责实时增量维护，本脚本用于定期校正（例如每天凌晨由 cron 执行）
+"""
+
+import sys
+import os
+from datetime import datetime
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal
+from app.crud.certificate import rebuild_certificate_stats_rollup
+
+def main():
+    """主函数"""
+    print(f"开始重建证书统计汇总表: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+
+    db = SessionLocal()
+    try:
+        rows = rebuild_certificate_stats_rollup(db)
+        print(f"✓ 重建完成，共 {rows} 行汇总数据")
+    except Exception as e:
+        db.rollback()
+        print(f"✗ 重建失败: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -66,12 +66,12 @@ def clear_all_data():
             ORDER BY tablename;
         """)
         
-        tables = cursor.fetchall()
+        tables = [table_name for (table_name,) in cursor.fetchall()]
         
-        # 清空每个表的数据
-        for (table_name,) in tables:
-            print(f"清空表: {table_name}")
-            cursor.execute(f"TRUNCATE TABLE {table_name} RESTART IDENTITY CASCADE;")
+        # 一条 TRUNCATE 清空全部表
+        if tables:
+            print(f"清空表: {', '.join(tables)}")
+            cursor.execute(f"TRUNCATE TABLE {', '.join(tables)} RESTART IDENTITY CASCADE;")
         
         # 重新启用外键约束检查
         cursor.execute("SET session_replication_role = DEFAULT;")
@@ -93,8 +93,8 @@ def clear_all_data():
         if conn:
             conn.close()
 
-def run_data_creation_scripts():
-    """运行数据创建脚本"""
+def run_data_creation_scripts(extra_args=()):
+    """运行数据创建脚本，extra_args 原样传给 direct_data_insert.py（如 --talents 1000000）"""
     print("\n开始创建新的测试数据...")
 
     scripts_dir = os.path.dirname(os.path.abspath(__file__))
@@ -105,7 +105,8 @@ def run_data_creation_scripts():
         import subprocess
         result = subprocess.run([
             sys.executable,
-            os.path.join(scripts_dir, 'direct_data_insert.py')
+            os.path.join(scripts_dir, 'direct_data_insert.py'),
+            *extra_args
         ], capture_output=True, text=True, cwd=scripts_dir)
 
         if result.returncode == 0:
@@ -155,8 +156,9 @@ def verify_data():
         if conn:
             conn.close()
 
-def main():
-    """主函数"""
+def main(argv=None):
+    """主函数，命令行参数透传给 direct_data_insert.py"""
+    extra_args = sys.argv[1:] if argv is None else argv
     print("=" * 50)
     print("CRM数据库重置工具")
     print("=" * 50)
@@ -168,7 +170,7 @@ def main():
         return
     
     # 第二步：重新录入数据
-    run_data_creation_scripts()
+    run_data_creation_scripts(extra_args)
     
     # 第三步：验证数据
     verify_data()
@@ -5,10 +5,14 @@
 
 import requests
 import json
+import time
 
 # API基础URL
 BASE_URL = "http://localhost:8000/api"
 
+# 电话号码唯一：每次运行使用不同的号码后缀，避免与上次运行留下的测试人才冲突
+RUN_SUFFIX = f"{int(time.time()) % 1000000:06d}"
+
 def test_certificate_auto_id():
     """测试证书ID自动生成"""
     print("=== 测试证书ID自动生成 ===")
@@ -72,7 +76,7 @@ def test_talent_location_info():
         "name": "地区测试人才",
         "gender": "女",
         "age": 28,
-        "phone": "13700137000",
+        "phone": f"137{RUN_SUFFIX}00",
         "province": "江苏省",
         "city": "苏州市",
         "address": "工业园区星海街100号",
@@ -163,7 +167,7 @@ def test_talent_certificate_association():
         "name": "证书关联测试人才",
         "gender": "男",
         "age": 32,
-        "phone": "13800138888",
+        "phone": f"138{RUN_SUFFIX}88",
         "province": "浙江省",
         "city": "杭州市",
         "wechat_note": "证书关联测试",
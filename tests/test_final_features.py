@@ -5,10 +5,19 @@
 
 import requests
 import json
+import os
+import sys
+import time
 import urllib.parse
 
 API_BASE_URL = "http://localhost:8000/api"
 
+# 电话号码唯一：每次运行使用不同的号码后缀，避免与上次运行留下的测试人才冲突
+RUN_SUFFIX = f"{int(time.time()) % 1000000:06d}"
+
+# 所有请求复用同一个连接（keep-alive）
+session = requests.Session()
+
 def test_create_talents():
     """测试创建不同类型的人才"""
     
@@ -18,26 +27,26 @@ def test_create_talents():
             "certificate_level": "一级",
             "certificate_specialty": "建筑工程",
             "social_security_status": "唯一社保",
-            "phone": "13800138001"
+            "phone": f"138{RUN_SUFFIX}01"
         },
         {
             "name": "王工程师", 
             "certificate_level": "高级工程师",
             "certificate_specialty": "电气工程师",
             "social_security_status": "无社保",
-            "phone": "13800138002"
+            "phone": f"138{RUN_SUFFIX}02"
         },
         {
             "name": "张安全员",
             "certificate_level": "三类人员C类", 
             "certificate_specialty": "安全管理",
-            "phone": "13800138003"
+            "phone": f"138{RUN_SUFFIX}03"
         },
         {
             "name": "赵项目经理",
             "certificate_level": "三类人员B类",
             "certificate_specialty": "安全管理", 
-            "phone": "13800138004"
+            "phone": f"138{RUN_SUFFIX}04"
         }
     ]
     
@@ -50,7 +59,7 @@ def test_create_talents():
         print(f"\n{i}. 创建 {case['name']}")
         
         try:
-            response = requests.post(f"{API_BASE_URL}/talents/", json=case)
+            response = session.post(f"{API_BASE_URL}/talents/", json=case)
             
             if response.status_code == 200:
                 result = response.json()
@@ -74,7 +83,7 @@ def test_list_talents():
     print("=" * 50)
     
     try:
-        response = requests.get(f"{API_BASE_URL}/talents/")
+        response = session.get(f"{API_BASE_URL}/talents/")
         
         if response.status_code == 200:
             data = response.json()
@@ -110,7 +119,7 @@ def test_filter_by_level():
         try:
             # URL编码
             encoded_level = urllib.parse.quote(level)
-            response = requests.get(f"{API_BASE_URL}/talents/?certificate_level={encoded_level}")
+            response = session.get(f"{API_BASE_URL}/talents/?certificate_level={encoded_level}")
             
             if response.status_code == 200:
                 data = response.json()
@@ -137,7 +146,7 @@ def test_filter_by_specialty():
         try:
             # URL编码
             encoded_specialty = urllib.parse.quote(specialty)
-            response = requests.get(f"{API_BASE_URL}/talents/?certificate_specialty={encoded_specialty}")
+            response = session.get(f"{API_BASE_URL}/talents/?certificate_specialty={encoded_specialty}")
             
             if response.status_code == 200:
                 data = response.json()
@@ -162,7 +171,7 @@ def test_multi_specialty_filter():
         # 测试多选：建筑工程,电气工程师
         specialties = "建筑工程,电气工程师"
         encoded_specialties = urllib.parse.quote(specialties)
-        response = requests.get(f"{API_BASE_URL}/talents/?certificate_specialty={encoded_specialties}")
+        response = session.get(f"{API_BASE_URL}/talents/?certificate_specialty={encoded_specialties}")
         
         if response.status_code == 200:
             data = response.json()
@@ -179,13 +188,82 @@ def test_multi_specialty_filter():
     except Exception as e:
         print(f"❌ 多选筛选异常: {e}")
 
+def test_bulk_upsert_keeps_unset_fields():
+    """测试按电话批量更新时，请求中未提供的字段保留原值"""
+    print("\n🔁 测试批量更新保留未提供的字段")
+    print("=" * 50)
+    
+    phone = f"137{RUN_SUFFIX}99"
+    try:
+        response = session.post(f"{API_BASE_URL}/talents/bulk", params={"mode": "upsert"},
+                                json={"talents": [{"name": "更新测试", "phone": phone, "intention_level": "A"}]})
+        talent_id = response.json()["ids"][0]
+        
+        # 第二次不提供意向等级，已有的 A 不能被默认值 C 覆盖
+        response = session.post(f"{API_BASE_URL}/talents/bulk", params={"mode": "upsert"},
+                                json={"talents": [{"name": "更新测试", "phone": phone, "wechat_note": "补充备注"}]})
+        result = response.json()
+        talent = session.get(f"{API_BASE_URL}/talents/{talent_id}").json()
+        
+        if talent["intention_level"] == "A" and talent["wechat_note"] == "补充备注" and result["updated"] == 1:
+            print("✅ 未提供的意向等级保持为 A，备注已更新")
+        else:
+            print(f"❌ 意向等级: {talent['intention_level']}，备注: {talent['wechat_note']}，结果: {result}")
+        
+        # 再次提交相同数据，不应计为更新
+        response = session.post(f"{API_BASE_URL}/talents/bulk", params={"mode": "upsert"},
+                                json={"talents": [{"name": "更新测试", "phone": phone, "wechat_note": "补充备注"}]})
+        result = response.json()
+        if result["unchanged"] == 1:
+            print("✅ 相同数据未重复写入")
+        else:
+            print(f"❌ 相同数据结果: {result}")
+        
+        session.delete(f"{API_BASE_URL}/talents/{talent_id}")
+    except Exception as e:
+        print(f"❌ 请求异常: {e}")
+
+def test_smart_import_upsert_keeps_manual_edits():
+    """测试 smart_import 增量导入（upsert）不覆盖手工修改过的意向等级、社保情况和价格"""
+    print("\n📥 测试增量导入保留手工修改")
+    print("=" * 50)
+    
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "tools"))
+    from smart_import import build_talent_data
+    
+    phone = f"137{RUN_SUFFIX}88"
+    try:
+        response = session.post(f"{API_BASE_URL}/talents/", json={
+            "name": "增量导入测试", "phone": phone, "intention_level": "A",
+            "contract_price": 50000, "social_security_status": "唯一社保"
+        })
+        talent_id = response.json()["id"]
+        
+        # 与 smart_import --mode upsert 提交的行一致：表格里的证书信息推导出二级、无社保、2万
+        talent_data, _ = build_talent_data(("增量导入测试", "", phone, "二建机电 挂了2w 无社保", "表格备注"), mode="upsert")
+        response = session.post(f"{API_BASE_URL}/talents/bulk", params={"mode": "upsert"},
+                                json={"talents": [talent_data]})
+        result = response.json()
+        talent = session.get(f"{API_BASE_URL}/talents/{talent_id}").json()
+        
+        kept = (talent["intention_level"] == "A" and float(talent["contract_price"]) == 50000
+                and talent["social_security_status"] == "唯一社保")
+        if kept and talent["wechat_note"] == "表格备注" and result["updated"] == 1:
+            print("✅ 意向等级、社保情况、价格保持手工修改的值，备注按表格更新")
+        else:
+            print(f"❌ 人才: {talent}，结果: {result}")
+        
+        session.delete(f"{API_BASE_URL}/talents/{talent_id}")
+    except Exception as e:
+        print(f"❌ 请求异常: {e}")
+
 def main():
     print("🎉 CRM系统功能测试")
     print("=" * 60)
     
     # 检查API连接
     try:
-        response = requests.get(f"{API_BASE_URL}/talents/")
+        response = session.get(f"{API_BASE_URL}/talents/")
         if response.status_code != 200:
             print("❌ API连接失败")
             return
@@ -200,6 +278,8 @@ def main():
     test_filter_by_level()
     test_filter_by_specialty()
     test_multi_specialty_filter()
+    test_bulk_upsert_keeps_unset_fields()
+    test_smart_import_upsert_keeps_manual_edits()
     
     print(f"\n🎊 测试完成！创建了 {len(created_ids)} 个测试人才")
     print("现在可以在前端界面 http://localhost:3001 查看和测试筛选功能")
@@ -5,6 +5,13 @@
 
 import requests
 import json
+import time
+
+# 所有请求复用同一个连接（keep-alive）
+session = requests.Session()
+
+# 电话号码唯一：每次运行使用不同的号码后缀，避免与上次运行留下的测试人才冲突
+RUN_SUFFIX = f"{int(time.time()) % 1000000:06d}"
 
 def test_frontend_proxy():
     """测试前端代理是否正常工作"""
@@ -17,7 +24,7 @@ def test_frontend_proxy():
     
     try:
         print("1. 测试通过前端代理获取人才列表...")
-        response = requests.get(frontend_api_url, timeout=10)
+        response = session.get(frontend_api_url, timeout=10)
         
         if response.status_code == 200:
             data = response.json()
@@ -49,11 +56,11 @@ def test_frontend_proxy():
         "name": "API测试用户",
         "certificate_level": "中级工程师",
         "certificate_specialty": "建筑工程师",
-        "phone": "13900139000"
+        "phone": f"139{RUN_SUFFIX}00"
     }
     
     try:
-        response = requests.post(frontend_api_url, json=test_data, timeout=10)
+        response = session.post(frontend_api_url, json=test_data, timeout=10)
         
         if response.status_code == 200:
             result = response.json()
@@ -78,7 +85,7 @@ def test_direct_backend():
     
     try:
         print("1. 直接访问后端API...")
-        response = requests.get(backend_api_url, timeout=5)
+        response = session.get(backend_api_url, timeout=5)
         
         if response.status_code == 200:
             data = response.json()
@@ -106,7 +113,7 @@ def test_cors_and_headers():
     
     try:
         print("1. 测试带Origin头的请求...")
-        response = requests.get("http://localhost:3001/api/talents/", headers=headers, timeout=5)
+        response = session.get("http://localhost:3001/api/talents/", headers=headers, timeout=5)
         
         if response.status_code == 200:
             print("   ✅ CORS正常")
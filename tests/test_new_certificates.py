@@ -8,6 +8,9 @@ import json
 
 API_BASE_URL = "http://localhost:8000/api"
 
+# 所有请求复用同一个连接（keep-alive）
+session = requests.Session()
+
 def test_certificate_recognition():
     """测试证书识别功能"""
     
@@ -79,7 +82,7 @@ def test_certificate_recognition():
         
         try:
             # 发送API请求
-            response = requests.post(f"{API_BASE_URL}/talents/", json=talent_data)
+            response = session.post(f"{API_BASE_URL}/talents/", json=talent_data)
             
             if response.status_code == 200:
                 result = response.json()
@@ -119,7 +122,7 @@ def test_multi_specialty_filter():
     
     # 测试单专业筛选
     print("\n1. 测试单专业筛选 (建筑工程):")
-    response = requests.get(f"{API_BASE_URL}/talents/?certificate_specialty=建筑工程")
+    response = session.get(f"{API_BASE_URL}/talents/?certificate_specialty=建筑工程")
     if response.status_code == 200:
         data = response.json()
         count = len(data.get('talents', []))
@@ -127,7 +130,7 @@ def test_multi_specialty_filter():
     
     # 测试多专业筛选
     print("\n2. 测试多专业筛选 (建筑工程,机电工程):")
-    response = requests.get(f"{API_BASE_URL}/talents/?certificate_specialty=建筑工程,机电工程")
+    response = session.get(f"{API_BASE_URL}/talents/?certificate_specialty=建筑工程,机电工程")
     if response.status_code == 200:
         data = response.json()
         count = len(data.get('talents', []))
@@ -151,7 +154,7 @@ def test_new_certificate_levels():
     ]
     
     for level in levels_to_test:
-        response = requests.get(f"{API_BASE_URL}/talents/?certificate_level={level}")
+        response = session.get(f"{API_BASE_URL}/talents/?certificate_level={level}")
         if response.status_code == 200:
             data = response.json()
             count = len(data.get('talents', []))
@@ -159,10 +162,36 @@ def test_new_certificate_levels():
         else:
             print(f"{level}: API请求失败")
 
+def test_price_extraction():
+    """测试合同价格提取，电话号码不能被当作价格"""
+    print("\n💰 测试合同价格提取")
+    print("=" * 60)
+    
+    test_cases = [
+        ("二建市政，挂了2w，唯一社保", 20000),
+        ("一建建筑 报价3.5", 35000),
+        ("中级工程师（结构），报价 12000 一年", 12000),
+        ("二级建造师 公路工程，暂无报价，微信 wx13912345678", None),
+        ("价格 待定 电话13812345678", None),
+        ("报价待定 13912345678 挂了2w", 20000),
+    ]
+    
+    response = session.post(f"{API_BASE_URL}/talents/classify", json={"texts": [text for text, _ in test_cases]})
+    if response.status_code != 200:
+        print(f"❌ 分类接口请求失败: {response.status_code}")
+        return
+    
+    for (text, expected), result in zip(test_cases, response.json()["results"]):
+        price = result["contract_price"]
+        if price == expected:
+            print(f"✅ {text}: {price}")
+        else:
+            print(f"❌ {text}: 期望 {expected}，实际 {price}")
+
 if __name__ == "__main__":
     # 检查API连接
     try:
-        response = requests.get(f"{API_BASE_URL}/talents/")
+        response = session.get(f"{API_BASE_URL}/talents/")
         if response.status_code != 200:
             print("❌ API连接失败")
             exit(1)
@@ -175,5 +204,6 @@ if __name__ == "__main__":
     test_certificate_recognition()
     test_multi_specialty_filter()
     test_new_certificate_levels()
+    test_price_extraction()
     
     print("\n🎉 测试完成！")
@@ -4,17 +4,53 @@
 """
 
 import requests
-import pandas as pd
+
+from spreadsheet import iter_rows, cell_text
+from api_client import ApiClient, batched
+
+API_BASE_URL = "http://localhost:8000/api"
+
+# 每次分类请求的文本数，多批通过共享连接池并发提交
+CLASSIFY_BATCH_SIZE = 5000
+
+api = ApiClient(API_BASE_URL)
+
+def _classify_batch(texts):
+    response = api.post("talents/classify", json={"texts": texts})
+    response.raise_for_status()
+    return response.json()["results"]
+
+def classify_texts(texts):
+    """调用批量分类接口分类全部文本，结果与输入顺序一致"""
+    results = []
+    for batch_results in api.map(_classify_batch, batched(texts, CLASSIFY_BATCH_SIZE)):
+        results.extend(batch_results)
+    return results
+
+def fetch_all_talents():
+    """按游标分页取出全部人才"""
+    talents = []
+    params = {"limit": 1000}
+    while True:
+        response = api.get("talents/", params=params)
+        response.raise_for_status()
+        page = response.json()
+        talents.extend(page.get('talents', []))
+        if not page.get('next_cursor'):
+            return talents
+        params["cursor"] = page["next_cursor"]
 
 def analyze_current_data():
     """分析当前数据库中的证书信息"""
-    response = requests.get('http://localhost:8000/api/talents/')
-    if response.status_code != 200:
-        print("❌ 无法获取数据")
+    try:
+        talents = fetch_all_talents()
+        results = classify_texts(
+            talent.get('communication_content') or talent.get('wechat_note') or '' for talent in talents
+        )
+    except requests.RequestException as e:
+        print(f"❌ 无法获取数据: {e}")
         return
-    
-    talents = response.json().get('talents', [])
-    
+
     print("📋 证书信息详细分析")
     print("=" * 80)
     
@@ -22,8 +58,11 @@ def analyze_current_data():
     classified = []
     unclassified = []
     
-    for talent in talents:
-        cert_info = talent.get('certificate_info', '')
+    for talent, result in zip(talents, results):
+        # 人才表不保存证书等级和专业，按分类结果补充；社保情况以已录入的为准
+        talent['certificate_level'] = result['certificate_level']
+        talent['certificate_specialty'] = result['certificate_specialty']
+        talent['social_security_status'] = talent.get('social_security_status') or result['social_security_status']
         level = talent.get('certificate_level')
         specialty = talent.get('certificate_specialty')
         social = talent.get('social_security_status')
@@ -58,53 +97,50 @@ def analyze_current_data():
         print(f"   原文: {cert_info}")
         print()
 
-def analyze_excel_data():
-    """分析Excel原始数据"""
+# 关键词频率统计使用的关键词
+LEVEL_KEYWORDS = ['一建', '一级建造师', '二建', '二级建造师', '考一建', '备考一建']
+SPECIALTY_KEYWORDS = ['房建', '建筑', '市政', '机电', '公路', '水利', '矿业']
+SOCIAL_KEYWORDS = ['社保', '不配合', '无社保', '唯一社保']
+
+def analyze_excel_data(file_path='意向客户表.xlsx'):
+    """分析Excel原始数据（流式读取，只保留不同的证书信息和关键词计数）"""
     try:
-        df = pd.read_excel('意向客户表.xlsx')
+        # 分析证书信息列（第4列），第一行为标题行
+        unique_certs = {}
+        keyword_counts = dict.fromkeys(LEVEL_KEYWORDS + SPECIALTY_KEYWORDS + SOCIAL_KEYWORDS, 0)
+        for row in iter_rows(file_path, skip_rows=1):
+            cert = cell_text(row[3]) if len(row) > 3 and row[3] is not None else None
+            if cert is None:
+                continue
+            unique_certs[cert] = None
+            for keyword in keyword_counts:
+                keyword_counts[keyword] += cert.count(keyword)
+        unique_certs = list(unique_certs)
+
         print("\n📊 Excel原始数据分析")
         print("=" * 80)
         
-        # 分析证书信息列
-        cert_column = df.iloc[:, 3] if len(df.columns) > 3 else None
-        if cert_column is not None:
+        if unique_certs:
             print("🔍 证书信息样本:")
             print("-" * 40)
             
-            unique_certs = cert_column.dropna().unique()
             for i, cert in enumerate(unique_certs[:15]):
                 print(f"{i+1}. {cert}")
             
             print(f"\n总共 {len(unique_certs)} 种不同的证书信息")
+
+            # 批量分类全部不同的证书信息，统计识别覆盖率
+            results = classify_texts(unique_certs)
+            unrecognized = [cert for cert, result in zip(unique_certs, results)
+                            if not (result['certificate_level'] or result['certificate_specialty'])]
+            print(f"分类识别: {len(unique_certs) - len(unrecognized)} 种可识别等级或专业，{len(unrecognized)} 种无法识别")
+            for cert in unrecognized[:15]:
+                print(f"  ❓ {cert}")
             
             # 关键词分析
-            all_text = ' '.join(cert_column.dropna().astype(str))
-            
-            level_keywords = {
-                '一建': all_text.count('一建'),
-                '一级建造师': all_text.count('一级建造师'),
-                '二建': all_text.count('二建'),
-                '二级建造师': all_text.count('二级建造师'),
-                '考一建': all_text.count('考一建'),
-                '备考一建': all_text.count('备考一建')
-            }
-            
-            specialty_keywords = {
-                '房建': all_text.count('房建'),
-                '建筑': all_text.count('建筑'),
-                '市政': all_text.count('市政'),
-                '机电': all_text.count('机电'),
-                '公路': all_text.count('公路'),
-                '水利': all_text.count('水利'),
-                '矿业': all_text.count('矿业')
-            }
-            
-            social_keywords = {
-                '社保': all_text.count('社保'),
-                '不配合': all_text.count('不配合'),
-                '无社保': all_text.count('无社保'),
-                '唯一社保': all_text.count('唯一社保')
-            }
+            level_keywords = {keyword: keyword_counts[keyword] for keyword in LEVEL_KEYWORDS}
+            specialty_keywords = {keyword: keyword_counts[keyword] for keyword in SPECIALTY_KEYWORDS}
+            social_keywords = {keyword: keyword_counts[keyword] for keyword in SOCIAL_KEYWORDS}
             
             print("\n📈 关键词频率统计:")
             print("等级关键词:")
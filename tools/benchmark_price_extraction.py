@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+合同价格提取的微基准测试
+对比三种实现：
+  legacy       - 旧实现：逐个 re.search 六个模式，单位看全文是否出现 w/万
+  alternation  - 所有规则合并为一个带命名分组的正则，finditer 后按规则优先级取匹配
+  classifier   - 当前共用分类器（backend/app/core/classifier.py）：预编译的按序模式，金额与单位取自同一次匹配
+语料优先使用 Excel 中的证书信息和备注列，没有 Excel 时使用内置样例
+"""
+
+import argparse
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+from app.core.classifier import default_classifier, PRICE_PATTERNS, PRICE_UNITS, WAN_AMOUNT_THRESHOLD
+
+from spreadsheet import iter_rows, cell_text
+
+LEGACY_PATTERNS = [
+    r'挂了(\d+\.?\d*)[万w]',
+    r'挂.*?(\d+\.?\d*)[万w]',
+    r'报价.*?(\d+\.?\d*)[万w]?',
+    r'价格.*?(\d+\.?\d*)[万w]?',
+    r'(\d+\.?\d*)[万w]',
+    r'(\d+\.?\d*)w',
+    r'当时挂了(\d+\.?\d*)[万w]',
+]
+
+SAMPLE_NOTES = [
+    "二建市政，挂了2w，唯一社保",
+    "一建建筑 报价3.5",
+    "备考一建，目前二建机电，沟通内容：对方表示社保不配合，价格3.5w，考虑中",
+    "高级工程师 给排水 电话13800138001 微信同号",
+    "三类人员C类 安全员 c3 当时挂了1.8万 明年到期",
+    "中级工程师（结构），报价 12000 一年，社保在云南，不配合转出",
+    "二级建造师 公路工程 2025年9月到期，暂无报价，微信 wx13912345678",
+    "一建机电+市政 双专业 去年挂了4.5w，今年想涨到5w，需要唯一社保",
+    "项目经理 b类 无社保 待沟通",
+    "王工 13800001111 13900002222 备用号码 15000003333",
+]
+
+def legacy_price(text):
+    for pattern in LEGACY_PATTERNS:
+        match = re.search(pattern, text)
+        if match:
+            price = float(match.group(1))
+            if 'w' in text.lower() or '万' in text or price < 100:
+                price = price * 10000
+            return price
+    return None
+
+ALTERNATION = re.compile("|".join(
+    pattern.replace("(?P<amount>", f"(?P<amount{i}>").replace("(?P<unit>", f"(?P<unit{i}>")
+    for i, pattern in enumerate(PRICE_PATTERNS)
+))
+GROUP_RULES = {f"{kind}{i}": i for i in range(len(PRICE_PATTERNS)) for kind in ("amount", "unit")}
+
+def alternation_price(text):
+    best_rule = best_match = None
+    for match in ALTERNATION.finditer(text):
+        rule = GROUP_RULES[match.lastgroup]
+        if best_rule is None or rule < best_rule:
+            best_rule, best_match = rule, match
+            if rule == 0:
+                break
+    if best_match is None:
+        return None
+    amount = float(best_match.group(f"amount{best_rule}"))
+    unit = best_match.group(f"unit{best_rule}")
+    if unit:
+        return amount * PRICE_UNITS[unit]
+    return amount * 10000 if amount < WAN_AMOUNT_THRESHOLD else amount
+
+def load_corpus(excel_path):
+    """流式读取 Excel 第 4、5 列（证书信息、备注）作为语料，读取方式与导入工具相同"""
+    if not excel_path or not os.path.exists(excel_path):
+        return SAMPLE_NOTES
+    notes = []
+    for row in iter_rows(excel_path):
+        text = " | ".join(part for part in (cell_text(value) for value in row[3:5]) if part)
+        if text:
+            notes.append(text)
+    return notes or SAMPLE_NOTES
+
+def main():
+    parser = argparse.ArgumentParser(description="合同价格提取微基准测试")
+    parser.add_argument("--excel", default="意向客户表.xlsx", help="语料 Excel 文件（不存在时使用内置样例）")
+    parser.add_argument("--repeat", type=int, default=5, help="重复测量次数，取最快一次")
+    parser.add_argument("--scale", type=int, default=1, help="把每条笔记重复拼接的次数，模拟长沟通记录")
+    args = parser.parse_args()
+
+    corpus = [" ".join([note] * args.scale) for note in load_corpus(args.excel)]
+    total_chars = sum(len(note) for note in corpus)
+    print(f"语料: {len(corpus)} 条，平均 {total_chars / len(corpus):.0f} 字")
+
+    implementations = [
+        ("legacy", legacy_price),
+        ("alternation", alternation_price),
+        ("classifier", default_classifier.price),
+    ]
+    number = max(1, 20000 // len(corpus))
+    baseline = None
+    for name, func in implementations:
+        seconds = min(timeit.repeat(lambda: [func(note) for note in corpus], number=number, repeat=args.repeat))
+        per_note_us = seconds / (number * len(corpus)) * 1e6
+        baseline = baseline or per_note_us
+        print(f"{name:<12} {per_note_us:8.2f} µs/条  {baseline / per_note_us:5.2f}x")
+
+    # 新旧实现结果不同的样例（旧实现按全文是否出现 w/万 判断单位）
+    differences = [(note, legacy_price(note), default_classifier.price(note)) for note in corpus
+                   if legacy_price(note) != default_classifier.price(note)]
+    mismatched = sum(alternation_price(note) != default_classifier.price(note) for note in corpus)
+    print(f"\nalternation 与 classifier 结果不同: {mismatched} 条")
+    print(f"legacy 与 classifier 结果不同: {len(differences)} 条")
+    for note, old, new in differences[:10]:
+        print(f"  {note[:60]}\n    legacy={old} classifier={new}")
+
+if __name__ == "__main__":
+    main()
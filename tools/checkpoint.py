@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+导入断点 - 导入工具共用
+
+断点文件为 JSON，记录源文件 sha256、导入方式、已提交的数据行数和累计成功/失败数，
+每批提交成功后更新一次。写入时先写临时文件再 os.replace 替换，进程中途退出也不会留下不完整的断点文件。
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+
+def file_sha256(file_path):
+    """计算文件 sha256，用于确认继续导入的是同一个文件"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def default_checkpoint_path(file_path):
+    """默认断点文件与源文件放在一起：意向客户表.xlsx -> 意向客户表.xlsx.checkpoint.json"""
+    return f"{file_path}.checkpoint.json"
+
+def load_checkpoint(path):
+    """读取断点，不存在时返回 None"""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def save_checkpoint(path, state):
+    """原子写入断点"""
+    state["updated_at"] = datetime.now().isoformat(timespec="seconds")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def remove_checkpoint(path):
+    """导入完成后删除断点"""
+    if os.path.exists(path):
+        os.remove(path)
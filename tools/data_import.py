@@ -4,106 +4,68 @@
 数据导入脚本 - 从Excel文件导入数据到CRM系统
 """
 
-import pandas as pd
-import requests
 import json
 from datetime import datetime
+from itertools import chain, islice
 import sys
 import os
 
+# 与后端共用证书分类规则
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+from app.core.classifier import classify_text
+
+from spreadsheet import iter_rows, cell_text
+from api_client import ApiClient, batched
+
 # API配置
 API_BASE_URL = "http://localhost:8000/api"
-TALENTS_API = f"{API_BASE_URL}/talents/"
-COMPANIES_API = f"{API_BASE_URL}/companies/"
+TALENTS_API = "talents/"
+TALENTS_BULK_API = "talents/bulk"
+COMPANIES_API = "companies/"
+
+# 共享连接池的API客户端，并发请求数由环境变量 CRM_API_CONCURRENCY 调整
+api = ApiClient(API_BASE_URL)
+
+# 每次批量新增的人才数
+BULK_BATCH_SIZE = 1000
 
 def read_excel_file(file_path):
-    """读取Excel文件"""
+    """流式读取Excel文件（不使用第一行作为列名），返回 (列名, 行迭代器)"""
     try:
-        # 读取Excel文件，不使用第一行作为列名
-        df = pd.read_excel(file_path, header=None)
+        rows = iter_rows(file_path)
+
+        # 预读前5行用于确定列数和预览，之后与剩余行拼接，其余行按需解析
+        preview = list(islice(rows, 5))
+        column_count = max((len(row) for row in preview), default=0)
 
         # 根据数据结构设置列名
-        if len(df.columns) >= 4:
-            df.columns = ['姓名', '身份证', '电话', '证书信息', '备注'][:len(df.columns)]
+        if column_count >= 4:
+            columns = ['姓名', '身份证', '电话', '证书信息', '备注'][:column_count]
         else:
             # 如果列数不够，使用通用列名
-            df.columns = [f'列{i+1}' for i in range(len(df.columns))]
+            columns = [f'列{i+1}' for i in range(column_count)]
 
-        print(f"成功读取Excel文件，共 {len(df)} 行数据")
-        print("列名:", df.columns.tolist())
+        print("成功打开Excel文件")
+        print("列名:", columns)
         print("\n前5行数据预览:")
-        print(df.head())
-        return df
+        for row in preview:
+            print(row[:len(columns)])
+        return columns, chain(preview, rows)
     except Exception as e:
         print(f"读取Excel文件失败: {e}")
         return None
 
-def clean_data(df):
-    """清理数据"""
-    # 填充空值
-    df = df.fillna('')
-    
-    # 转换数据类型
-    for col in df.columns:
-        if df[col].dtype == 'object':
-            df[col] = df[col].astype(str).str.strip()
-    
-    return df
+def clean_data(row):
+    """清理一行数据：空值转为空字符串，去除首尾空白"""
+    return tuple(cell_text(value) for value in row)
 
 def extract_certificate_info(cert_text):
     """从证书信息中提取等级和专业"""
     if not cert_text:
         return None, None
 
-    cert_text = str(cert_text).strip()
-
-    # 提取证书等级
-    certificate_level = None
-    if "一建" in cert_text or "一级建造师" in cert_text:
-        certificate_level = "一级"
-    elif "二建" in cert_text or "二级建造师" in cert_text:
-        certificate_level = "二级"
-    else:
-        certificate_level = "其他"
-
-    # 提取证书专业
-    certificate_specialty = None
-    specialty_mapping = {
-        "房建": "建筑工程",
-        "建筑": "建筑工程",
-        "建筑工程": "建筑工程",
-        "市政": "市政公用工程",
-        "市政公用工程": "市政公用工程",
-        "机电": "机电工程",
-        "机电工程": "机电工程",
-        "公路": "公路工程",
-        "公路工程": "公路工程",
-        "水利": "水利水电工程",
-        "水利水电": "水利水电工程",
-        "水利水电工程": "水利水电工程",
-        "矿业": "矿业工程",
-        "矿业工程": "矿业工程",
-        "铁路": "铁路工程",
-        "铁路工程": "铁路工程",
-        "民航": "民航机场工程",
-        "民航机场": "民航机场工程",
-        "民航机场工程": "民航机场工程",
-        "港口": "港口与航道工程",
-        "航道": "港口与航道工程",
-        "港口与航道": "港口与航道工程",
-        "港口与航道工程": "港口与航道工程",
-        "通信": "通信与广电工程",
-        "广电": "通信与广电工程",
-        "通信与广电": "通信与广电工程",
-        "通信与广电工程": "通信与广电工程"
-    }
-
-    for keyword, specialty in specialty_mapping.items():
-        if keyword in cert_text:
-            certificate_specialty = specialty
-            break
-
-    return certificate_level, certificate_specialty
+    result = classify_text(cert_text)
+    return result.certificate_level, result.certificate_specialty
 
 def map_excel_to_talent(row):
     """将Excel行数据映射到人才数据结构"""
@@ -123,17 +85,14 @@ def map_excel_to_talent(row):
         "social_security_status": None
     }
     
-    # 根据Excel列名映射数据
-    columns = row.index.tolist()
-
-    # 直接按列位置映射数据（基于观察到的数据结构）
-    if len(columns) >= 1 and pd.notna(row.iloc[0]):
-        talent_data["name"] = str(row.iloc[0]).strip()
+    # 直接按列位置映射数据（基于观察到的数据结构），row 为 clean_data 清理后的行
+    if len(row) >= 1:
+        talent_data["name"] = row[0]
 
-    if len(columns) >= 3 and pd.notna(row.iloc[2]):
+    if len(row) >= 3:
         # 电话号码处理
-        phone_str = str(row.iloc[2]).strip()
-        if phone_str and phone_str != 'nan':
+        phone_str = row[2]
+        if phone_str:
             # 处理科学计数法格式的电话号码
             try:
                 if 'e+' in phone_str.lower():
@@ -144,10 +103,10 @@ def map_excel_to_talent(row):
             except:
                 talent_data["phone"] = phone_str
 
-    if len(columns) >= 4 and pd.notna(row.iloc[3]):
+    if len(row) >= 4:
         # 证书信息和备注
-        cert_info = str(row.iloc[3]).strip()
-        if cert_info and cert_info != 'nan':
+        cert_info = row[3]
+        if cert_info:
             talent_data["certificate_info"] = cert_info
             # 提取证书等级和专业
             cert_level, cert_specialty = extract_certificate_info(cert_info)
@@ -156,10 +115,10 @@ def map_excel_to_talent(row):
             if cert_specialty:
                 talent_data["certificate_specialty"] = cert_specialty
 
-    if len(columns) >= 5 and pd.notna(row.iloc[4]):
+    if len(row) >= 5:
         # 备注信息
-        note_info = str(row.iloc[4]).strip()
-        if note_info and note_info != 'nan':
+        note_info = row[4]
+        if note_info:
             if talent_data["certificate_info"]:
                 talent_data["certificate_info"] += " | " + note_info
             else:
@@ -175,7 +134,7 @@ def map_excel_to_talent(row):
     
     return talent_data
 
-def map_excel_to_company(row):
+def map_excel_to_company(row, columns):
     """将Excel行数据映射到公司数据结构"""
     company_data = {
         "name": "",
@@ -188,18 +147,18 @@ def map_excel_to_company(row):
     }
     
     # 根据Excel列名映射数据
-    columns = row.index.tolist()
+    row = dict(zip(columns, row))
     
     for col in columns:
         col_lower = col.lower()
         if '公司' in col or 'company' in col_lower or '企业' in col:
-            company_data["name"] = str(row[col]) if pd.notna(row[col]) else ""
+            company_data["name"] = row.get(col, '')
         elif '联系' in col or 'contact' in col_lower:
-            company_data["contact_info"] = str(row[col]) if pd.notna(row[col]) else None
+            company_data["contact_info"] = row.get(col, '')
         elif '意向' in col and '等级' not in col:
-            company_data["intention"] = str(row[col]) if pd.notna(row[col]) else None
+            company_data["intention"] = row.get(col, '')
         elif '意向等级' in col or 'intention_level' in col_lower:
-            intention_str = str(row[col]).upper()
+            intention_str = row.get(col, '').upper()
             if 'A' in intention_str or '高' in intention_str:
                 company_data["intention_level"] = "A"
             elif 'B' in intention_str or '中' in intention_str:
@@ -207,31 +166,55 @@ def map_excel_to_company(row):
             else:
                 company_data["intention_level"] = "C"
         elif '价格' in col or 'price' in col_lower:
-            company_data["price"] = str(row[col]) if pd.notna(row[col]) else None
+            company_data["price"] = row.get(col, '')
         elif '证书需求' in col or 'certificate' in col_lower:
-            company_data["certificate_requirements"] = str(row[col]) if pd.notna(row[col]) else None
+            company_data["certificate_requirements"] = row.get(col, '')
         elif '备注' in col or 'note' in col_lower:
-            company_data["communication_notes"] = str(row[col]) if pd.notna(row[col]) else None
+            company_data["communication_notes"] = row.get(col, '')
     
     return company_data
 
-def create_talent(talent_data):
-    """创建人才记录"""
+def _post_talents_bulk(talents):
+    """提交一批人才，返回 TalentBulkResult；整批请求失败（连接失败、非 200）时抛出 RuntimeError"""
     try:
-        response = requests.post(TALENTS_API, json=talent_data)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            print(f"创建人才失败: {response.status_code} - {response.text}")
-            return None
+        response = api.post(TALENTS_BULK_API, json={"talents": talents})
     except Exception as e:
-        print(f"创建人才异常: {e}")
-        return None
+        raise RuntimeError(e) from e
+    if response.status_code != 200:
+        raise RuntimeError(f"{response.status_code} - {response.text}")
+    return response.json()
+
+def create_talents_bulk(talents):
+    """批量创建人才记录，返回 (成功数, 失败数)
+
+    整批请求失败时逐条重新提交，只把真正失败的行计入失败数
+    """
+    try:
+        result = _post_talents_bulk(talents)
+    except RuntimeError as e:
+        print(f"批量创建人才失败，逐条重试 {len(talents)} 条: {e}")
+        created = 0
+        for talent in talents:
+            try:
+                row_result = _post_talents_bulk([talent])
+            except RuntimeError as row_error:
+                print(f"✗ 创建人才失败: {talent['name']} - {row_error}")
+                continue
+            for error in row_result["errors"]:
+                print(f"✗ 创建人才失败: {talent['name']} - {'; '.join(error['errors'])}")
+            created += row_result["created"]
+        print(f"✓ 逐条重试成功创建人才 {created} 条")
+        return created, len(talents) - created
+
+    for error in result["errors"]:
+        print(f"✗ 创建人才失败: {talents[error['index']]['name']} - {'; '.join(error['errors'])}")
+    print(f"✓ 成功创建人才 {result['created']} 条")
+    return result["created"], len(result["errors"])
 
 def create_company(company_data):
     """创建公司记录"""
     try:
-        response = requests.post(COMPANIES_API, json=company_data)
+        response = api.post(COMPANIES_API, json=company_data)
         if response.status_code == 200:
             return response.json()
         else:
@@ -241,64 +224,69 @@ def create_company(company_data):
         print(f"创建公司异常: {e}")
         return None
 
-def import_data(file_path, data_type="talent"):
-    """导入数据主函数"""
-    # 读取Excel文件
-    df = read_excel_file(file_path)
-    if df is None:
-        return
-    
-    # 清理数据
-    df = clean_data(df)
-    
-    success_count = 0
-    error_count = 0
-    
-    print(f"\n开始导入 {data_type} 数据...")
-    
-    for index, row in df.iterrows():
+def import_company(company_data):
+    """创建一条公司记录并输出结果，返回是否成功"""
+    if create_company(company_data):
+        print(f"✓ 成功创建公司: {company_data['name']}")
+        return True
+    print(f"✗ 创建公司失败: {company_data['name']}")
+    return False
+
+def iter_mapped_rows(rows, columns, data_type, counts):
+    """逐行清理并映射数据，跳过无名称或处理出错的行（计入失败数）"""
+    for index, row in enumerate(rows):
         try:
+            # 清理数据
+            row = clean_data(row)
+
             if data_type == "talent":
                 mapped_data = map_excel_to_talent(row)
-                if mapped_data["name"]:  # 确保有姓名
-                    result = create_talent(mapped_data)
-                    if result:
-                        success_count += 1
-                        print(f"✓ 成功创建人才: {mapped_data['name']}")
-                    else:
-                        error_count += 1
-                        print(f"✗ 创建人才失败: {mapped_data['name']}")
-                else:
-                    error_count += 1
-                    print(f"✗ 跳过无姓名记录: 行 {index + 1}")
-            
-            elif data_type == "company":
-                mapped_data = map_excel_to_company(row)
-                if mapped_data["name"]:  # 确保有公司名
-                    result = create_company(mapped_data)
-                    if result:
-                        success_count += 1
-                        print(f"✓ 成功创建公司: {mapped_data['name']}")
-                    else:
-                        error_count += 1
-                        print(f"✗ 创建公司失败: {mapped_data['name']}")
-                else:
-                    error_count += 1
-                    print(f"✗ 跳过无公司名记录: 行 {index + 1}")
-        
+                label = "姓名"
+            else:
+                mapped_data = map_excel_to_company(row, columns)
+                label = "公司名"
+
+            if mapped_data["name"]:  # 确保有名称
+                yield mapped_data
+            else:
+                counts["error"] += 1
+                print(f"✗ 跳过无{label}记录: 行 {index + 1}")
+
         except Exception as e:
-            error_count += 1
+            counts["error"] += 1
             print(f"✗ 处理第 {index + 1} 行数据时出错: {e}")
-    
+
+def import_data(file_path, data_type="talent"):
+    """导入数据主函数：人才按批、公司逐条，通过共享连接池并发提交"""
+    # 流式读取Excel文件
+    result = read_excel_file(file_path)
+    if result is None:
+        return
+    columns, rows = result
+
+    counts = {"success": 0, "error": 0}
+    records = iter_mapped_rows(rows, columns, data_type, counts)
+
+    print(f"\n开始导入 {data_type} 数据（并发 {api.concurrency}）...")
+
+    if data_type == "talent":
+        # 攒够一批后批量创建，多批同时提交
+        for created, failed in api.map(create_talents_bulk, batched(records, BULK_BATCH_SIZE)):
+            counts["success"] += created
+            counts["error"] += failed
+    elif data_type == "company":
+        for ok in api.map(import_company, records):
+            counts["success" if ok else "error"] += 1
+
     print(f"\n导入完成!")
-    print(f"成功: {success_count} 条")
-    print(f"失败: {error_count} 条")
-    print(f"总计: {success_count + error_count} 条")
+    print(f"成功: {counts['success']} 条")
+    print(f"失败: {counts['error']} 条")
+    print(f"总计: {counts['success'] + counts['error']} 条")
 
 def check_api_connection():
     """检查API连接"""
     try:
-        response = requests.get(f"{API_BASE_URL}/talents/")
+        response = api.get(TALENTS_API, params={"limit": 1})
         if response.status_code == 200:
             print("✓ API连接正常")
             return True
@@ -311,7 +299,7 @@ def check_api_connection():
 
 if __name__ == "__main__":
     # 检查文件是否存在
-    excel_file = "意向客户表.xlsx"
+    excel_file = sys.argv[1] if len(sys.argv) > 1 else "意向客户表.xlsx"
     if not os.path.exists(excel_file):
         print(f"错误: 找不到文件 {excel_file}")
         sys.exit(1)
@@ -335,8 +323,7 @@ if __name__ == "__main__":
 
     if choice == "3":
         # 预览数据
-        df = read_excel_file(excel_file)
-        if df is not None:
+        if read_excel_file(excel_file) is not None:
             print("\n数据预览完成，请根据列名选择合适的导入类型")
     elif choice == "1":
         import_data(excel_file, "talent")
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+导入流水线 - 读取、分类、写入三个阶段并行
+
+读取线程按批读取数据放入有界队列，主线程把每批提交到进程池分类（利用全部 CPU 核），
+按提交顺序取回结果放入第二个有界队列，写入线程逐批写入。队列满时上游阻塞（背压），
+内存中最多只有几批数据；任一阶段出错时其余阶段停止，异常在 run_pipeline 中重新抛出。
+"""
+
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+_DONE = object()
+
+class StageStats:
+    """单个阶段的处理行数和耗时"""
+
+    def __init__(self, name, parallelism=1):
+        self.name = name
+        self.parallelism = parallelism
+        self.rows = 0
+        self.seconds = 0.0
+
+    def add(self, rows, seconds):
+        self.rows += rows
+        self.seconds += seconds
+
+    @property
+    def rows_per_second(self):
+        """阶段处理能力：行数 / 阶段实际工作时间（进程池按并行度折算）"""
+        busy = self.seconds / self.parallelism
+        return self.rows / busy if busy > 0 else 0.0
+
+def _put(q, item, stop):
+    """放入队列，队列满时等待；流水线已停止时放弃并返回 False"""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def _get(q, stop):
+    """从队列取出一项，流水线已停止时返回 _DONE"""
+    while not stop.is_set():
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    return _DONE
+
+def _timed(transform, chunk):
+    start = time.perf_counter()
+    result = transform(chunk)
+    return result, time.perf_counter() - start
+
+def run_pipeline(chunks, transform, write, workers=None, queue_size=4):
+    """运行导入流水线，返回各阶段的 StageStats 列表（读取、分类、写入）
+
+    chunks: 按批产出数据的可迭代对象（每批为列表），在读取线程中迭代
+    transform: 分类函数，参数为一批数据，在子进程中执行，必须是模块级函数（可被 pickle）
+    write: 写入函数，参数为 transform 的结果，在写入线程中按读取顺序调用
+    workers: 分类进程数，默认为 CPU 核数
+    queue_size: 两个队列各自最多缓存的批数
+    """
+    workers = workers or os.cpu_count() or 1
+    read_queue = queue.Queue(maxsize=queue_size)
+    write_queue = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    errors = []
+    read_stats = StageStats("读取")
+    classify_stats = StageStats("分类", parallelism=workers)
+    write_stats = StageStats("写入")
+
+    def reader():
+        try:
+            iterator = iter(chunks)
+            while True:
+                start = time.perf_counter()
+                chunk = next(iterator, None)
+                if chunk is None:
+                    break
+                read_stats.add(len(chunk), time.perf_counter() - start)
+                if not _put(read_queue, chunk, stop):
+                    return
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            _put(read_queue, _DONE, stop)
+
+    def writer():
+        try:
+            while True:
+                item = _get(write_queue, stop)
+                if item is _DONE:
+                    return
+                rows, result = item
+                start = time.perf_counter()
+                write(result)
+                write_stats.add(rows, time.perf_counter() - start)
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+
+    def collect(pending):
+        rows, future = pending.popleft()
+        result, seconds = future.result()
+        classify_stats.add(rows, seconds)
+        return _put(write_queue, (rows, result), stop)
+
+    threads = [threading.Thread(target=reader, daemon=True), threading.Thread(target=writer, daemon=True)]
+    for thread in threads:
+        thread.start()
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # 按提交顺序取回结果，保证写入顺序与读取顺序一致；在途批数有上限，避免结果堆积
+            pending = deque()
+            while True:
+                chunk = _get(read_queue, stop)
+                if chunk is _DONE:
+                    break
+                pending.append((len(chunk), executor.submit(_timed, transform, chunk)))
+                if len(pending) >= workers * 2 and not collect(pending):
+                    break
+            while pending and not stop.is_set():
+                collect(pending)
+    except BaseException:
+        stop.set()
+        raise
+    finally:
+        _put(write_queue, _DONE, stop)
+        for thread in threads:
+            thread.join()
+
+    if errors:
+        raise errors[0]
+    return [read_stats, classify_stats, write_stats]
+
+def print_stage_stats(stats, elapsed):
+    """输出各阶段每秒处理行数，处理能力最低的阶段即为瓶颈"""
+    total = stats[0].rows
+    print(f"⏱️  总计 {total} 行，用时 {elapsed:.1f} 秒，{total / elapsed if elapsed > 0 else 0:.0f} 行/秒")
+    for stage in stats:
+        print(f"   {stage.name}: {stage.rows} 行，{stage.rows_per_second:.0f} 行/秒")
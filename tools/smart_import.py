@@ -3,126 +3,43 @@
 智能数据导入脚本 - 分析证书信息并自动分类
 """
 
-import pandas as pd
-import requests
+import argparse
 import re
 import json
+import os
+import sys
+import time
 from datetime import datetime
+from functools import partial
 
-API_BASE_URL = "http://localhost:8000/api"
+# 与后端共用证书分类规则
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+from app.core.classifier import default_classifier as classifier, classify_text
 
-def extract_certificate_level(text):
-    """提取证书等级"""
-    if not text:
-        return None
-    text = str(text).lower()
+from spreadsheet import iter_row_chunks, cell_text
+from pipeline import run_pipeline, print_stage_stats
+from api_client import ApiClient
+from checkpoint import file_sha256, default_checkpoint_path, load_checkpoint, save_checkpoint, remove_checkpoint
 
-    # 建造师等级
-    if any(keyword in text for keyword in ["一建", "一级建造师", "考一建", "备考一建", "增项一建"]):
-        return "一级"
-    elif any(keyword in text for keyword in ["二建", "二级建造师", "2建", "二级"]):
-        return "二级"
+API_BASE_URL = "http://localhost:8000/api"
 
-    # 工程师等级
-    elif any(keyword in text for keyword in ["高级工程师", "高工", "正高级工程师"]):
-        return "高级工程师"
-    elif any(keyword in text for keyword in ["中级工程师", "中工", "工程师"]) and "高级" not in text and "初级" not in text:
-        return "中级工程师"
-    elif any(keyword in text for keyword in ["初级工程师", "助理工程师", "技术员"]):
-        return "初级工程师"
+# 共享连接池的API客户端：连接复用，连接失败按指数退避重试
+api = ApiClient(API_BASE_URL)
 
-    # 三类人员
-    elif any(keyword in text for keyword in ["三类人员a", "a类", "企业主要负责人", "法定代表人"]):
-        return "三类人员A类"
-    elif any(keyword in text for keyword in ["三类人员b", "b类", "项目负责人", "项目经理"]):
-        return "三类人员B类"
-    elif any(keyword in text for keyword in ["三类人员c", "c类", "安全员", "专职安全", "c1", "c2", "c3"]):
-        return "三类人员C类"
+# 每批读取的行数，每批通过一次 POST /api/talents/bulk 提交（一个事务），可用 --chunk-size 调整
+BULK_BATCH_SIZE = 1000
 
-    return None
+def extract_certificate_level(text):
+    """提取证书等级"""
+    return classifier.level(text)
 
 def extract_certificate_specialty(text):
     """提取证书专业"""
-    if not text:
-        return None
-
-    text = str(text)
-
-    # 专业关键词映射，按优先级排序（长关键词优先）
-    specialty_mapping = [
-        # 建造师专业
-        ("建筑工程", "建筑工程"),
-        ("市政公用工程", "市政公用工程"),
-        ("机电工程", "机电工程"),
-        ("公路工程", "公路工程"),
-        ("水利水电工程", "水利水电工程"),
-        ("矿业工程", "矿业工程"),
-        ("铁路工程", "铁路工程"),
-        ("民航机场工程", "民航机场工程"),
-        ("港口与航道工程", "港口与航道工程"),
-        ("通信与广电工程", "通信与广电工程"),
-        # 建造师简称映射
-        ("房建", "建筑工程"),
-        ("建筑", "建筑工程"),
-        ("市政", "市政公用工程"),
-        ("机电", "机电工程"),
-        ("公路", "公路工程"),
-        ("水利水电", "水利水电工程"),
-        ("水利", "水利水电工程"),
-        ("矿业", "矿业工程"),
-        ("铁路", "铁路工程"),
-        ("民航机场", "民航机场工程"),
-        ("民航", "民航机场工程"),
-        ("港口与航道", "港口与航道工程"),
-        ("港口", "港口与航道工程"),
-        ("航道", "港口与航道工程"),
-        ("通信与广电", "通信与广电工程"),
-        ("通信", "通信与广电工程"),
-        ("广电", "通信与广电工程"),
-
-        # 工程师专业
-        ("建筑工程师", "建筑工程师"),
-        ("结构工程师", "结构工程师"),
-        ("电气工程师", "电气工程师"),
-        ("给排水工程师", "给排水工程师"),
-        ("暖通工程师", "暖通工程师"),
-        ("建筑设计工程师", "建筑设计工程师"),
-        ("工程造价工程师", "工程造价工程师"),
-        ("造价工程师", "工程造价工程师"),
-        ("测绘工程师", "测绘工程师"),
-        ("岩土工程师", "岩土工程师"),
-        ("建筑材料工程师", "建筑材料工程师"),
-
-        # 三类人员
-        ("安全员", "安全管理"),
-        ("安全管理", "安全管理"),
-        ("专职安全", "安全管理")
-    ]
-
-    # 按关键词长度排序，优先匹配长关键词
-    for keyword, specialty in specialty_mapping:
-        if keyword in text:
-            return specialty
-
-    return None
+    return classifier.specialty(text)
 
 def extract_social_security_status(text):
     """提取社保情况"""
-    if not text:
-        return None
-    text = str(text).lower()
-
-    # 检查无社保的关键词
-    no_social_keywords = ["无社保", "没有社保", "社保不配合", "不配合", "社保公积金"]
-    if any(keyword in text for keyword in no_social_keywords):
-        return "无社保"
-
-    # 检查唯一社保的关键词
-    unique_social_keywords = ["唯一社保", "独立社保", "单独社保"]
-    if any(keyword in text for keyword in unique_social_keywords):
-        return "唯一社保"
-
-    return None
+    return classifier.social_security(text)
 
 def extract_expiry_date(text):
     """提取证书到期时间"""
@@ -152,42 +69,12 @@ def extract_expiry_date(text):
 
 def extract_contract_price(text):
     """提取合同价格"""
-    if not text:
-        return None
-
-    text_str = str(text)
-
-    # 更精确的价格匹配模式
-    price_patterns = [
-        r'挂了(\d+\.?\d*)[万w]',           # 挂了2w
-        r'挂.*?(\d+\.?\d*)[万w]',          # 挂xxx2w
-        r'报价.*?(\d+\.?\d*)[万w]?',       # 报价3.5, 报价2.2
-        r'价格.*?(\d+\.?\d*)[万w]?',       # 价格2.7w
-        r'(\d+\.?\d*)[万w]',               # 直接的数字+万
-        r'(\d+\.?\d*)w',                   # 数字+w
-        r'当时挂了(\d+\.?\d*)[万w]',       # 当时挂了2w
-    ]
-
-    for pattern in price_patterns:
-        match = re.search(pattern, text_str)
-        if match:
-            try:
-                price = float(match.group(1))
-                # 判断是否需要转换单位
-                if 'w' in text_str.lower() or '万' in text_str or price < 100:
-                    price = price * 10000
-                return price
-            except:
-                continue
-    return None
+    return classifier.price(text)
 
 def format_phone_number(phone):
     """格式化电话号码"""
-    if pd.isna(phone):
-        return None
-    
-    phone_str = str(phone).strip()
-    if phone_str == 'nan' or not phone_str:
+    phone_str = cell_text(phone)
+    if not phone_str:
         return None
     
     # 处理科学计数法
@@ -206,112 +93,200 @@ def format_phone_number(phone):
     return None
 
 def clear_all_data():
-    """清空所有现有数据"""
+    """清空所有现有数据（服务端一条 TRUNCATE，需要后端开启 ALLOW_TRUNCATE）"""
     try:
-        # 获取所有人才数据
-        response = requests.get(f"{API_BASE_URL}/talents/")
+        response = api.post("talents/truncate", params={"confirm": "TRUNCATE"})
         if response.status_code == 200:
-            talents = response.json().get('talents', [])
-            print(f"找到 {len(talents)} 条人才记录，开始删除...")
-            
-            deleted_count = 0
-            for talent in talents:
-                delete_response = requests.delete(f"{API_BASE_URL}/talents/{talent['id']}")
-                if delete_response.status_code == 200:
-                    deleted_count += 1
-                    print(f"✓ 删除人才记录 {talent['name']} (ID: {talent['id']})")
-                else:
-                    print(f"✗ 删除失败: {talent['name']} (ID: {talent['id']})")
-            
-            print(f"\n✅ 成功删除 {deleted_count} 条记录")
+            print("✅ 人才、沟通记录、证书数据已清空")
             return True
+        if response.status_code == 403:
+            print("❌ 后端未开启 ALLOW_TRUNCATE，无法清空数据；可改用 --mode upsert 增量导入")
+        else:
+            print(f"❌ 清空数据失败: {response.text}")
+        return False
     except Exception as e:
         print(f"❌ 清空数据失败: {e}")
         return False
 
-def analyze_and_import_data():
-    """分析Excel数据并智能导入"""
+def import_talent_batch(batch, mode="insert"):
+    """批量导入一批人才，返回 (成功数, 失败数)；mode 为 upsert 时按电话新增或更新
+
+    整批请求失败（连接失败、非 200）时抛出 RuntimeError，这一批不会记入断点，继续导入时重新提交
+    """
+    talents = [talent_data for talent_data, _ in batch]
     try:
-        # 读取Excel文件
-        df = pd.read_excel('意向客户表.xlsx')
-        print(f"📊 读取到 {len(df)} 行数据")
-        
-        success_count = 0
-        error_count = 0
-        
-        # 处理第一行作为标题行的情况
-        first_row = df.iloc[0]
-        name = str(first_row.iloc[0]).strip() if pd.notna(first_row.iloc[0]) else ""
-        
-        if name:  # 第一行有姓名，作为数据处理
-            all_rows = df
-        else:  # 第一行可能是标题，跳过
-            all_rows = df.iloc[1:]
-        
-        for index, row in all_rows.iterrows():
-            try:
-                # 提取基础信息
-                name = str(row.iloc[0]).strip() if pd.notna(row.iloc[0]) else ""
-                if not name or name == 'nan':
-                    continue
-                
-                phone = format_phone_number(row.iloc[2]) if len(row) > 2 else None
-                cert_info = str(row.iloc[3]).strip() if len(row) > 3 and pd.notna(row.iloc[3]) else ""
-                note = str(row.iloc[4]).strip() if len(row) > 4 and pd.notna(row.iloc[4]) else ""
-                
-                # 合并证书信息和备注
-                full_info = cert_info
-                if note and note != 'nan':
-                    full_info = f"{cert_info} | {note}" if cert_info else note
-                
-                # 智能提取各字段
-                certificate_level = extract_certificate_level(full_info)
-                certificate_specialty = extract_certificate_specialty(full_info)
-                social_security_status = extract_social_security_status(full_info)
-                contract_price = extract_contract_price(full_info)
-                
-                # 构建人才数据
-                talent_data = {
-                    "name": name,
-                    "phone": phone,
-                    "certificate_info": cert_info if cert_info and cert_info != 'nan' else None,
-                    "wechat_note": note if note and note != 'nan' else None,
-                    "communication_content": full_info if full_info else None,
-                    "certificate_level": certificate_level,
-                    "certificate_specialty": certificate_specialty,
-                    "social_security_status": social_security_status,
-                    "contract_price": contract_price,
-                    "intention_level": "A" if certificate_level == "一级" else ("B" if certificate_level == "二级" else "C")
-                }
-                
-                # 发送API请求
-                response = requests.post(f"{API_BASE_URL}/talents/", json=talent_data)
-                
-                if response.status_code == 200:
-                    success_count += 1
-                    print(f"✓ {name} - 等级:{certificate_level or '未知'} 专业:{certificate_specialty or '未知'} 社保:{social_security_status or '未知'}")
-                else:
-                    error_count += 1
-                    print(f"✗ {name} - 导入失败: {response.text}")
-                    
-            except Exception as e:
-                error_count += 1
-                print(f"✗ 处理第{index}行数据失败: {e}")
-        
-        print(f"\n📈 导入完成!")
-        print(f"✅ 成功: {success_count} 条")
-        print(f"❌ 失败: {error_count} 条")
-        
+        response = api.post("talents/bulk", params={"mode": mode}, json={"talents": talents})
     except Exception as e:
-        print(f"❌ 导入过程失败: {e}")
+        raise RuntimeError(f"批量导入 {len(batch)} 条失败: {e}") from e
+
+    if response.status_code != 200:
+        raise RuntimeError(f"批量导入 {len(batch)} 条失败: {response.text}")
+
+    result = response.json()
+    for error in result["errors"]:
+        talent_data, _ = batch[error["index"]]
+        print(f"✗ {talent_data['name']} - 导入失败: {'; '.join(error['errors'])}")
+    for talent_id, (_, summary) in zip(result["ids"], batch):
+        if talent_id is not None:
+            print(summary)
+    if mode == "upsert":
+        print(f"📦 本批新增 {result['created']} 条，更新 {result['updated']} 条，未变化 {result['unchanged']} 条")
+    return result["created"] + result["updated"] + result["unchanged"], len(result["errors"])
+
+# 由分类结果推导的字段；upsert 时不提交，避免覆盖销售手工修改过的意向等级、社保情况和价格
+DERIVED_FIELDS = ("intention_level", "social_security_status", "contract_price")
+
+def build_talent_data(row, mode="insert"):
+    """由一行Excel数据（姓名、身份证、电话、证书信息、备注）构建人才数据，无姓名时返回 None
+
+    mode 为 upsert 时不包含 DERIVED_FIELDS：已有人才保留原值，新增人才的意向等级取默认值 C，
+    社保情况和价格由分类结果表提供（重新分类时补齐到人才表）
+    """
+    # 提取基础信息
+    name = cell_text(row[0]) if row else ""
+    if not name:
+        return None
+    
+    phone = format_phone_number(row[2]) if len(row) > 2 else None
+    cert_info = cell_text(row[3]) if len(row) > 3 else ""
+    note = cell_text(row[4]) if len(row) > 4 else ""
+    
+    # 合并证书信息和备注
+    full_info = cert_info
+    if note:
+        full_info = f"{cert_info} | {note}" if cert_info else note
+    
+    # 智能提取各字段
+    certificate_level, certificate_specialty, social_security_status, contract_price = \
+        classify_text(full_info)
+    
+    # 构建人才数据
+    talent_data = {
+        "name": name,
+        "phone": phone,
+        "certificate_info": cert_info or None,
+        "wechat_note": note or None,
+        "communication_content": full_info or None,
+        "certificate_level": certificate_level,
+        "certificate_specialty": certificate_specialty,
+        "social_security_status": social_security_status,
+        "contract_price": contract_price,
+        "intention_level": "A" if certificate_level == "一级" else ("B" if certificate_level == "二级" else "C")
+    }
+    if mode == "upsert":
+        for field in DERIVED_FIELDS:
+            del talent_data[field]
+    summary = f"✓ {name} - 等级:{certificate_level or '未知'} 专业:{certificate_specialty or '未知'} 社保:{social_security_status or '未知'}"
+    return talent_data, summary
+
+def numbered_row_chunks(file_path, chunk_size, start_row=0):
+    """按批读取数据行（第一行为标题行），跳过前 start_row 个数据行，每行附带在表格中的行号"""
+    row_number = 2 + start_row
+    for chunk in iter_row_chunks(file_path, chunk_size, skip_rows=1 + start_row):
+        yield list(enumerate(chunk, row_number))
+        row_number += len(chunk)
+
+def classify_chunk(chunk, mode="insert"):
+    """分类一批数据行（在分类进程中执行），返回 (待导入人才, 失败信息, 数据行数)"""
+    batch = []
+    failures = []
+    for row_number, row in chunk:
+        try:
+            talent = build_talent_data(row, mode)
+            if talent:
+                batch.append(talent)
+        except Exception as e:
+            failures.append(f"✗ 处理第{row_number}行数据失败: {e}")
+    return batch, failures, len(chunk)
+
+def new_import_state(file_path, mode, chunk_size):
+    """新导入的断点状态"""
+    return {
+        "file": os.path.abspath(file_path),
+        "sha256": file_sha256(file_path),
+        "mode": mode,
+        "chunk_size": chunk_size,
+        "rows_done": 0,
+        "success": 0,
+        "error": 0
+    }
+
+def resume_import_state(file_path, checkpoint_path):
+    """读取断点用于继续导入，断点不存在或源文件已改变时返回 None"""
+    state = load_checkpoint(checkpoint_path)
+    if state is None:
+        print(f"❌ 找不到断点文件 {checkpoint_path}")
+        return None
+    if state["sha256"] != file_sha256(file_path):
+        print("❌ 源文件内容与断点记录不一致，无法继续导入，请去掉 --resume 重新导入")
+        return None
+    return state
+
+def analyze_and_import_data(file_path, state, checkpoint_path, workers=None):
+    """流式读取Excel数据并智能导入：读取、分类（多进程）、批量写入三个阶段并行
+
+    每批 state["chunk_size"] 行通过一次批量请求提交，提交成功后把已提交行数写入断点；
+    从 state["rows_done"] 行之后开始读取，中断后用同一个断点继续导入即可跳过已提交的批次。
+    """
+    def write(classified):
+        batch, failures, rows = classified
+        for failure in failures:
+            print(failure)
+        if batch:
+            created, failed = import_talent_batch(batch, state["mode"])
+            state["success"] += created
+            state["error"] += failed
+        # 写入阶段按读取顺序执行，断点之前的批次都已提交
+        state["error"] += len(failures)
+        state["rows_done"] += rows
+        save_checkpoint(checkpoint_path, state)
+
+    if state["rows_done"]:
+        print(f"⏩ 跳过已提交的 {state['rows_done']} 行，从第 {state['rows_done'] + 2} 行继续")
+
+    try:
+        start = time.perf_counter()
+        chunks = numbered_row_chunks(file_path, state["chunk_size"], state["rows_done"])
+        stats = run_pipeline(chunks, partial(classify_chunk, mode=state["mode"]), write, workers)
+    except (Exception, KeyboardInterrupt) as e:
+        print(f"❌ 导入过程失败: {str(e) or '已中断'}")
+        print(f"💾 已提交 {state['rows_done']} 行，断点保存在 {checkpoint_path}，加 --resume 重新运行可从断点继续")
+        return False
+
+    remove_checkpoint(checkpoint_path)
+    print(f"\n📈 导入完成!")
+    print(f"✅ 成功: {state['success']} 条")
+    print(f"❌ 失败: {state['error']} 条")
+    print_stage_stats(stats, time.perf_counter() - start)
+    return True
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="智能数据导入工具")
+    parser.add_argument("excel_file", nargs="?", default="意向客户表.xlsx", help="Excel文件路径（.xlsx/.xls）")
+    parser.add_argument("--mode", choices=["insert", "upsert"], default="insert",
+                        help="insert：清空后全量导入；upsert：按电话增量新增或更新，不清空数据")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="分类进程数（默认为CPU核数）")
+    parser.add_argument("--chunk-size", type=int, default=BULK_BATCH_SIZE,
+                        help=f"每批提交的行数（默认 {BULK_BATCH_SIZE}），批越大吞吐越高，中断后需要重做的行也越多")
+    parser.add_argument("--resume", action="store_true",
+                        help="从断点继续上次中断的导入（不清空数据，沿用断点记录的导入方式和批大小）")
+    parser.add_argument("--checkpoint", help="断点文件路径（默认为 <Excel文件>.checkpoint.json）")
+    args = parser.parse_args()
+    
+    if not os.path.exists(args.excel_file):
+        print(f"❌ 找不到文件 {args.excel_file}")
+        exit(1)
+    if args.chunk_size < 1:
+        print("❌ --chunk-size 必须大于 0")
+        exit(1)
+    checkpoint_path = args.checkpoint or default_checkpoint_path(args.excel_file)
+    
     print("🔄 智能数据导入工具")
     print("=" * 50)
     
     # 检查API连接
     try:
-        response = requests.get(f"{API_BASE_URL}/talents/")
+        response = api.get("talents/", params={"limit": 1})
         if response.status_code != 200:
             print("❌ API连接失败，请确保后端服务正在运行")
             exit(1)
@@ -320,13 +295,27 @@ if __name__ == "__main__":
         print("❌ 无法连接到API服务")
         exit(1)
     
+    if args.resume:
+        state = resume_import_state(args.excel_file, checkpoint_path)
+        if state is None:
+            exit(1)
+        print(f"\n📥 从断点继续导入（{state['mode']}，每批 {state['chunk_size']} 行）...")
+        exit(0 if analyze_and_import_data(args.excel_file, state, checkpoint_path, args.workers) else 1)
+    
+    state = new_import_state(args.excel_file, args.mode, args.chunk_size)
+    if args.mode == "upsert":
+        print("\n📥 开始增量导入（按电话新增或更新）...")
+        exit(0 if analyze_and_import_data(args.excel_file, state, checkpoint_path, args.workers) else 1)
+    
     # 确认清空数据
+    if os.path.exists(checkpoint_path):
+        print(f"⚠️  存在未完成导入的断点 {checkpoint_path}，可加 --resume 继续；重新导入将覆盖断点")
     confirm = input("\n⚠️  确定要删除所有现有数据并重新导入吗？(输入 'YES' 确认): ")
     if confirm == "YES":
         print("\n🗑️  清空现有数据...")
         if clear_all_data():
             print("\n📥 开始智能导入...")
-            analyze_and_import_data()
+            analyze_and_import_data(args.excel_file, state, checkpoint_path, args.workers)
         else:
             print("❌ 清空数据失败，停止导入")
     else:
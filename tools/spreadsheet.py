@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+流式读取Excel - 导入工具共用
+
+.xlsx 使用 openpyxl 只读模式逐行解析，内存占用与文件大小无关，
+前面的行可以在后面的行还在解析时就开始分类、导入。
+旧版 .xls 格式不支持流式解析，退回 pandas 整表读取（需要 xlrd）。
+"""
+
+import os
+from itertools import islice
+
+def iter_rows(file_path, sheet=None, skip_rows=0):
+    """逐行读取工作表，每行返回一个单元格值元组（空单元格为 None，行尾空单元格可能被省略）"""
+    if os.path.splitext(file_path)[1].lower() == '.xls':
+        rows = _iter_xls_rows(file_path, sheet)
+    else:
+        rows = _iter_xlsx_rows(file_path, sheet)
+    return islice(rows, skip_rows, None)
+
+def iter_row_chunks(file_path, chunk_size=1000, sheet=None, skip_rows=0):
+    """按 chunk_size 行一批读取工作表，每批为行元组列表"""
+    rows = iter_rows(file_path, sheet, skip_rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def _iter_xlsx_rows(file_path, sheet):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet] if sheet else workbook.worksheets[0]
+        # 部分工具导出的文件记录的表格范围不准确，忽略它按实际内容读取
+        worksheet.reset_dimensions()
+        yield from worksheet.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+def _iter_xls_rows(file_path, sheet):
+    import pandas as pd
+
+    df = pd.read_excel(file_path, sheet_name=sheet or 0, header=None, dtype=object)
+    for row in df.itertuples(index=False, name=None):
+        yield tuple(None if pd.isna(value) else value for value in row)
+
+def cell_text(value):
+    """单元格值转为去除首尾空白的字符串，空单元格为空字符串
+
+    Excel 中的纯数字（如电话号码）读出来是浮点数，整数值去掉小数部分，避免变成 '13800000000.0'
+    """
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        if value != value:  # NaN
+            return ""
+        if value.is_integer():
+            return str(int(value))
+    return str(value).strip()